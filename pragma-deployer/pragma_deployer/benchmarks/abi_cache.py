@@ -0,0 +1,68 @@
+import json
+import timeit
+
+from starknet_py.contract import Contract
+from starknet_py.net.account.account import Account
+from starknet_py.net.full_node_client import FullNodeClient
+from starknet_py.net.signer.stark_curve_signer import KeyPair
+
+from pragma_deployer.utils.constants import DEPLOYER_ROOT, ETH_TOKEN_ADDRESS
+from pragma_deployer.utils.starknet import (
+    get_abi,
+    get_cached_contract,
+    get_sierra_artifact,
+)
+
+ITERATIONS = 50
+
+# Contracts are only built here, no request ever reaches this node.
+ACCOUNT = Account(
+    address=0x1,
+    client=FullNodeClient(node_url="http://127.0.0.1:0/rpc"),
+    chain=0x1,
+    key_pair=KeyPair.from_private_key(0x1),
+)
+
+
+def bench(label, uncached, cached):
+    uncached_time = timeit.timeit(uncached, number=ITERATIONS) / ITERATIONS
+    cached()  # warm the cache
+    cached_time = timeit.timeit(cached, number=ITERATIONS) / ITERATIONS
+    print(
+        f"{label}: uncached {uncached_time * 1e3:.2f} ms, "
+        f"cached {cached_time * 1e3:.4f} ms, "
+        f"x{uncached_time / cached_time:.0f}"
+    )
+
+
+def main():
+    erc_20_path = DEPLOYER_ROOT / "pragma_deployer" / "utils" / "erc20.json"
+    bench(
+        "erc20.json (legacy ABI)",
+        lambda: Contract(
+            ETH_TOKEN_ADDRESS,
+            json.loads(erc_20_path.read_text())["abi"],
+            ACCOUNT,
+            cairo_version=0,
+        ),
+        lambda: get_cached_contract(
+            erc_20_path, ETH_TOKEN_ADDRESS, ACCOUNT, cairo_version=0
+        ),
+    )
+
+    if not get_sierra_artifact("pragma_Oracle").exists():
+        print("pragma_Oracle: skipped, run `scarb build` in pragma-oracle first")
+        return
+    bench(
+        "pragma_Oracle (Sierra ABI)",
+        lambda: Contract(
+            0x1, json.loads(get_abi("pragma_Oracle")), ACCOUNT, cairo_version=1
+        ),
+        lambda: get_cached_contract(
+            get_sierra_artifact("pragma_Oracle"), 0x1, ACCOUNT, cairo_version=1
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import time
+
+import numpy as np
+
+from pragma_deployer.utils.aggregation import get_data_for_sources
+
+PAIRS = 100_000
+SOURCES = 50
+ITERATIONS = 5
+
+# src/tests/test_oracle.cairo
+BLOCK_TIMESTAMP = 103374042
+
+
+def bench(label, prices, timestamps):
+    get_data_for_sources(prices, timestamps, BLOCK_TIMESTAMP)  # warm up
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        get_data_for_sources(prices, timestamps, BLOCK_TIMESTAMP)
+    duration = (time.perf_counter() - start) / ITERATIONS
+    print(f"{label}: {duration * 1e3:.1f} ms")
+
+
+def main():
+    rng = np.random.default_rng(1)
+    shape = (PAIRS, SOURCES, 1)
+    prices = rng.integers(10**8, 10**13, size=shape, dtype=np.uint64)
+    timestamps = BLOCK_TIMESTAMP - rng.integers(0, 2 * 3600, size=shape).astype(
+        np.uint64
+    )
+    bench(f"{PAIRS} pairs x {SOURCES} sources, median", prices, timestamps)
+
+    shape = (PAIRS // 10, SOURCES, 4)
+    prices = rng.integers(10**8, 10**13, size=shape, dtype=np.uint64)
+    timestamps = np.full(shape, BLOCK_TIMESTAMP, dtype=np.uint64)
+    bench(
+        f"{PAIRS // 10} pairs x {SOURCES} sources x 4 publishers, median",
+        prices,
+        timestamps,
+    )
+
+
+if __name__ == "__main__":
+    main()
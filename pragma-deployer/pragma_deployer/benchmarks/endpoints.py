@@ -0,0 +1,120 @@
+import argparse
+import asyncio
+import random
+import time
+
+from aiohttp import ClientSession, web
+from starknet_py.constants import EXPECTED_RPC_VERSION
+from starknet_py.net.full_node_client import FullNodeClient
+
+from pragma_deployer.utils.endpoints import MultiEndpointClient
+
+# (base latency, tail latency, tail probability, failure rate) of each stub.
+# The first node has a slow tail, the second one is fast but flaky.
+STUBS = [
+    (0.02, 0.5, 0.1, 0.0),
+    (0.03, 0.1, 0.02, 0.2),
+    (0.05, 0.2, 0.05, 0.0),
+]
+
+
+async def start_stub_node(
+    base: float, tail: float, tail_probability: float, failure_rate: float
+) -> web.AppRunner:
+    """
+    Local JSON-RPC node answering `starknet_specVersion` and
+    `starknet_blockNumber` after a random delay, or with a 503.
+    """
+
+    async def rpc(request: web.Request) -> web.Response:
+        body = await request.json()
+        await asyncio.sleep(tail if random.random() < tail_probability else base)
+        if random.random() < failure_rate:
+            return web.Response(status=503, text="Service Unavailable")
+        result = (
+            EXPECTED_RPC_VERSION if body["method"] == "starknet_specVersion" else 1
+        )
+        return web.json_response({"jsonrpc": "2.0", "id": body["id"], "result": result})
+
+    app = web.Application()
+    app.router.add_post("/rpc", rpc)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner
+
+
+def get_url(runner: web.AppRunner) -> str:
+    host, port = runner.addresses[0][:2]
+    return f"http://{host}:{port}/rpc"
+
+
+async def run_reads(client: FullNodeClient, requests: int, concurrency: int):
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def read():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await client.get_block_number()
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(read() for _ in range(requests)))
+    return sorted(latencies), errors
+
+
+def report(label: str, latencies: list, errors: int) -> None:
+    def percentile(p):
+        return latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1e3
+
+    print(
+        f"{label}: p50 {percentile(0.5):.0f} ms, p95 {percentile(0.95):.0f} ms, "
+        f"p99 {percentile(0.99):.0f} ms, {errors} error(s)"
+    )
+
+
+async def run(requests: int, concurrency: int, rate_limit: float) -> None:
+    runners = [await start_stub_node(*stub) for stub in STUBS]
+    urls = [get_url(runner) for runner in runners]
+    # Nothing listens on the last endpoint
+    urls.append("http://127.0.0.1:9/rpc")
+    try:
+        async with ClientSession() as session:
+            single = FullNodeClient(node_url=urls[0], session=session)
+            report("single endpoint", *await run_reads(single, requests, concurrency))
+
+            multi = MultiEndpointClient(
+                urls, session=session, rate_limit=rate_limit or None
+            )
+            report(
+                f"{len(urls)} endpoints",
+                *await run_reads(multi, requests, concurrency),
+            )
+            multi.log_stats()
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare a single RPC endpoint with hedged multi-endpoint "
+        "reads against local stub nodes."
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--rate-limit", type=float, default=0, help="Requests per second per node"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency, args.rate_limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import random
+import timeit
+
+from pragma_sdk.common.types.entry import FutureEntry, SpotEntry
+from pragma_sdk.common.types.types import DataTypes
+
+from pragma_deployer.utils.entry_batch import EntryBatch
+from pragma_deployer.utils.packing import encode_entries
+from pragma_deployer.utils.starknet import str_to_felt
+
+ENTRIES = 10_000
+ITERATIONS = 20
+
+PAIRS = [str_to_felt(f"TOKEN{i}/USD") for i in range(200)]
+SOURCES = [str_to_felt(source) for source in ("BINANCE", "OKX", "BYBIT", "KRAKEN")]
+PUBLISHER = str_to_felt("PRAGMA")
+
+
+def get_rows(seed: int = 1):
+    """
+    Raw prices of one tick, 40% of them futures.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(ENTRIES):
+        expiry = rng.choice([None, None, None, 0, 1_735_689_600])
+        rows.append(
+            (
+                rng.choice(PAIRS),
+                rng.randrange(10**8, 10**26),
+                1_700_000_000 + rng.randrange(3600),
+                rng.choice(SOURCES),
+                PUBLISHER,
+                rng.randrange(10**20),
+                expiry,
+            )
+        )
+    return rows
+
+
+def build_objects(rows):
+    entries = []
+    for pair_id, price, timestamp, source, publisher, volume, expiry in rows:
+        if expiry is None:
+            entries.append(
+                SpotEntry(pair_id, price, timestamp, source, publisher, volume)
+            )
+        else:
+            entries.append(
+                FutureEntry(
+                    pair_id, price, timestamp, source, publisher, expiry, volume
+                )
+            )
+    return entries
+
+
+def object_path(rows):
+    """
+    SDK entry objects, serialized as `publish_entries` sends them, then
+    encoded entry by entry.
+    """
+    entries = build_objects(rows)
+    [{entry.get_asset_type(): entry.serialize()} for entry in entries]
+    return encode_entries(entries)
+
+
+def columnar_path(rows, batch: EntryBatch, out):
+    batch.clear()
+    for row in rows:
+        batch.append(*row)
+    return batch.to_calldata(out)
+
+
+def bench(label, run, baseline=None):
+    duration = timeit.timeit(run, number=ITERATIONS) / ITERATIONS
+    speedup = f", x{baseline / duration:.1f}" if baseline else ""
+    print(
+        f"{label}: {duration * 1e3:.2f} ms per {ENTRIES} entries, "
+        f"{duration / ENTRIES * 1e6:.2f} us per entry{speedup}"
+    )
+    return duration
+
+
+def main():
+    rows = get_rows()
+    batch = EntryBatch(capacity=ENTRIES)
+    batch.extend(build_objects(rows))
+    out = batch.encode()  # preallocated calldata buffer, reused by every run
+
+    expected = object_path(rows)
+    assert columnar_path(rows, batch, out) == expected, "calldata mismatch"
+    assert EntryBatch.from_entries(batch.to_entries()).to_calldata() == expected
+    futures = sum(
+        1 for entry in build_objects(rows) if entry.get_asset_type() == DataTypes.FUTURE
+    )
+    print(f"{ENTRIES} entries ({futures} futures), {len(expected)} calldata felts")
+
+    baseline = bench(
+        "object path (SpotEntry/FutureEntry + serialize)", lambda: object_path(rows)
+    )
+    bench(
+        "columnar path (EntryBatch.append + encode)",
+        lambda: columnar_path(rows, batch, out),
+        baseline,
+    )
+    bench(
+        "encode only (EntryBatch.encode into the buffer)",
+        lambda: batch.encode(out),
+        baseline,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+import tomllib
+
+from pragma_deployer.utils.constants import DEPLOYER_ROOT
+
+RUNS = 5
+BUDGET_MS = 200
+
+
+def get_console_scripts() -> dict:
+    pyproject = tomllib.loads((DEPLOYER_ROOT / "pyproject.toml").read_text())
+    return pyproject["project"]["scripts"]
+
+
+def get_slowest_imports(module: str, count: int) -> list:
+    """
+    Run `python -X importtime` on `module` and return its `count` slowest
+    imports as (cumulative us, self us, name), with the module itself first.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        imports.append((int(cumulative_us), int(self_us), name.strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+class ScriptFailedError(Exception):
+    pass
+
+
+def time_help(module: str, function: str) -> float:
+    """
+    Best wall-clock time in milliseconds of `<script> --help` over `RUNS` runs.
+    Raises `ScriptFailedError` if it exits with an error, e.g. on import.
+    """
+    code = f"from {module} import {function}; {function}(['--help'])"
+    best = float("inf")
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=False
+        )
+        best = min(best, time.perf_counter() - start)
+        if result.returncode != 0:
+            last_line = (result.stderr.strip().splitlines() or [""])[-1]
+            raise ScriptFailedError(f"exit code {result.returncode}: {last_line}")
+    return best * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the startup time of every pragma-deployer script."
+    )
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument(
+        "--top", type=int, default=0, help="Show the N slowest imports of each script"
+    )
+    args = parser.parse_args()
+
+    # `--help` must not need a configured network.
+    os.environ.setdefault("STARKNET_NETWORK", "devnet")
+
+    over_budget = []
+    failed = []
+    for script, entrypoint in get_console_scripts().items():
+        module, function = entrypoint.split(":")
+        try:
+            elapsed = time_help(module, function)
+        except ScriptFailedError as e:
+            print(f"⛔ {script} --help failed ({e})")
+            failed.append(script)
+            continue
+        status = "✅" if elapsed < args.budget_ms else "⚠️ "
+        print(f"{status} {script} --help: {elapsed:.0f} ms")
+        if elapsed >= args.budget_ms:
+            over_budget.append(script)
+        if args.top:
+            for cumulative_us, self_us, name in get_slowest_imports(module, args.top):
+                print(
+                    f"    {cumulative_us / 1e3:7.1f} ms  "
+                    f"{self_us / 1e3:6.1f} ms  {name}"
+                )
+
+    if failed:
+        print(f"{len(failed)} script(s) failed")
+    if over_budget:
+        print(f"{len(over_budget)} script(s) above {args.budget_ms:.0f} ms")
+    if failed or over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import time
+
+import numpy as np
+
+from pragma_deployer.utils.storage_packing import (
+    MEAN,
+    MEDIAN,
+    pack_checkpoints,
+    pack_entries,
+    to_bytes,
+    unpack_checkpoints,
+    unpack_entries,
+)
+
+FELTS = 1_000_000
+
+# (timestamp, volume, price) and packed felt, as asserted by
+# test_entry_store_packing in src/entry/structs.cairo
+ENTRY_VECTORS = [
+    (
+        (1700000000, 123456789, 4200000000000),
+        0x3D1E382100000000000000000000075BCD156553F100,
+    ),
+    (
+        (2**32 - 1, 2**100 - 1, 2**119),
+        0x800000000000000000000000000000FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF,
+    ),
+]
+# (timestamp, value, aggregation mode, sources), packed felt and unpacked
+# checkpoint, as asserted by test_checkpoint_store_packing
+CHECKPOINT_VECTORS = [
+    (
+        (1700000000, 4200000000000, MEAN, 5),
+        0x50010000000000000000000003D1E38210006553F100,
+        (1700000000, 4200000000000, MEAN, 5),
+    ),
+    # Timestamps above 32 bits carry into the value
+    ((2**32 + 5, 1, MEDIAN, 0), 0x200000005, (5, 2, MEDIAN, 0)),
+]
+
+
+def check_cairo_vectors():
+    for fields, felt in ENTRY_VECTORS:
+        assert pack_entries(*([field] for field in fields)).tolist() == [felt]
+        unpacked = unpack_entries(to_bytes([felt]))
+        assert tuple(int(column[0]) for column in unpacked) == fields
+    try:
+        pack_entries([2**32], [0], [0])
+    except ValueError as e:
+        assert str(e) == "EntryStorePack:tmp too big"
+    else:
+        raise AssertionError("EntryStorePack:tmp too big not raised")
+
+    for fields, felt, unpacked_fields in CHECKPOINT_VECTORS:
+        assert pack_checkpoints(*([field] for field in fields)).tolist() == [felt]
+        unpacked = unpack_checkpoints(to_bytes([felt]))
+        assert tuple(int(column[0]) for column in unpacked) == unpacked_fields
+
+
+def bench(label, run):
+    start = time.perf_counter()
+    result = run()
+    duration = time.perf_counter() - start
+    print(f"{label}: {duration * 1e3:.1f} ms, {duration / FELTS * 1e9:.0f} ns per felt")
+    return result
+
+
+def main():
+    check_cairo_vectors()
+    print("Cairo test vectors: ok")
+
+    rng = np.random.default_rng(1)
+    timestamps = rng.integers(1_600_000_000, 1_800_000_000, FELTS, dtype=np.uint64)
+    volumes = rng.integers(0, 2**63, FELTS, dtype=np.uint64)
+    prices = rng.integers(10**8, 10**18, FELTS, dtype=np.uint64)
+
+    raw = bench(
+        f"pack {FELTS} entries to 32 byte words",
+        lambda: pack_entries(timestamps, volumes, prices, as_bytes=True),
+    )
+    felts = bench("pack to ints", lambda: pack_entries(timestamps, volumes, prices))
+    assert bench("encode ints to 32 byte words", lambda: to_bytes(felts)) == raw
+    unpacked = bench("unpack from 32 byte words", lambda: unpack_entries(raw))
+    for column, expected in zip(unpacked, (timestamps, volumes, prices)):
+        assert np.array_equal(column, expected)
+    bench("unpack from ints", lambda: unpack_entries(felts))
+
+
+if __name__ == "__main__":
+    main()
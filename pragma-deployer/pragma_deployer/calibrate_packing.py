@@ -0,0 +1,354 @@
+import os
+import time
+import click
+import logging
+
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from pragma_utils.logger import setup_logging
+
+from pragma_deployer.utils.constants import DEPLOYER_ROOT, load_env
+from pragma_deployer.utils.metrics import export_metrics_at_exit
+
+logger = logging.getLogger(__name__)
+
+CALIBRATION_SOURCE = "PACKING_CALIBRATION"
+# Number of entries of the calibration transactions
+BATCH_SIZES = (1, 8, 32, 64)
+
+
+def fit_line(xs: Sequence[float], ys: Sequence[float]) -> Tuple[float, float]:
+    """
+    Least squares (intercept, slope) of ys against xs.
+    """
+    n = len(xs)
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if variance == 0:
+        return mean_y, 0.0
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+    return mean_y - slope * mean_x, slope
+
+
+async def get_predeployed_accounts(port: int) -> List[dict]:
+    from starknet_py.net.http_client import HttpMethod
+
+    from pragma_deployer.utils.starknet import get_starknet_account
+
+    client = (await get_starknet_account(port=port)).client
+    body = await client._client.request(
+        address=client.url,
+        http_method=HttpMethod.POST,
+        payload={
+            "jsonrpc": "2.0",
+            "method": "devnet_getPredeployedAccounts",
+            "id": 0,
+            "params": {},
+        },
+    )
+    return body["result"]
+
+
+async def register_calibration_publishers(
+    port: int, count: int
+) -> List[Tuple[str, object]]:
+    """
+    Register `count` devnet predeployed accounts as publishers of the
+    calibration source, returns their (name, account).
+    """
+    from pragma_deployer.utils.starknet import (
+        build_call,
+        call_many,
+        get_starknet_account,
+        invoke_many,
+        str_to_felt,
+    )
+
+    deployer = await get_starknet_account(port=port)
+    accounts = [
+        account
+        for account in await get_predeployed_accounts(port)
+        if int(account["address"], 16) != deployer.address
+    ][:count]
+    if len(accounts) < count:
+        raise click.UsageError(
+            f"⛔ The devnet has {len(accounts)} spare predeployed accounts, "
+            f"{count} publishers are needed."
+        )
+
+    names = [f"CALIBRATION_{i}" for i in range(count)]
+    registry_state = await call_many(
+        [("pragma_PublisherRegistry", "get_publisher_address", name) for name in names]
+        + [
+            ("pragma_PublisherRegistry", "get_publisher_sources", name)
+            for name in names
+        ],
+        port=port,
+    )
+    calls = []
+    for name, account, (address,), (sources,) in zip(
+        names, accounts, registry_state[:count], registry_state[count:]
+    ):
+        if address == 0:
+            calls.append(
+                build_call(
+                    "pragma_PublisherRegistry",
+                    "add_publisher",
+                    [name, int(account["address"], 16)],
+                )
+            )
+        if str_to_felt(CALIBRATION_SOURCE) not in sources:
+            calls.append(
+                build_call(
+                    "pragma_PublisherRegistry",
+                    "add_sources_for_publisher",
+                    [name, 1, CALIBRATION_SOURCE],
+                )
+            )
+    await invoke_many(calls, port=port)
+
+    return [
+        (
+            name,
+            await get_starknet_account(
+                address=account["address"],
+                private_key=account["private_key"],
+                port=port,
+            ),
+        )
+        for name, account in zip(names, accounts)
+    ]
+
+
+def make_entry(data_type, pair_id: str, publisher: str, timestamp: int):
+    from pragma_sdk.common.types.entry import FutureEntry, GenericEntry, SpotEntry
+    from pragma_sdk.common.types.types import DataTypes
+
+    if data_type == DataTypes.GENERIC:
+        return GenericEntry(
+            key=pair_id,
+            value=10**30,
+            timestamp=timestamp,
+            source=CALIBRATION_SOURCE,
+            publisher=publisher,
+        )
+    if data_type == DataTypes.FUTURE:
+        return FutureEntry(
+            pair_id=pair_id,
+            price=10**18,
+            timestamp=timestamp,
+            source=CALIBRATION_SOURCE,
+            publisher=publisher,
+            expiry_timestamp=timestamp + 86400,
+            volume=10**18,
+        )
+    return SpotEntry(
+        pair_id=pair_id,
+        price=10**18,
+        timestamp=timestamp,
+        source=CALIBRATION_SOURCE,
+        publisher=publisher,
+        volume=10**18,
+    )
+
+
+def build_publish_call(entries):
+    from pragma_deployer.utils.packing import encode_entries
+    from pragma_deployer.utils.starknet import build_call
+
+    return build_call("pragma_Oracle", "publish_data_entries", encode_entries(entries))
+
+
+async def estimate_l2_gas(account, entries_list) -> List[int]:
+    """
+    L2 gas consumed by publishing each of `entries_list` from `account`,
+    simulated in order in a single request.
+    """
+    from starknet_py.net.client_models import ResourceBoundsMapping
+
+    from pragma_deployer.utils.starknet import CLIENT_POOL
+
+    nonce = await account.get_nonce()
+    transactions = [
+        await account.sign_invoke_v3(
+            [build_publish_call(entries)],
+            nonce=nonce + offset,
+            resource_bounds=ResourceBoundsMapping.init_with_zeros(),
+        )
+        for offset, entries in enumerate(entries_list)
+    ]
+    estimates = await CLIENT_POOL.get_fee_estimator(account).estimate_transactions(
+        transactions
+    )
+    return [estimated_fee.l2_gas_consumed for estimated_fee in estimates]
+
+
+async def publish(account, entries) -> None:
+    from pragma_deployer.utils.starknet import CLIENT_POOL
+
+    nonce_manager = CLIENT_POOL.get_nonce_manager(account)
+    await nonce_manager.wait(
+        await nonce_manager.execute([build_publish_call(entries)])
+    )
+
+
+async def calibrate_entry_type(data_type, publishers, run: str):
+    """
+    Measure the `EntryCost` of `data_type` and the transaction overhead.
+    """
+    from pragma_deployer.utils.packing import EntryCost
+
+    (name, account), *others = publishers
+    now = int(time.time())
+
+    def pairs(label: str, count: int) -> List[str]:
+        return [f"{run}{label}{i}" for i in range(count)]
+
+    # Inserts on pairs nothing was published for, one transaction per size
+    inserts = await estimate_l2_gas(
+        account,
+        [
+            [make_entry(data_type, pair, name, now) for pair in pairs(f"I{k}-", k)]
+            for k in BATCH_SIZES
+        ],
+    )
+    insert_overhead, insert = fit_line(BATCH_SIZES, inserts)
+
+    # Updates of entries published for real beforehand
+    stored = pairs("U", max(BATCH_SIZES))
+    await publish(account, [make_entry(data_type, pair, name, now) for pair in stored])
+    updates = await estimate_l2_gas(
+        account,
+        [
+            [make_entry(data_type, pair, name, now + 1) for pair in stored[:k]]
+            for k in BATCH_SIZES
+        ],
+    )
+    update_overhead, update = fit_line(BATCH_SIZES, updates)
+
+    # Single inserts on a pair holding more and more publishers
+    pair = f"{run}P"
+    counts, scans = [], []
+    for count, (other_name, other_account) in enumerate(others):
+        (l2_gas,) = await estimate_l2_gas(
+            account, [[make_entry(data_type, pair, name, now)]]
+        )
+        counts.append(count)
+        scans.append(l2_gas)
+        await publish(other_account, [make_entry(data_type, pair, other_name, now)])
+    _, per_publisher = fit_line(counts, scans) if counts else (0, 0)
+
+    logger.info(
+        f"ℹ️  {data_type.value}: insert {insert:.0f}, update {update:.0f}, "
+        f"per publisher {per_publisher:.0f} L2 gas"
+    )
+    cost = EntryCost(
+        update=int(update + 1),
+        insert=int(insert + 1),
+        per_publisher=max(int(per_publisher + 1), 0),
+    )
+    return cost, max(insert_overhead, update_overhead)
+
+
+async def main(port: int, publishers: int, output: Path, margin: float) -> None:
+    """
+    Measure the cost model of `publish_data_entries` and write it to `output`.
+    """
+    from pragma_sdk.common.types.types import DataTypes
+
+    from pragma_deployer.utils.packing import PackingModel
+
+    logger.info("🚀 Calibrating the packing model...")
+    calibration_publishers = await register_calibration_publishers(port, publishers)
+    # Fresh pairs on every run, whatever an earlier run left on the devnet
+    run = f"C{int(time.time()) % 10**6}-"
+
+    costs = {}
+    overheads = []
+    for data_type in (DataTypes.SPOT, DataTypes.FUTURE, DataTypes.GENERIC):
+        costs[data_type], overhead = await calibrate_entry_type(
+            data_type, calibration_publishers, run
+        )
+        overheads.append(overhead)
+
+    model = PackingModel(
+        costs=costs, tx_l2_gas=int(max(overheads) + 1), margin=margin, calibrated=True
+    )
+    model.save(output)
+    logger.info(
+        f"✅ Packing model written to {output}, "
+        f"{model.tx_l2_gas} L2 gas per transaction"
+    )
+
+
+@click.command()
+@click.option(
+    "--log-level",
+    type=click.Choice(
+        ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], case_sensitive=False
+    ),
+    default="INFO",
+    help="Set the logging level",
+)
+@click.option(
+    "-p",
+    "--port",
+    type=click.IntRange(min=0),
+    required=True,
+    help="Port number of the Devnet",
+)
+@click.option(
+    "--publishers",
+    type=click.IntRange(min=1),
+    default=6,
+    help="Predeployed accounts to register as calibration publishers",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEPLOYER_ROOT / "packing_model.json",
+    help="Where to write the packing model",
+)
+@click.option(
+    "--margin",
+    type=click.FloatRange(min=1.0),
+    default=1.2,
+    help="Safety factor applied to the measured costs when packing",
+)
+@click.option(
+    "--metrics-out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=False,
+    help="Write RPC metrics to this file at exit (JSON if it ends with .json, "
+    "Prometheus text otherwise)",
+)
+def cli_entrypoint(
+    log_level: str,
+    port: int,
+    publishers: int,
+    output: Path,
+    margin: float,
+    metrics_out: Optional[Path],
+) -> None:
+    """
+    CLI entrypoint to measure the publish_data_entries cost model on Devnet.
+    """
+    setup_logging(logger, log_level)
+
+    load_env()
+    export_metrics_at_exit(metrics_out)
+    if os.getenv("STARKNET_NETWORK") != "devnet":
+        raise click.UsageError("⛔ Calibration only runs against a Devnet.")
+
+    import asyncio
+
+    from pragma_deployer.utils.starknet import with_client_pool
+
+    asyncio.run(with_client_pool(main(port, publishers, output, margin)))
+
+
+if __name__ == "__main__":
+    cli_entrypoint()
@@ -0,0 +1,156 @@
+import importlib
+import inspect
+import logging
+import os
+import time
+
+from pathlib import Path
+from typing import List, Optional
+
+import click
+from pragma_utils.logger import setup_logging
+
+from pragma_deployer.utils.constants import load_env
+from pragma_deployer.utils.metrics import export_metrics_at_exit
+
+logger = logging.getLogger(__name__)
+
+# Step name -> module exposing `main` and `cli_entrypoint`. Modules are only
+# imported when a step is listed or run.
+STEPS = {
+    "deploy": "pragma_deployer.deploy_pragma",
+    "deploy-summary-stats": "pragma_deployer.deploy_summary_stats",
+    "deploy-randomness": "pragma_deployer.deploy_randomness",
+    "deploy-randomness-example": "pragma_deployer.deploy_randomness_example",
+    "deploy-mock-pool": "pragma_deployer.deploy_mock_pool",
+    "upgrade": "pragma_deployer.upgrade_pragma",
+    "add-pairs": "pragma_deployer.add_pairs",
+    "register-publishers": "pragma_deployer.register_publishers",
+    "register-publisher-shards": "pragma_deployer.register_publisher_shards",
+    "remove-source": "pragma_deployer.remove_source",
+    "remove-publishers": "pragma_deployer.remove_publishers",
+    "register-vault-token": "pragma_deployer.register_tokenized_vault",
+    "reconcile-oracle": "pragma_deployer.reconcile_oracle",
+}
+
+
+class StepGroup(click.Group):
+    """
+    Exposes every step's own CLI entrypoint as a subcommand.
+    """
+
+    def list_commands(self, ctx) -> List[str]:
+        return super().list_commands(ctx) + list(STEPS)
+
+    def get_command(self, ctx, name) -> Optional[click.Command]:
+        if name in STEPS:
+            return importlib.import_module(STEPS[name]).cli_entrypoint
+        return super().get_command(ctx, name)
+
+
+async def run_steps(
+    steps: List[str], port: Optional[int], batch_size: Optional[int]
+) -> None:
+    """
+    Run `steps` in order on the current event loop, sharing the client pool,
+    contract caches and deployment store. Transactions a step leaves in
+    flight are awaited before the next step starts.
+    """
+    from pragma_deployer.utils.starknet import CLIENT_POOL
+
+    timings = []
+    for step in steps:
+        main = importlib.import_module(STEPS[step]).main
+        kwargs = (
+            {"batch_size": batch_size}
+            if "batch_size" in inspect.signature(main).parameters
+            else {}
+        )
+        logger.info(f"ℹ️  Running {step}")
+        start = time.perf_counter()
+        try:
+            await main(port, **kwargs)
+            await CLIENT_POOL.wait_all()
+        except Exception:
+            elapsed = time.perf_counter() - start
+            logger.error(f"⛔ {step} failed after {elapsed:.2f}s")
+            raise
+        elapsed = time.perf_counter() - start
+        timings.append((step, elapsed))
+        logger.info(f"⏱️  {step}: {elapsed:.2f}s")
+
+    total = sum(seconds for _, seconds in timings)
+    summary = ", ".join(f"{step} {seconds:.2f}s" for step, seconds in timings)
+    logger.info(f"✅ Ran {len(timings)} step(s) in {total:.2f}s: {summary}")
+
+
+@click.group(cls=StepGroup)
+def cli() -> None:
+    """
+    Pragma deployment scripts.
+    """
+
+
+@cli.command()
+@click.argument(
+    "steps", nargs=-1, required=True, type=click.Choice(list(STEPS)), metavar="STEP..."
+)
+@click.option(
+    "--log-level",
+    type=click.Choice(
+        ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], case_sensitive=False
+    ),
+    default="INFO",
+    help="Set the logging level",
+)
+@click.option(
+    "-p",
+    "--port",
+    type=click.IntRange(min=0),
+    required=False,
+    help="Port number (required for Devnet network)",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    required=False,
+    help="Max calls per multicall transaction (default: as many as fit the budget)",
+)
+@click.option(
+    "--metrics-out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=False,
+    help="Write RPC metrics to this file at exit (JSON if it ends with .json, "
+    "Prometheus text otherwise)",
+)
+def run(
+    steps: List[str],
+    log_level: str,
+    port: Optional[int],
+    batch_size: Optional[int],
+    metrics_out: Optional[Path],
+) -> None:
+    """
+    Run several steps in one process.
+
+    Steps run in the given order and share RPC connections, caches and the
+    deployment store, e.g. `pragma run deploy add-pairs register-publishers`.
+    """
+    setup_logging(logger, log_level)
+    for step in set(steps):
+        setup_logging(logging.getLogger(STEPS[step]), log_level)
+
+    load_env()
+    export_metrics_at_exit(metrics_out)
+    if os.getenv("STARKNET_NETWORK") == "devnet" and port is None:
+        raise click.UsageError('⛔ "--port" must be set for Devnet.')
+
+    import asyncio
+
+    from pragma_deployer.utils.starknet import with_client_pool
+
+    asyncio.run(with_client_pool(run_steps(list(steps), port, batch_size)))
+
+
+if __name__ == "__main__":
+    cli()
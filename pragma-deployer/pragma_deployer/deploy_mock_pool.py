@@ -1,27 +1,17 @@
 import os
-import asyncio
 import click
 import logging
 
+from pathlib import Path
 from typing import Optional
 
-from dotenv import load_dotenv
 from pragma_utils.logger import setup_logging
 
 from pragma_deployer.utils.constants import (
     COMPILED_CONTRACTS,
-    NETWORK,
+    load_env,
 )
-from pragma_deployer.utils.starknet import (
-    declare_v3,
-    dump_declarations,
-    dump_deployments,
-    get_deployments,
-    get_starknet_account,
-    deploy_v2,
-)
-
-load_dotenv()
+from pragma_deployer.utils.metrics import export_metrics_at_exit
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +20,15 @@ async def main(port: Optional[int]) -> None:
     """
     Main function to deploy the mock pool to Starknet.
     """
+    from pragma_deployer.utils.constants import NETWORK
+    from pragma_deployer.utils.starknet import (
+        declare_many,
+        get_starknet_account,
+        deploy_v2,
+        update_declarations,
+        update_deployments,
+    )
+
     # Declarations
     chain_id = NETWORK["chain_id"]
     logger.info(f"ℹ️  Connected to CHAIN_ID {chain_id}")
@@ -37,15 +36,13 @@ async def main(port: Optional[int]) -> None:
     logger.info(f"ℹ️  Using account {hex(account.address)} as deployer")
 
     # Declaration
-    class_hash = {
-        contract["contract_name"]: await declare_v3(contract["contract_name"], port)
-        for contract in COMPILED_CONTRACTS
-    }
-    dump_declarations(class_hash)
+    class_hash = await declare_many(
+        [contract["contract_name"] for contract in COMPILED_CONTRACTS], port=port
+    )
+    update_declarations(class_hash)
 
     # Deployment
-    deployments = get_deployments()
-    deployments["pragma_MockPool"] = await deploy_v2(
+    deployment = await deploy_v2(
         "pragma_Pool",
         int(
             "0x049d36570d4e46f48e99674bd3fcc84644ddd6b96f7c741b1562b82f9e004dc7", 16
@@ -56,7 +53,7 @@ async def main(port: Optional[int]) -> None:
         port=port,
     )
 
-    dump_deployments(deployments)
+    update_deployments({"pragma_MockPool": deployment})
 
     logger.info("✅Mock Pool Deployment Completed")
 
@@ -77,16 +74,31 @@ async def main(port: Optional[int]) -> None:
     required=False,
     help="Port number (required for Devnet network)",
 )
-def cli_entrypoint(log_level: str, port: Optional[int]) -> None:
+@click.option(
+    "--metrics-out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=False,
+    help="Write RPC metrics to this file at exit (JSON if it ends with .json, "
+    "Prometheus text otherwise)",
+)
+def cli_entrypoint(
+    log_level: str, port: Optional[int], metrics_out: Optional[Path]
+) -> None:
     """
     CLI entrypoint to deploy the Mock Pool contract to Starknet.
     """
     setup_logging(logger, log_level)
 
+    load_env()
+    export_metrics_at_exit(metrics_out)
     if os.getenv("STARKNET_NETWORK") == "devnet" and port is None:
         raise click.UsageError('⛔ "--port" must be set for Devnet.')
 
-    asyncio.run(main(port))
+    import asyncio
+
+    from pragma_deployer.utils.starknet import with_client_pool
+
+    asyncio.run(with_client_pool(main(port)))
 
 
 if __name__ == "__main__":
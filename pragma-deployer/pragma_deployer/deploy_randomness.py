@@ -1,28 +1,18 @@
 import os
-import asyncio
 import click
 import logging
 
+from pathlib import Path
 from typing import Optional
 
-from dotenv import load_dotenv
 from pragma_utils.logger import setup_logging
 
 from pragma_deployer.utils.constants import (
     COMPILED_CONTRACTS,
-    NETWORK,
     ETH_TOKEN_ADDRESS,
+    load_env,
 )
-from pragma_deployer.utils.starknet import (
-    dump_deployments,
-    get_deployments,
-    get_starknet_account,
-    deploy_v2,
-    declare_v3,
-    dump_declarations,
-)
-
-load_dotenv()
+from pragma_deployer.utils.metrics import export_metrics_at_exit
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +21,16 @@ async def main(port: Optional[int]) -> None:
     """
     Main function to deploy contracts to Starknet.
     """
+    from pragma_deployer.utils.constants import NETWORK
+    from pragma_deployer.utils.starknet import (
+        get_deployments,
+        get_starknet_account,
+        deploy_v2,
+        update_declarations,
+        update_deployments,
+        declare_many,
+    )
+
     # Declarations
     chain_id = NETWORK["chain_id"]
     logger.info(f"ℹ️  Connected to CHAIN_ID {chain_id}")
@@ -38,17 +38,14 @@ async def main(port: Optional[int]) -> None:
     logger.info(f"ℹ️  Using account {hex(account.address)} as deployer")
 
     if port is not None:
-        class_hash = {
-            contract["contract_name"]: await declare_v3(
-                contract["contract_name"], port=port
-            )
-            for contract in COMPILED_CONTRACTS
-        }
-        dump_declarations(class_hash)
+        class_hash = await declare_many(
+            [contract["contract_name"] for contract in COMPILED_CONTRACTS], port=port
+        )
+        update_declarations(class_hash)
 
     # Deployment
     deployments = get_deployments()
-    deployments["pragma_Randomness"] = await deploy_v2(
+    deployment = await deploy_v2(
         "pragma_Randomness",
         int(os.getenv("DEVNET_ACCOUNT_ADDRESS"), 16),
         2061139992776959994838533810929826594222370735645675137341826408353556487187,
@@ -57,7 +54,7 @@ async def main(port: Optional[int]) -> None:
         port=port,
     )
 
-    dump_deployments(deployments)
+    update_deployments({"pragma_Randomness": deployment})
 
     logger.info("✅ Randomness Deployment Completed")
 
@@ -78,16 +75,31 @@ async def main(port: Optional[int]) -> None:
     required=False,
     help="Port number (required for Devnet network)",
 )
-def cli_entrypoint(log_level: str, port: Optional[int]) -> None:
+@click.option(
+    "--metrics-out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=False,
+    help="Write RPC metrics to this file at exit (JSON if it ends with .json, "
+    "Prometheus text otherwise)",
+)
+def cli_entrypoint(
+    log_level: str, port: Optional[int], metrics_out: Optional[Path]
+) -> None:
     """
     CLI entrypoint to deploy contracts to Starknet.
     """
     setup_logging(logger, log_level)
 
+    load_env()
+    export_metrics_at_exit(metrics_out)
     if os.getenv("STARKNET_NETWORK") == "devnet" and port is None:
         raise click.UsageError('⛔ "--port" must be set for Devnet.')
 
-    asyncio.run(main(port))
+    import asyncio
+
+    from pragma_deployer.utils.starknet import with_client_pool
+
+    asyncio.run(with_client_pool(main(port)))
 
 
 if __name__ == "__main__":
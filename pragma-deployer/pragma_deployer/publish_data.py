@@ -1,14 +1,14 @@
 import asyncio
 import logging
-import os
 import time
-from typing import List
 
 from pragma_deployer.utils.constants import NETWORK
+from pragma_deployer.utils.publisher import PublisherPipeline, get_publisher_client
+from pragma_deployer.utils.sharding import ShardedPublisher, get_shard_clients
+from pragma_deployer.utils.tracing import TRACES, export_traces_at_exit
 from pragma_sdk.common.types.pair import Pair
-from pragma_sdk.common.types.entry import Entry, SpotEntry, FutureEntry
+from pragma_sdk.common.types.entry import SpotEntry
 from pragma_sdk.common.types.currency import Currency
-from pragma_sdk.onchain.client import PragmaOnChainClient
 
 
 logger = logging.getLogger(__name__)
@@ -28,20 +28,24 @@ pair = Pair(FIXED, USD)
 async def publish_data():
 
     print(NETWORK["account_address"])
-
-    publisher_client = PragmaOnChainClient(
-        account_private_key=NETWORK["private_key"],
-        account_contract_address= NETWORK["account_address"],
-        network=os.environ["STARKNET_NETWORK"],  # ENV var set to `sepolia | mainnet`
-    )
-
-    # Use your own custom logic
-    _entries = [ 
-        SpotEntry(pair_id=pair.id, price=int(1e8), timestamp=int(time.time()), source="STARKNET", publisher="PRAGMA", volume=0)
-    ]
-    res = await publisher_client.publish_many(_entries)
-
-    print("success ", hex(res[0].hash))
+    # Stage latencies are written to $PUBLISH_TRACES_OUT at exit, if set
+    export_traces_at_exit()
+
+    # Spread over the publisher shards' accounts when there are some
+    shard_clients = get_shard_clients()
+    if shard_clients:
+        publisher = ShardedPublisher(shard_clients, tracer=TRACES)
+    else:
+        publisher = PublisherPipeline(get_publisher_client(), tracer=TRACES)
+
+    # Producers push entries, the pipeline batches them into transactions
+    async with publisher as pipeline:
+        # Use your own custom logic
+        await pipeline.put(
+            SpotEntry(pair_id=pair.id, price=int(1e8), timestamp=int(time.time()), source="STARKNET", publisher="PRAGMA", volume=0)
+        )
+
+    print("success ", pipeline.summary())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+import os
+import click
+import logging
+
+from pathlib import Path
+from typing import Optional
+
+from pragma_utils.logger import setup_logging
+
+from pragma_deployer.utils.constants import DEPLOYER_ROOT, load_env
+from pragma_deployer.utils.metrics import export_metrics_at_exit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = DEPLOYER_ROOT / "oracle_config.json"
+
+
+async def main(
+    port: Optional[int],
+    batch_size: Optional[int] = None,
+    config_path: Path = DEFAULT_CONFIG_PATH,
+    dry_run: bool = False,
+) -> None:
+    """
+    Main function to bring the Oracle configuration to the desired state.
+    """
+    from pragma_deployer.utils.oracle_config import (
+        ORACLE,
+        describe_call,
+        diff_oracle_config,
+        fetch_oracle_state,
+        load_oracle_config,
+    )
+    from pragma_deployer.utils.starknet import build_call, invoke_many
+
+    desired = load_oracle_config(config_path)
+    logger.info(
+        f"ℹ️  Desired state: {len(desired['currencies'])} currencies, "
+        f"{len(desired['pairs'])} pairs, "
+        f"{len(desired['conversion_rate_pairs'])} conversion rate pairs, "
+        f"{len(desired['tokenized_vaults'])} tokenized vaults"
+    )
+    current = await fetch_oracle_state(desired, port=port)
+    changes = diff_oracle_config(desired, current)
+    if not changes:
+        logger.info("✅ Oracle configuration already up to date")
+        return
+
+    for function_name, calldata in changes:
+        logger.info(f"ℹ️  {describe_call(function_name, calldata)}")
+    if dry_run:
+        logger.info(f"ℹ️  Dry run, {len(changes)} change(s) not applied")
+        return
+
+    tx_hashes = await invoke_many(
+        [
+            build_call(ORACLE, function_name, calldata)
+            for function_name, calldata in changes
+        ],
+        batch_size=batch_size,
+        port=port,
+    )
+    logger.info(
+        f"✅ Applied {len(changes)} change(s) "
+        f"with tx hashes {[hex(tx_hash) for tx_hash in tx_hashes]}"
+    )
+
+
+@click.command()
+@click.option(
+    "--log-level",
+    type=click.Choice(
+        ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], case_sensitive=False
+    ),
+    default="INFO",
+    help="Set the logging level",
+)
+@click.option(
+    "-p",
+    "--port",
+    type=click.IntRange(min=0),
+    required=False,
+    help="Port number (required for Devnet network)",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    required=False,
+    help="Max calls per multicall transaction (default: as many as fit the budget)",
+)
+@click.option(
+    "-c",
+    "--config",
+    "config_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=DEFAULT_CONFIG_PATH,
+    show_default=True,
+    help="Desired-state file, see oracle_config.example.json",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Only print the changes that would be applied",
+)
+@click.option(
+    "--metrics-out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=False,
+    help="Write RPC metrics to this file at exit (JSON if it ends with .json, "
+    "Prometheus text otherwise)",
+)
+def cli_entrypoint(
+    log_level: str,
+    port: Optional[int],
+    batch_size: Optional[int],
+    config_path: Path,
+    dry_run: bool,
+    metrics_out: Optional[Path],
+) -> None:
+    """
+    CLI entrypoint to reconcile the Oracle configuration with a desired state.
+    """
+    setup_logging(logger, log_level)
+
+    load_env()
+    export_metrics_at_exit(metrics_out)
+    if os.getenv("STARKNET_NETWORK") == "devnet" and port is None:
+        raise click.UsageError('⛔ "--port" must be set for Devnet.')
+
+    import asyncio
+
+    from pragma_deployer.utils.starknet import with_client_pool
+
+    asyncio.run(with_client_pool(main(port, batch_size, config_path, dry_run)))
+
+
+if __name__ == "__main__":
+    cli_entrypoint()
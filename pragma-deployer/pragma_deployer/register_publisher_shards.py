@@ -0,0 +1,153 @@
+import os
+import click
+import logging
+
+from pathlib import Path
+from typing import Optional
+
+from pragma_utils.logger import setup_logging
+
+from pragma_deployer.utils.constants import load_env
+from pragma_deployer.utils.metrics import export_metrics_at_exit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PUBLISHER = "PRAGMA"
+
+
+async def main(
+    port: Optional[int],
+    batch_size: Optional[int] = None,
+    sources_from: str = DEFAULT_PUBLISHER,
+) -> None:
+    """
+    Main function to register the publisher shards of $<NETWORK>_PUBLISHER_SHARDS
+    with the sources of `sources_from`.
+    """
+    from pragma_deployer.utils.constants import NETWORK
+    from pragma_deployer.utils.starknet import build_call, call_many, invoke_many
+
+    shards = NETWORK["publisher_shards"]
+    if not shards:
+        logger.info(
+            f"ℹ️  No publisher shards, set {NETWORK['name'].upper()}_PUBLISHER_SHARDS"
+        )
+        return
+
+    registry_state = await call_many(
+        [("pragma_PublisherRegistry", "get_publisher_sources", sources_from)]
+        + [
+            ("pragma_PublisherRegistry", "get_publisher_address", shard["publisher"])
+            for shard in shards
+        ]
+        + [
+            ("pragma_PublisherRegistry", "get_publisher_sources", shard["publisher"])
+            for shard in shards
+        ],
+        port=port,
+    )
+    (sources,) = registry_state[0]
+    existing_addresses = registry_state[1 : len(shards) + 1]
+    existing_sources_list = registry_state[len(shards) + 1 :]
+    if not sources:
+        logger.warning(f"⚠️  {sources_from} has no sources to give to its shards")
+
+    calls = []
+    for shard, (existing_address,), (existing_sources,) in zip(
+        shards, existing_addresses, existing_sources_list
+    ):
+        publisher = shard["publisher"]
+        address = int(shard["account_address"], 16)
+        if existing_address == 0:
+            calls.append(
+                build_call(
+                    "pragma_PublisherRegistry", "add_publisher", [publisher, address]
+                )
+            )
+            logger.info(f"Registering publisher shard {publisher}")
+        elif existing_address != address:
+            raise click.ClickException(
+                f"⛔ Publisher {publisher} is registered with address "
+                f"{hex(existing_address)}, not {hex(address)}"
+            )
+
+        new_sources = [source for source in sources if source not in existing_sources]
+        if new_sources:
+            calls.append(
+                build_call(
+                    "pragma_PublisherRegistry",
+                    "add_sources_for_publisher",
+                    [publisher, len(new_sources), *new_sources],
+                )
+            )
+            logger.info(
+                f"Registering {len(new_sources)} sources for publisher shard {publisher}"
+            )
+
+    tx_hashes = await invoke_many(calls, batch_size=batch_size, port=port)
+    for tx_hash in tx_hashes:
+        logger.info(f"Publisher Registry updated with tx {hex(tx_hash)}")
+
+    logger.info(f"ℹ️ {len(shards)} publisher shards of {sources_from} registered.")
+
+
+@click.command()
+@click.option(
+    "--log-level",
+    type=click.Choice(
+        ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], case_sensitive=False
+    ),
+    default="INFO",
+    help="Set the logging level",
+)
+@click.option(
+    "-p",
+    "--port",
+    type=click.IntRange(min=0),
+    required=False,
+    help="Port number (required for Devnet network)",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    required=False,
+    help="Max calls per multicall transaction (default: as many as fit the budget)",
+)
+@click.option(
+    "--sources-from",
+    default=DEFAULT_PUBLISHER,
+    help="Publisher whose sources the shards may publish",
+)
+@click.option(
+    "--metrics-out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=False,
+    help="Write RPC metrics to this file at exit (JSON if it ends with .json, "
+    "Prometheus text otherwise)",
+)
+def cli_entrypoint(
+    log_level: str,
+    port: Optional[int],
+    batch_size: Optional[int],
+    sources_from: str,
+    metrics_out: Optional[Path],
+) -> None:
+    """
+    CLI entrypoint to register the publisher shards.
+    """
+    setup_logging(logger, log_level)
+
+    load_env()
+    export_metrics_at_exit(metrics_out)
+    if os.getenv("STARKNET_NETWORK") == "devnet" and port is None:
+        raise click.UsageError('⛔ "--port" must be set for Devnet.')
+
+    import asyncio
+
+    from pragma_deployer.utils.starknet import with_client_pool
+
+    asyncio.run(with_client_pool(main(port, batch_size, sources_from)))
+
+
+if __name__ == "__main__":
+    cli_entrypoint()
@@ -1,23 +1,16 @@
 import os
-import asyncio
 import click
 import logging
 
+from pathlib import Path
 from typing import Optional
 
-from dotenv import load_dotenv
 from pragma_utils.logger import setup_logging
 
-from pragma_deployer.utils.constants import (
-    NETWORK,
-)
-from pragma_deployer.utils.starknet import (
-    invoke,
-    call,
-    str_to_felt,
-)
+from pragma_deployer.utils.constants import load_env
+from pragma_deployer.utils.metrics import export_metrics_at_exit
 
-load_dotenv()
+load_env()
 
 logger = logging.getLogger(__name__)
 
@@ -94,7 +87,7 @@ PUBLISHERS = []
 PUBLISHERS_SOURCES = []
 PUBLISHER_ADDRESS = []
 
-if NETWORK["name"] == "mainnet":
+if os.getenv("STARKNET_NETWORK", "devnet") == "mainnet":
     PUBLISHERS = [
         "PRAGMA",
         "FOURLEAF",
@@ -136,7 +129,7 @@ if NETWORK["name"] == "mainnet":
     ]
     admin_address = 0x02356B628D108863BAF8644C945D97BAD70190AF5957031F4852D00D0F690A77
 
-if NETWORK["name"] == "sepolia":
+if os.getenv("STARKNET_NETWORK", "devnet") == "sepolia":
     PUBLISHERS = ["PRAGMA", "PRAGMA_MERKLE", "FOURLEAF", "AVNU", "ALENO", "KAIKO", "ARGENT_NEW"]
     PUBLISHERS_SOURCES = [
         THIRD_PARTY_SOURCES,
@@ -158,51 +151,68 @@ if NETWORK["name"] == "sepolia":
     ]
 
 
-async def main(port: Optional[int]) -> None:
+async def main(port: Optional[int], batch_size: Optional[int] = None) -> None:
     """
     Main function to initialize the Publisher Registry.
     """
+    from pragma_deployer.utils.starknet import (
+        build_call,
+        call_many,
+        invoke_many,
+        str_to_felt,
+    )
+
     logger.info("🚀 Initializing Publisher Registry...")
-    for publisher, sources, address in zip(
-        PUBLISHERS, PUBLISHERS_SOURCES, PUBLISHER_ADDRESS
+    # Fetch the registry state of every publisher in a single batch
+    registry_state = await call_many(
+        [
+            ("pragma_PublisherRegistry", "get_publisher_address", publisher)
+            for publisher in PUBLISHERS
+        ]
+        + [
+            ("pragma_PublisherRegistry", "get_publisher_sources", publisher)
+            for publisher in PUBLISHERS
+        ],
+        port=port,
+    )
+    existing_addresses = registry_state[: len(PUBLISHERS)]
+    existing_sources_list = registry_state[len(PUBLISHERS) :]
+
+    calls = []
+    for publisher, sources, address, (existing_address,), (existing_sources,) in zip(
+        PUBLISHERS,
+        PUBLISHERS_SOURCES,
+        PUBLISHER_ADDRESS,
+        existing_addresses,
+        existing_sources_list,
     ):
-        (existing_address,) = await call(
-            "pragma_PublisherRegistry",
-            "get_publisher_address",
-            publisher,
-            port=port,
-        )
         if existing_address == 0:
-            tx_hash = await invoke(
-                "pragma_PublisherRegistry",
-                "add_publisher",
-                [publisher, address],
-                port=port,
+            calls.append(
+                build_call(
+                    "pragma_PublisherRegistry", "add_publisher", [publisher, address]
+                )
             )
-            logger.info(f"Registered new publisher {publisher} with tx {hex(tx_hash)}")
+            logger.info(f"Registering new publisher {publisher}")
         elif existing_address != address:
             logger.info(
                 f"Publisher {publisher} registered with address {hex(existing_address)} but config has address {hex(address)}. Exiting..."
             )
-            return
-
-        (existing_sources,) = await call(
-            "pragma_PublisherRegistry",
-            "get_publisher_sources",
-            publisher,
-            port=port,
-        )
+            break
+
         new_sources = [x for x in sources if str_to_felt(x) not in existing_sources]
         if len(new_sources) > 0:
-            tx_hash = await invoke(
-                "pragma_PublisherRegistry",
-                "add_sources_for_publisher",
-                [publisher, len(new_sources), *new_sources],
-                port=port,
-            )
-            logger.info(
-                f"Registered sources {new_sources} for publisher {publisher} with tx {hex(tx_hash)}"
+            calls.append(
+                build_call(
+                    "pragma_PublisherRegistry",
+                    "add_sources_for_publisher",
+                    [publisher, len(new_sources), *new_sources],
+                )
             )
+            logger.info(f"Registering sources {new_sources} for publisher {publisher}")
+
+    tx_hashes = await invoke_many(calls, batch_size=batch_size, port=port)
+    for tx_hash in tx_hashes:
+        logger.info(f"Publisher Registry updated with tx {hex(tx_hash)}")
 
     logger.info("ℹ️ Publisher Registry initialization completed.")
 
@@ -223,16 +233,40 @@ async def main(port: Optional[int]) -> None:
     required=False,
     help="Port number (required for Devnet network)",
 )
-def cli_entrypoint(log_level: str, port: Optional[int]) -> None:
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    required=False,
+    help="Max calls per multicall transaction (default: as many as fit the budget)",
+)
+@click.option(
+    "--metrics-out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=False,
+    help="Write RPC metrics to this file at exit (JSON if it ends with .json, "
+    "Prometheus text otherwise)",
+)
+def cli_entrypoint(
+    log_level: str,
+    port: Optional[int],
+    batch_size: Optional[int],
+    metrics_out: Optional[Path],
+) -> None:
     """
     CLI entrypoint to initialize the Publisher Registry.
     """
     setup_logging(logger, log_level)
 
+    load_env()
+    export_metrics_at_exit(metrics_out)
     if os.getenv("STARKNET_NETWORK") == "devnet" and port is None:
         raise click.UsageError('⛔ "--port" must be set for Devnet.')
 
-    asyncio.run(main(port))
+    import asyncio
+
+    from pragma_deployer.utils.starknet import with_client_pool
+
+    asyncio.run(with_client_pool(main(port, batch_size)))
 
 
 if __name__ == "__main__":
@@ -1,23 +1,14 @@
 import os
-import asyncio
 import click
 import logging
 
+from pathlib import Path
 from typing import Optional
 
-from dotenv import load_dotenv
 from pragma_utils.logger import setup_logging
 
-from pragma_deployer.utils.constants import (
-    NETWORK,
-)
-from pragma_deployer.utils.starknet import (
-    invoke,
-    call,
-    str_to_felt,
-)
-
-load_dotenv()
+from pragma_deployer.utils.constants import load_env
+from pragma_deployer.utils.metrics import export_metrics_at_exit
 
 logger = logging.getLogger(__name__)
 
@@ -58,21 +49,28 @@ TOKENS_TO_REGISTER = [
     # },
 ]
 
-async def main(port: Optional[int]) -> None:
+async def main(port: Optional[int], batch_size: Optional[int] = None) -> None:
     """
     Main function to register tokenized vaults.
     """
+    from pragma_deployer.utils.starknet import (
+        build_call,
+        invoke_many,
+    )
+
     logger.info("🚀 Registering tokenized vaults...")
     
-    for token in TOKENS_TO_REGISTER:
-        tx_hash = await invoke(
+    calls = [
+        build_call(
             "pragma_Oracle",
             "register_tokenized_vault",
             [token["name"], token["underlying_token"], token["address"]],
-            port=port,
         )
-        logger.info(f"Registered tokenized vault {token['name']} with tx {hex(tx_hash)}")
-        await asyncio.sleep(1)
+        for token in TOKENS_TO_REGISTER
+    ]
+    tx_hashes = await invoke_many(calls, batch_size=batch_size, port=port)
+    for tx_hash in tx_hashes:
+        logger.info(f"Registered tokenized vaults with tx {hex(tx_hash)}")
 
     logger.info("ℹ️ Tokenized vault registration completed.")
 
@@ -93,16 +91,40 @@ async def main(port: Optional[int]) -> None:
     required=False,
     help="Port number (required for Devnet network)",
 )
-def cli_entrypoint(log_level: str, port: Optional[int]) -> None:
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    required=False,
+    help="Max calls per multicall transaction (default: as many as fit the budget)",
+)
+@click.option(
+    "--metrics-out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=False,
+    help="Write RPC metrics to this file at exit (JSON if it ends with .json, "
+    "Prometheus text otherwise)",
+)
+def cli_entrypoint(
+    log_level: str,
+    port: Optional[int],
+    batch_size: Optional[int],
+    metrics_out: Optional[Path],
+) -> None:
     """
     CLI entrypoint to register a tokenized vault.
     """
     setup_logging(logger, log_level)
 
+    load_env()
+    export_metrics_at_exit(metrics_out)
     if os.getenv("STARKNET_NETWORK") == "devnet" and port is None:
         raise click.UsageError('⛔ "--port" must be set for Devnet.')
 
-    asyncio.run(main(port))
+    import asyncio
+
+    from pragma_deployer.utils.starknet import with_client_pool
+
+    asyncio.run(with_client_pool(main(port, batch_size)))
 
 
 if __name__ == "__main__":
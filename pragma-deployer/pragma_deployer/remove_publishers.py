@@ -1,19 +1,14 @@
 import os
-import asyncio
 import click
 import logging
 
+from pathlib import Path
 from typing import Optional
 
-from dotenv import load_dotenv
 from pragma_utils.logger import setup_logging
 
-from pragma_deployer.utils.starknet import (
-    invoke,
-    str_to_felt,
-)
-
-load_dotenv()
+from pragma_deployer.utils.constants import load_env
+from pragma_deployer.utils.metrics import export_metrics_at_exit
 
 logger = logging.getLogger(__name__)
 
@@ -26,19 +21,24 @@ PUBLISHERS = [
 ]
 
 
-async def main(port: Optional[int]) -> None:
+async def main(port: Optional[int], batch_size: Optional[int] = None) -> None:
     """
     Main function to remove publishers from the Publisher Registry.
     """
-    for publisher in PUBLISHERS:
-        await invoke(
-            "pragma_PublisherRegistry",
-            "remove_publisher",
-            [str_to_felt(publisher)],
-            port=port,
-        )
-        logger.info(f"ℹ️ Removed publisher {publisher}.")
+    from pragma_deployer.utils.starknet import (
+        build_call,
+        invoke_many,
+        str_to_felt,
+    )
 
+    calls = [
+        build_call(
+            "pragma_PublisherRegistry", "remove_publisher", [str_to_felt(publisher)]
+        )
+        for publisher in PUBLISHERS
+    ]
+    await invoke_many(calls, batch_size=batch_size, port=port)
+    logger.info(f"ℹ️ Removed publishers {PUBLISHERS}.")
 
 @click.command()
 @click.option(
@@ -56,16 +56,40 @@ async def main(port: Optional[int]) -> None:
     required=False,
     help="Port number (required for Devnet network)",
 )
-def cli_entrypoint(log_level: str, port: Optional[int]) -> None:
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    required=False,
+    help="Max calls per multicall transaction (default: as many as fit the budget)",
+)
+@click.option(
+    "--metrics-out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=False,
+    help="Write RPC metrics to this file at exit (JSON if it ends with .json, "
+    "Prometheus text otherwise)",
+)
+def cli_entrypoint(
+    log_level: str,
+    port: Optional[int],
+    batch_size: Optional[int],
+    metrics_out: Optional[Path],
+) -> None:
     """
     CLI entrypoint to remove publishers from the Publisher Registry.
     """
     setup_logging(logger, log_level)
 
+    load_env()
+    export_metrics_at_exit(metrics_out)
     if os.getenv("STARKNET_NETWORK") == "devnet" and port is None:
         raise click.UsageError('⛔ "--port" must be set for Devnet.')
 
-    asyncio.run(main(port))
+    import asyncio
+
+    from pragma_deployer.utils.starknet import with_client_pool
+
+    asyncio.run(with_client_pool(main(port, batch_size)))
 
 
 if __name__ == "__main__":
@@ -1,23 +1,14 @@
 import os
-import asyncio
 import click
 import logging
 
+from pathlib import Path
 from typing import Optional
 
-from dotenv import load_dotenv
 from pragma_utils.logger import setup_logging
 
-from pragma_deployer.utils.constants import (
-    NETWORK,
-)
-from pragma_deployer.utils.starknet import (
-    get_starknet_account,
-    invoke,
-    str_to_felt,
-)
-
-load_dotenv()
+from pragma_deployer.utils.constants import load_env
+from pragma_deployer.utils.metrics import export_metrics_at_exit
 
 logger = logging.getLogger(__name__)
 
@@ -36,16 +27,25 @@ PAIR_IDS = [
 ]
 
 
-async def main(port: Optional[int]) -> None:
+async def main(port: Optional[int], batch_size: Optional[int] = None) -> None:
     """
     Main function to remove AVNU source for specified pairs.
     """
+    from pragma_deployer.utils.constants import NETWORK
+    from pragma_deployer.utils.starknet import (
+        get_starknet_account,
+        build_call,
+        invoke_many,
+        str_to_felt,
+    )
+
     chain_id = NETWORK["chain_id"]
     logger.info(f"ℹ️  Connected to CHAIN_ID {chain_id}")
 
     account = await get_starknet_account(port=port)
     logger.info(f"ℹ️  Using account {hex(account.address)} as upgrader")
 
+    calls = []
     for pair_id in PAIR_IDS:
         pair_id_felt = str_to_felt(pair_id) if isinstance(pair_id, str) else pair_id
         if not isinstance(pair_id_felt, int):
@@ -53,12 +53,14 @@ async def main(port: Optional[int]) -> None:
                 "Pair ID must be string (will be converted to felt) or integer"
             )
 
-        tx_hash = await invoke(
-            "pragma_Oracle", "remove_source", ["AVNU", 0, pair_id_felt], port=port
+        calls.append(
+            build_call("pragma_Oracle", "remove_source", ["AVNU", 0, pair_id_felt])
         )
-        logger.info(f"Removed source for pair {pair_id} with tx {hex(tx_hash)}")
 
-    logger.info(f"Upgraded the oracle contract with tx {hex(tx_hash)}")
+    tx_hashes = await invoke_many(calls, batch_size=batch_size, port=port)
+    for tx_hash in tx_hashes:
+        logger.info(f"Removed source for pairs with tx {hex(tx_hash)}")
+
     logger.info("✅ Upgrade Completed")
 
 
@@ -78,16 +80,40 @@ async def main(port: Optional[int]) -> None:
     required=False,
     help="Port number (required for Devnet network)",
 )
-def cli_entrypoint(log_level: str, port: Optional[int]) -> None:
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    required=False,
+    help="Max calls per multicall transaction (default: as many as fit the budget)",
+)
+@click.option(
+    "--metrics-out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=False,
+    help="Write RPC metrics to this file at exit (JSON if it ends with .json, "
+    "Prometheus text otherwise)",
+)
+def cli_entrypoint(
+    log_level: str,
+    port: Optional[int],
+    batch_size: Optional[int],
+    metrics_out: Optional[Path],
+) -> None:
     """
     CLI entrypoint to remove AVNU source for specified pairs.
     """
     setup_logging(logger, log_level)
 
+    load_env()
+    export_metrics_at_exit(metrics_out)
     if os.getenv("STARKNET_NETWORK") == "devnet" and port is None:
         raise click.UsageError('⛔ "--port" must be set for Devnet.')
 
-    asyncio.run(main(port))
+    import asyncio
+
+    from pragma_deployer.utils.starknet import with_client_pool
+
+    asyncio.run(with_client_pool(main(port, batch_size)))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,165 @@
+import click
+import logging
+import random
+
+from pathlib import Path
+from typing import Optional
+
+from pragma_utils.logger import setup_logging
+
+from pragma_deployer.utils.cassette import CassettePlayer, load_cassette
+
+
+logger = logging.getLogger(__name__)
+
+
+async def start_replay_server(
+    cassette_path: Path,
+    host: str = "127.0.0.1",
+    port: int = 5050,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    recorded_latency: bool = False,
+    seed: Optional[int] = None,
+):
+    """
+    Serve the cassette at `cassette_path` on http://host:port/rpc. Every HTTP
+    request is delayed by `latency_ms` plus up to `jitter_ms`, or by the
+    latency observed when recording with `recorded_latency`.
+    """
+    import asyncio
+
+    from aiohttp import web
+
+    player = CassettePlayer(load_cassette(cassette_path))
+    rng = random.Random(seed)
+
+    async def rpc(request: web.Request) -> web.Response:
+        body = await request.json()
+        items = body if isinstance(body, list) else [body]
+        answers = [player.answer(item) for item in items]
+        responses = [response for response, _ in answers]
+        # Batch items were recorded with the latency of the whole batch
+        if recorded_latency:
+            delay = max(latency for _, latency in answers)
+        else:
+            delay = (latency_ms + rng.uniform(0, jitter_ms)) / 1e3
+        await asyncio.sleep(delay)
+        return web.json_response(
+            responses if isinstance(body, list) else responses[0]
+        )
+
+    app = web.Application()
+    app.router.add_post("/rpc", rpc)
+    app.router.add_post("/", rpc)
+    app["player"] = player
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+async def main(
+    cassette_path: Path,
+    host: str,
+    port: int,
+    latency_ms: float,
+    jitter_ms: float,
+    recorded_latency: bool,
+    seed: Optional[int],
+) -> None:
+    import asyncio
+
+    runner = await start_replay_server(
+        cassette_path, host, port, latency_ms, jitter_ms, recorded_latency, seed
+    )
+    player = runner.app["player"]
+    logger.info(f"ℹ️  Replaying {cassette_path} on http://{host}:{port}/rpc")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        logger.info(
+            f"ℹ️  Answered {player.stats['exact']} exact, "
+            f"{player.stats['fallback']} fallback, {player.stats['missing']} missing"
+        )
+        await runner.cleanup()
+
+
+@click.command()
+@click.option(
+    "--log-level",
+    type=click.Choice(
+        ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"], case_sensitive=False
+    ),
+    default="INFO",
+    help="Set the logging level",
+)
+@click.option(
+    "-c",
+    "--cassette",
+    "cassette_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    required=True,
+    help="Cassette recorded with RPC_RECORD",
+)
+@click.option("--host", default="127.0.0.1", help="Address to listen on")
+@click.option(
+    "-p",
+    "--port",
+    type=click.IntRange(min=0),
+    default=5050,
+    help="Port to listen on, pass it as --port to the scripts",
+)
+@click.option(
+    "--latency-ms",
+    type=click.FloatRange(min=0),
+    default=0.0,
+    help="Synthetic latency added to every request",
+)
+@click.option(
+    "--jitter-ms",
+    type=click.FloatRange(min=0),
+    default=0.0,
+    help="Uniform random latency added on top of --latency-ms",
+)
+@click.option(
+    "--recorded-latency",
+    is_flag=True,
+    help="Replay the latencies observed when recording instead",
+)
+@click.option("--seed", type=int, required=False, help="Seed of the jitter")
+def cli_entrypoint(
+    log_level: str,
+    cassette_path: Path,
+    host: str,
+    port: int,
+    latency_ms: float,
+    jitter_ms: float,
+    recorded_latency: bool,
+    seed: Optional[int],
+) -> None:
+    """
+    Local JSON-RPC node replaying a recorded cassette.
+    """
+    setup_logging(logger, log_level)
+
+    import asyncio
+
+    try:
+        asyncio.run(
+            main(
+                cassette_path,
+                host,
+                port,
+                latency_ms,
+                jitter_ms,
+                recorded_latency,
+                seed,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    cli_entrypoint()
@@ -1,25 +1,14 @@
 import os
-import asyncio
 import click
 import logging
 
+from pathlib import Path
 from typing import Optional
 
-from dotenv import load_dotenv
 from pragma_utils.logger import setup_logging
 
-from pragma_deployer.utils.constants import (
-    NETWORK,
-)
-from pragma_deployer.utils.starknet import (
-    dump_declarations,
-    get_declarations,
-    get_starknet_account,
-    invoke,
-    declare_v3,
-)
-
-load_dotenv()
+from pragma_deployer.utils.constants import load_env
+from pragma_deployer.utils.metrics import export_metrics_at_exit
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +17,15 @@ async def main(port: Optional[int]) -> None:
     """
     Main function to upgrade the Oracle contract.
     """
+    from pragma_deployer.utils.constants import NETWORK
+    from pragma_deployer.utils.starknet import (
+        get_declarations,
+        get_starknet_account,
+        invoke,
+        declare_v3,
+        update_declarations,
+    )
+
     chain_id = NETWORK["chain_id"]
     logger.info(f"ℹ️  Connected to CHAIN_ID {chain_id}")
 
@@ -45,8 +43,7 @@ async def main(port: Optional[int]) -> None:
         "pragma_Oracle", "upgrade", [new_implementation_hash], port=port
     )
 
-    declarations["pragma_Oracle"] = new_implementation_hash
-    dump_declarations(declarations)
+    update_declarations({"pragma_Oracle": new_implementation_hash})
 
     logger.info(f"Upgraded the oracle contract with tx {hex(tx_hash)}")
 
@@ -69,16 +66,31 @@ async def main(port: Optional[int]) -> None:
     required=False,
     help="Port number (required for Devnet network)",
 )
-def cli_entrypoint(log_level: str, port: Optional[int]) -> None:
+@click.option(
+    "--metrics-out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=False,
+    help="Write RPC metrics to this file at exit (JSON if it ends with .json, "
+    "Prometheus text otherwise)",
+)
+def cli_entrypoint(
+    log_level: str, port: Optional[int], metrics_out: Optional[Path]
+) -> None:
     """
     CLI entrypoint to upgrade the Oracle contract.
     """
     setup_logging(logger, log_level)
 
+    load_env()
+    export_metrics_at_exit(metrics_out)
     if os.getenv("STARKNET_NETWORK") == "devnet" and port is None:
         raise click.UsageError('⛔ "--port" must be set for Devnet.')
 
-    asyncio.run(main(port))
+    import asyncio
+
+    from pragma_deployer.utils.starknet import with_client_pool
+
+    asyncio.run(with_client_pool(main(port)))
 
 
 if __name__ == "__main__":
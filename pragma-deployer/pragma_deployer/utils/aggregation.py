@@ -0,0 +1,291 @@
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from pragma_sdk.common.types.entry import Entry
+from pragma_sdk.common.types.types import AggregationMode, DataTypes
+
+from pragma_deployer.utils.data_keys import DataKey, get_data_key
+
+U64_MAX = 2**64 - 1
+U128_MAX = 2**128 - 1
+
+# Entries older than this many seconds before the latest one of their data
+# type are left out of the aggregation, see oracle.cairo.
+BACKWARD_TIMESTAMP_BUFFER = 3600
+
+
+def to_u128(values) -> np.ndarray:
+    """
+    `values` as a uint64 array when they all fit, as an object array of
+    Python ints otherwise.
+    """
+    values = np.asarray(values)
+    if values.dtype == object:
+        if values.size and (values.min() < 0 or values.max() > U128_MAX):
+            raise ValueError("Values must fit in a u128")
+        if not values.size or values.max() <= U64_MAX:
+            return values.astype(np.uint64)
+        return values
+    if values.dtype.kind not in "iu":
+        raise ValueError("Values must be integers")
+    if values.dtype.kind == "i" and values.size and values.min() < 0:
+        raise ValueError("Values must fit in a u128")
+    return values.astype(np.uint64, copy=False)
+
+
+def _select(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    # np.where(mask, values, 0) without branching on random masks
+    return values * mask
+
+
+def _single(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    # The aggregate of at most one value along a last axis of length one,
+    # without the slow reductions over such an axis
+    return _select(values[..., 0], mask[..., 0])
+
+
+def _check_u128(values: np.ndarray, mask: np.ndarray) -> None:
+    if values.dtype == object and np.any(mask & (values > U128_MAX)):
+        raise OverflowError("u128_add Overflow")
+
+
+def entries_median(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    `Entry::entries_median` of the values of the last axis selected by
+    `mask`: the middle one, or the floor of the sum of the two middle ones
+    halved, 0 when none is selected.
+    """
+    values = to_u128(values)
+    if values.shape[-1] == 0:
+        return np.zeros(values.shape[:-1], dtype=np.uint64)
+    if values.shape[-1] == 1:
+        return _single(values, mask)
+    counts = np.count_nonzero(mask, axis=-1)
+    # Unselected values are sorted after the selected ones
+    if values.dtype == np.uint64:
+        # All ones where unselected: mask - 1 wraps around
+        ordered = values | (mask.astype(np.uint64) - np.uint64(1))
+    else:
+        ordered = np.where(mask, values, U128_MAX + 1)
+    ordered.sort(axis=-1)
+    upper_idx = np.minimum(counts // 2, values.shape[-1] - 1)
+    lower_idx = np.maximum(counts // 2 - 1, 0)
+    upper = np.take_along_axis(ordered, upper_idx[..., None], axis=-1)[..., 0]
+    lower = np.take_along_axis(ordered, lower_idx[..., None], axis=-1)[..., 0]
+
+    even = (counts % 2 == 0) & (counts > 0)
+    if values.dtype == np.uint64:
+        # (lower + upper) / 2 without wrapping, a u128 sum of u64 never overflows
+        halved = (lower >> 1) + (upper >> 1) + (lower & upper & 1)
+    else:
+        total = np.where(even, lower + upper, 0)
+        _check_u128(total, even)
+        halved = total // 2
+    median = np.where(even, halved, upper)
+    return np.where(counts > 0, median, 0).astype(values.dtype)
+
+
+def entries_mean(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    `Entry::entries_mean` of the values of the last axis selected by
+    `mask`: the floor of their sum divided by their count, 0 when none is
+    selected.
+    """
+    values = to_u128(values)
+    if values.shape[-1] == 1:
+        return _single(values, mask)
+    counts = np.count_nonzero(mask, axis=-1)
+    selected = _select(values, mask)
+    if values.dtype == np.uint64 and selected.size:
+        # Sum in Python ints when a uint64 sum could wrap
+        if int(selected.max()) * values.shape[-1] > U64_MAX:
+            selected = selected.astype(object)
+    total = np.asarray(selected.sum(axis=-1))
+    _check_u128(total, counts > 0)
+    mean = total // np.maximum(counts, 1).astype(selected.dtype)
+    return to_u128(np.where(counts > 0, mean, 0))
+
+
+def aggregate_entries(
+    values: np.ndarray,
+    mask: np.ndarray,
+    aggregation_mode: AggregationMode = AggregationMode.MEDIAN,
+) -> np.ndarray:
+    """
+    `Entry::aggregate_entries` along the last axis.
+    """
+    if aggregation_mode == AggregationMode.MEDIAN:
+        return entries_median(values, mask)
+    if aggregation_mode == AggregationMode.AVERAGE:
+        return entries_mean(values, mask)
+    raise ValueError("Wrong aggregation mode")
+
+
+def aggregate_timestamps_max(timestamps: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    `Entry::aggregate_timestamps_max` along the last axis, 0 when empty.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.uint64)
+    if timestamps.shape[-1] == 1:
+        return _single(timestamps, mask)
+    return _select(timestamps, mask).max(axis=-1, initial=0)
+
+
+class PricesResponse:
+    """
+    Columns of the `PragmaPricesResponse` of each data type aggregated by
+    `get_data_for_sources`, without the decimals.
+    """
+
+    def __init__(
+        self,
+        price: np.ndarray,
+        last_updated_timestamp: np.ndarray,
+        num_sources_aggregated: np.ndarray,
+    ):
+        self.price = price
+        self.last_updated_timestamp = last_updated_timestamp
+        self.num_sources_aggregated = num_sources_aggregated
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def __getitem__(self, index: int) -> dict:
+        return {
+            "price": int(self.price[index]),
+            "last_updated_timestamp": int(self.last_updated_timestamp[index]),
+            "num_sources_aggregated": int(self.num_sources_aggregated[index]),
+        }
+
+
+def get_data_for_sources(
+    prices: np.ndarray,
+    timestamps: np.ndarray,
+    block_timestamp: int,
+    aggregation_mode: AggregationMode = AggregationMode.MEDIAN,
+) -> PricesResponse:
+    """
+    What the Oracle's `get_data_for_sources` returns for each data type, from
+    the entries it stores as (data type, source, publisher) arrays, a zero
+    timestamp marking a publisher without an entry.
+
+    The latest entry timestamp, capped at `block_timestamp`, sets the window
+    of the entries kept (`get_data_entries_for_sources`). Every source with
+    a kept entry counts in `num_sources_aggregated`. The entries of a source
+    with a non-zero price are aggregated into its price and timestamp
+    (`compute_median_for_source`); a source whose prices are all zero still
+    takes part with a zero price. The sources' prices are aggregated the same
+    way, and the latest of their timestamps is the data type's. Raises
+    OverflowError where the Oracle's u64/u128 arithmetic would panic.
+    """
+    prices = to_u128(prices)
+    timestamps = np.asarray(timestamps, dtype=np.uint64)
+
+    latest = timestamps.max(axis=(1, 2), initial=0)
+    conservative = np.minimum(latest, np.uint64(block_timestamp))
+    early = conservative < BACKWARD_TIMESTAMP_BUFFER
+    if np.any(early) and np.any(timestamps[early]):
+        raise OverflowError("u64_sub Overflow")
+    oldest = np.maximum(conservative, BACKWARD_TIMESTAMP_BUFFER) - np.uint64(
+        BACKWARD_TIMESTAMP_BUFFER
+    )
+    # Uninitialized entries, with a zero timestamp, are never kept
+    kept = timestamps > oldest[:, None, None]
+
+    sources = kept[..., 0] if kept.shape[-1] == 1 else kept.any(axis=2)
+    valid = kept & (prices != 0)
+    source_prices = aggregate_entries(prices, valid, aggregation_mode)
+    return PricesResponse(
+        price=aggregate_entries(source_prices, sources, aggregation_mode),
+        # The latest of the sources' latest valid entries
+        last_updated_timestamp=_select(timestamps, valid).max(axis=(1, 2), initial=0),
+        num_sources_aggregated=np.count_nonzero(sources, axis=1),
+    )
+
+
+def get_checkpoint_writes(
+    response: PricesResponse,
+    sources_threshold: int,
+    latest_checkpoint_timestamp,
+    block_timestamp: int,
+) -> np.ndarray:
+    """
+    Whether `set_checkpoint` writes a checkpoint for each data type of
+    `response`: more sources than the threshold and a block after the next
+    checkpoint timestamp. It reverts, and so does `set_checkpoints`, when a
+    data type has no entry.
+    """
+    if np.any(response.last_updated_timestamp == 0):
+        raise ValueError("No checkpoint available")
+    latest_checkpoint_timestamp = np.asarray(latest_checkpoint_timestamp, np.uint64)
+    return (sources_threshold < response.num_sources_aggregated) & (
+        latest_checkpoint_timestamp + 1 < block_timestamp
+    )
+
+
+class EntryGrid:
+    """
+    Entries laid out for `get_data_for_sources`: one row per data key, one
+    column per source and one slot per publisher of the source. A later
+    entry for the same (data key, source, publisher) replaces the earlier
+    one, as in the Oracle's storage, so stored entries followed by pending
+    ones predict the prices once those are published.
+    """
+
+    def __init__(self, entries: Iterable[Entry] = ()):
+        self.data_keys: List[DataKey] = []
+        self._rows: Dict[DataKey, int] = {}
+        self._cells: Dict[Tuple[int, int, int], Tuple[int, int]] = {}
+        self._columns: List[Dict[int, int]] = []
+        self._slots: Dict[Tuple[int, int], Dict[int, int]] = {}
+        self.add(entries)
+
+    def add(self, entries: Iterable[Entry]) -> None:
+        for entry in entries:
+            data_key = get_data_key(entry)
+            row = self._rows.get(data_key)
+            if row is None:
+                row = self._rows[data_key] = len(self.data_keys)
+                self.data_keys.append(data_key)
+                self._columns.append({})
+            columns = self._columns[row]
+            column = columns.setdefault(entry.base.source, len(columns))
+            slots = self._slots.setdefault((row, column), {})
+            slot = slots.setdefault(entry.base.publisher, len(slots))
+            if entry.get_asset_type() == DataTypes.GENERIC:
+                price = entry.value
+            else:
+                price = entry.price
+            self._cells[(row, column, slot)] = (price, entry.base.timestamp)
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The (data key, source, publisher) prices and timestamps.
+        """
+        shape = (
+            len(self.data_keys),
+            max(map(len, self._columns), default=0),
+            max(map(len, self._slots.values()), default=0),
+        )
+        prices = np.zeros(shape, dtype=object)
+        timestamps = np.zeros(shape, dtype=np.uint64)
+        for cell, (price, timestamp) in self._cells.items():
+            prices[cell] = price
+            timestamps[cell] = timestamp
+        return to_u128(prices), timestamps
+
+    def aggregate(
+        self,
+        block_timestamp: int,
+        aggregation_mode: AggregationMode = AggregationMode.MEDIAN,
+    ) -> Dict[DataKey, dict]:
+        """
+        The `PragmaPricesResponse`, without decimals, of every data key.
+        """
+        if not self.data_keys:
+            return {}
+        response = get_data_for_sources(
+            *self.to_arrays(), block_timestamp, aggregation_mode
+        )
+        return {data_key: response[row] for row, data_key in enumerate(self.data_keys)}
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+
+from typing import Any, List, Optional, Tuple
+
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.client_models import Call
+from starknet_py.net.client_utils import _to_rpc_felt, get_block_identifier
+from starknet_py.net.full_node_client import FullNodeClient
+from starknet_py.net.http_client import HttpMethod
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# JSON-RPC error code of a request the node cannot handle, such as a batch.
+INVALID_REQUEST = -32600
+
+
+class BatchRejectedError(Exception):
+    pass
+
+
+class BatchCaller:
+    """
+    Coalesces `starknet_call` requests into JSON-RPC batch requests.
+
+    Calls issued during the same event loop iteration (e.g. under one
+    `asyncio.gather`) are queued and flushed together, in chunks of at most
+    `max_batch_size` requests per HTTP round trip. Nodes that reject batches
+    are remembered and served with concurrent single requests instead.
+    """
+
+    def __init__(
+        self,
+        client: FullNodeClient,
+        max_batch_size: int = 50,
+        max_concurrency: int = 8,
+    ):
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.batch_supported = True
+        self._singles = asyncio.Semaphore(max_concurrency)
+        self._queue: List[Tuple[Call, asyncio.Future]] = []
+        self._flush_scheduled = False
+
+    async def call(self, call: Call) -> List[int]:
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((call, future))
+        if len(self._queue) >= self.max_batch_size:
+            self._flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+        return await future
+
+    async def call_many(self, calls: List[Call]) -> List[List[int]]:
+        return await asyncio.gather(*(self.call(call) for call in calls))
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        queue, self._queue = self._queue, []
+        for i in range(0, len(queue), self.max_batch_size):
+            asyncio.create_task(self._send(queue[i : i + self.max_batch_size]))
+
+    async def _send(self, items: List[Tuple[Call, asyncio.Future]]) -> None:
+        calls = [call for call, _ in items]
+        if len(calls) > 1 and self.batch_supported:
+            try:
+                results = await self._post_batch(calls)
+            except BatchRejectedError as e:
+                if self.batch_supported:
+                    logger.warning(
+                        f"⚠️  {self.client.url} rejected a batch request ({e}), "
+                        "falling back to single requests"
+                    )
+                    self.batch_supported = False
+                results = await self._send_singles(calls)
+            except Exception as e:
+                results = [e] * len(calls)
+        else:
+            results = await self._send_singles(calls)
+
+        for (_, future), result in zip(items, results):
+            _resolve(future, result)
+
+    async def _send_singles(self, calls: List[Call]) -> list:
+        async def single(call):
+            async with self._singles:
+                return await self.client.call_contract(call)
+
+        return await asyncio.gather(
+            *(single(call) for call in calls), return_exceptions=True
+        )
+
+    async def _post_batch(self, calls: List[Call]) -> list:
+        block_id = get_block_identifier()
+        results = await post_batch(
+            self.client,
+            [
+                (
+                    "starknet_call",
+                    {
+                        "request": {
+                            "contract_address": _to_rpc_felt(call.to_addr),
+                            "entry_point_selector": _to_rpc_felt(call.selector),
+                            "calldata": [_to_rpc_felt(felt) for felt in call.calldata],
+                        },
+                        **block_id,
+                    },
+                )
+                for call in calls
+            ],
+        )
+        return [
+            result
+            if isinstance(result, BaseException)
+            else [int(felt, 16) for felt in result]
+            for result in results
+        ]
+
+
+async def post_batch(
+    client: FullNodeClient, requests: List[Tuple[str, Any]]
+) -> list:
+    """
+    Send (method, params) `requests` as one JSON-RPC batch request and return
+    each result in order, or the `ClientError` it failed with.
+    Raises `BatchRejectedError` when the node does not accept batches, and
+    other failures of the HTTP request (rate limiting, 5xx) as they are.
+    """
+    payload = [
+        {"jsonrpc": "2.0", "method": method, "id": i, "params": params}
+        for i, (method, params) in enumerate(requests)
+    ]
+    try:
+        body = await client._client.request(
+            address=client.url, http_method=HttpMethod.POST, payload=payload
+        )
+    except ClientError as e:
+        if not _is_invalid_request(e):
+            raise
+        raise BatchRejectedError(e.message) from e
+    if not isinstance(body, list):
+        raise BatchRejectedError(_get_error_message(body))
+
+    responses = {response.get("id"): response for response in body}
+    return [_parse_response(responses.get(i)) for i in range(len(requests))]
+
+
+def _is_invalid_request(error: ClientError) -> bool:
+    # HTTP errors carry the JSON-RPC error of their body in the message
+    code = str(INVALID_REQUEST)
+    return str(error.code) == code or code in str(error.message)
+
+
+def _get_error_message(body) -> Optional[str]:
+    if isinstance(body, dict) and "error" in body:
+        return body["error"].get("message")
+    return str(body)
+
+
+def _parse_response(response: Optional[dict]):
+    if response is None:
+        return ClientError(message="Missing response in JSON-RPC batch")
+    if "result" in response:
+        return response["result"]
+    error = response.get("error", {})
+    return ClientError(
+        code=error.get("code"), message=error.get("message"), data=error.get("data")
+    )
+
+
+def _resolve(future: asyncio.Future, result) -> None:
+    if future.done():
+        return
+    if isinstance(result, BaseException):
+        future.set_exception(result)
+    else:
+        future.set_result(result)
@@ -0,0 +1,178 @@
+import atexit
+import json
+import logging
+import os
+
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+# Kept free of starknet_py imports, the replay server only needs this module.
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+RECORD_ENV = "RPC_RECORD"
+CASSETTE_VERSION = 1
+
+
+def get_key(method: str, params) -> str:
+    return json.dumps([method, params], sort_keys=True, separators=(",", ":"))
+
+
+class Cassette:
+    """
+    Recorded JSON-RPC interactions: (method, params, result or error,
+    latency), in the order they were answered. Batch requests are split into
+    one interaction per item so they can be replayed whatever the batching.
+    """
+
+    def __init__(self, interactions: Optional[List[dict]] = None):
+        self.interactions = interactions or []
+        self.path: Optional[Path] = None
+
+    @property
+    def recording(self) -> bool:
+        return self.path is not None
+
+    def record(
+        self, payload: Union[dict, list], body: Union[dict, list], latency: float
+    ) -> None:
+        """
+        Add the answer `body` to the request `payload`, single or batch.
+        """
+        requests = payload if isinstance(payload, list) else [payload]
+        responses = body if isinstance(body, list) else [body]
+        by_id = {
+            response.get("id"): response
+            for response in responses
+            if isinstance(response, dict)
+        }
+        for request in requests:
+            response = by_id.get(request.get("id"))
+            if response is None:
+                continue
+            interaction = {
+                "method": request["method"],
+                "params": request.get("params", []),
+                "latency": latency,
+            }
+            if "result" in response:
+                interaction["result"] = response["result"]
+            else:
+                interaction["error"] = response.get("error")
+            self.interactions.append(interaction)
+
+    def record_to(self, path: Union[str, Path]) -> None:
+        """
+        Start recording and append the interactions to `path` at exit.
+        """
+        if self.path is None:
+            atexit.register(self.save)
+        self.path = Path(path)
+
+    def save(self) -> None:
+        """
+        Append the interactions recorded since the last save to `path`.
+        """
+        if self.path is None or not self.interactions:
+            return
+        previous = []
+        if self.path.exists():
+            previous = load_cassette(self.path).interactions
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps(
+                {
+                    "version": CASSETTE_VERSION,
+                    "interactions": previous + self.interactions,
+                }
+            )
+        )
+        logger.info(
+            f"ℹ️  Recorded {len(self.interactions)} RPC interaction(s) to {self.path}"
+        )
+        self.interactions = []
+
+
+def load_cassette(path: Union[str, Path]) -> Cassette:
+    cassette = json.loads(Path(path).read_text())
+    if cassette.get("version") != CASSETTE_VERSION:
+        raise ValueError(f"Unsupported cassette version in {path}")
+    return Cassette(cassette["interactions"])
+
+
+CASSETTE = Cassette()
+
+
+def record_from_env() -> None:
+    """
+    Record every RPC interaction to $RPC_RECORD, if set.
+    """
+    path = os.getenv(RECORD_ENV)
+    if path:
+        CASSETTE.record_to(path)
+
+
+class CassettePlayer:
+    """
+    Answers JSON-RPC requests from a cassette.
+
+    Requests are matched on (method, params) first. Scripts are rarely fully
+    deterministic (random deployment salts, timestamps), so unmatched requests
+    fall back to the next recorded answer of the same method. Answers are
+    served in recording order and the last one is repeated once a queue is
+    exhausted, e.g. a receipt polled more often than when recording.
+    """
+
+    def __init__(self, cassette: Cassette):
+        self._by_key: Dict[str, Deque[dict]] = defaultdict(deque)
+        self._by_method: Dict[str, Deque[dict]] = defaultdict(deque)
+        for interaction in cassette.interactions:
+            key = get_key(interaction["method"], interaction["params"])
+            self._by_key[key].append(interaction)
+            self._by_method[interaction["method"]].append(interaction)
+        self.stats = {"exact": 0, "fallback": 0, "missing": 0}
+
+    @staticmethod
+    def _next(queue: Deque[dict]) -> dict:
+        return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def lookup(self, method: str, params) -> Tuple[Optional[dict], str]:
+        """
+        The interaction answering (method, params) and how it was matched.
+        """
+        queue = self._by_key.get(get_key(method, params))
+        if queue:
+            interaction = self._next(queue)
+            # Keep the method queue in step with exact matches
+            method_queue = self._by_method[method]
+            if len(method_queue) > 1 and method_queue[0] is interaction:
+                method_queue.popleft()
+            return interaction, "exact"
+        queue = self._by_method.get(method)
+        if queue:
+            return self._next(queue), "fallback"
+        return None, "missing"
+
+    def answer(self, request: dict) -> Tuple[dict, float]:
+        """
+        JSON-RPC response to `request` and its recorded latency.
+        """
+        interaction, match = self.lookup(
+            request.get("method"), request.get("params", [])
+        )
+        self.stats[match] += 1
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+        if interaction is None:
+            logger.warning(f"⚠️  No recorded answer for {request.get('method')}")
+            response["error"] = {
+                "code": -32601,
+                "message": f"{request.get('method')} is not in the cassette",
+            }
+            return response, 0.0
+        if "result" in interaction:
+            response["result"] = interaction["result"]
+        else:
+            response["error"] = interaction["error"]
+        return response, interaction["latency"]
@@ -0,0 +1,96 @@
+import hashlib
+import json
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+from starknet_py.common import create_casm_class, create_sierra_compiled_contract
+from starknet_py.hash.casm_class_hash import compute_casm_class_hash
+from starknet_py.hash.sierra_class_hash import compute_sierra_class_hash
+
+from pragma_deployer.utils.store import atomic_write_json
+
+
+def compute_class_hashes(
+    sierra_artifact: Path, casm_artifact: Path
+) -> Tuple[int, int, str]:
+    """
+    Compute the (sierra class hash, compiled class hash, ABI) of a contract.
+
+    This is pure-Python Poseidon hashing, so callers run it in a process pool;
+    keep this module free of config side effects as workers may import it.
+    """
+    # contract_compiled_casm is a string containing the content of the starknet-sierra-compile (.casm file)
+    casm_class = create_casm_class(Path(casm_artifact).read_text())
+    casm_class_hash = compute_casm_class_hash(casm_class)
+
+    sierra_class = create_sierra_compiled_contract(Path(sierra_artifact).read_text())
+    sierra_class_hash = compute_sierra_class_hash(sierra_class)
+    return sierra_class_hash, casm_class_hash, sierra_class.abi
+
+
+def get_artifacts_digest(sierra_artifact: Path, casm_artifact: Path) -> str:
+    digest = hashlib.sha256()
+    for artifact in (sierra_artifact, casm_artifact):
+        digest.update(hashlib.sha256(Path(artifact).read_bytes()).digest())
+    return digest.hexdigest()
+
+
+class ClassHashCache:
+    """
+    On-disk cache of class hashes keyed by the digest of a contract's Sierra
+    and CASM artifacts.
+
+    Each entry holds both class hashes, the ABI and the networks the class is
+    known to be declared on, so unchanged contracts skip hashing and probing.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._entries: Optional[dict] = None
+        self._dirty = False
+
+    @property
+    def entries(self) -> dict:
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.path.read_text())
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, digest: str) -> Optional[Tuple[int, int, str]]:
+        entry = self.entries.get(digest)
+        if entry is None:
+            return None
+        return (
+            int(entry["sierra_class_hash"], 16),
+            int(entry["casm_class_hash"], 16),
+            entry["abi"],
+        )
+
+    def put(
+        self, digest: str, sierra_class_hash: int, casm_class_hash: int, abi: str
+    ) -> None:
+        self.entries[digest] = {
+            "sierra_class_hash": hex(sierra_class_hash),
+            "casm_class_hash": hex(casm_class_hash),
+            "abi": abi,
+            "declared": self.entries.get(digest, {}).get("declared", []),
+        }
+        self._dirty = True
+
+    def is_declared(self, digest: str, network: str) -> bool:
+        return network in self.entries.get(digest, {}).get("declared", [])
+
+    def mark_declared(self, digest: str, network: str) -> None:
+        declared = self.entries[digest]["declared"]
+        if network not in declared:
+            declared.append(network)
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        atomic_write_json(self.path, self.entries)
+        self._dirty = False
@@ -1,14 +1,11 @@
 import logging
 import os
+from functools import cache
 from pathlib import Path
 
-from dotenv import load_dotenv
-from pragma_sdk.common.types.currency import Currency
-from pragma_sdk.common.types.pair import Pair
-from starknet_py.net.full_node_client import FullNodeClient
-from starknet_py.net.models.chains import StarknetChainId
-
-load_dotenv()
+# Everything that loads the environment, touches the filesystem or imports
+# starknet_py/pragma_sdk is resolved on first access through `__getattr__`,
+# so importing this module (and `--help` on every script) stays cheap.
 
 logging.basicConfig()
 logger = logging.getLogger(__name__)
@@ -18,51 +15,106 @@ MAX_FEE = 70000000000000000  # 0.07 ETH
 
 ETH_TOKEN_ADDRESS = "0x49D36570D4E46F48E99674BD3FCC84644DDD6B96F7C741B1562B82F9E004DC7"
 
-NETWORKS = {
-    "mainnet": {
-        "name": "mainnet",
-        "rpc_url": "https://1rpc.io/starknet",
-        "chain_id": StarknetChainId.MAINNET,
-    },
-    "sepolia": {
-        "name": "sepolia",
-        "explorer_url": "https://sepolia.starkscan.co/",
-        "rpc_url": "https://1rpc.io/starknet-sepolia",
-        "chain_id": StarknetChainId.SEPOLIA,
-    },
-    "devnet": {
-        "name": "devnet",
-        "explorer_url": "https://devnet.starkscan.co",
-        "rpc_url": "http://127.0.0.1:5050/rpc",
-        "chain_id": StarknetChainId.SEPOLIA,
-    },
-    "pragma_devnet": {
-        "name": "pragma-devnet",
-        "explorer_url": "",
-        "rpc_url": "http://pragma-devnet.karnot.xyz/",
-        "chain_id": 93395501017206423887893332,
-    },
-}
+# Starknet rejects transactions whose calldata exceeds 4000 felts.
+MAX_BATCH_CALLDATA = 4000
+# Execution budget per multicall, in L2 gas (Cairo steps are billed as L2 gas).
+MAX_BATCH_L2_GAS = 1_000_000_000
 
-NETWORK = NETWORKS[os.getenv("STARKNET_NETWORK", "devnet")]
-NETWORK["account_address"] = os.environ.get(
-    f"{NETWORK['name'].upper()}_ACCOUNT_ADDRESS"
-)
-if NETWORK["account_address"] is None:
-    logger.warning(
-        f"⚠️ {NETWORK['name'].upper()}_ACCOUNT_ADDRESS not set, defaulting to ACCOUNT_ADDRESS"
-    )
-    NETWORK["account_address"] = os.getenv("ACCOUNT_ADDRESS")
-NETWORK["private_key"] = os.environ.get(f"{NETWORK['name'].upper()}_PRIVATE_KEY")
-if NETWORK["private_key"] is None:
-    logger.warning(
-        f"⚠️  {NETWORK['name'].upper()}_PRIVATE_KEY not set, defaulting to PRIVATE_KEY"
+
+@cache
+def load_env() -> None:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@cache
+def get_networks() -> dict:
+    from starknet_py.net.models.chains import StarknetChainId
+
+    return {
+        "mainnet": {
+            "name": "mainnet",
+            "rpc_urls": ["https://1rpc.io/starknet"],
+            "chain_id": StarknetChainId.MAINNET,
+        },
+        "sepolia": {
+            "name": "sepolia",
+            "explorer_url": "https://sepolia.starkscan.co/",
+            "rpc_urls": ["https://1rpc.io/starknet-sepolia"],
+            "chain_id": StarknetChainId.SEPOLIA,
+        },
+        "devnet": {
+            "name": "devnet",
+            "explorer_url": "https://devnet.starkscan.co",
+            "rpc_urls": ["http://127.0.0.1:5050/rpc"],
+            "chain_id": StarknetChainId.SEPOLIA,
+        },
+        "pragma_devnet": {
+            "name": "pragma-devnet",
+            "explorer_url": "",
+            "rpc_urls": ["http://pragma-devnet.karnot.xyz/"],
+            "chain_id": 93395501017206423887893332,
+        },
+    }
+
+
+@cache
+def get_network() -> dict:
+    load_env()
+
+    network = get_networks()[os.getenv("STARKNET_NETWORK", "devnet")]
+    network["account_address"] = os.environ.get(
+        f"{network['name'].upper()}_ACCOUNT_ADDRESS"
     )
-    NETWORK["private_key"] = os.getenv("PRIVATE_KEY")
+    if network["account_address"] is None:
+        logger.warning(
+            f"⚠️ {network['name'].upper()}_ACCOUNT_ADDRESS not set, defaulting to ACCOUNT_ADDRESS"
+        )
+        network["account_address"] = os.getenv("ACCOUNT_ADDRESS")
+    network["private_key"] = os.environ.get(f"{network['name'].upper()}_PRIVATE_KEY")
+    if network["private_key"] is None:
+        logger.warning(
+            f"⚠️  {network['name'].upper()}_PRIVATE_KEY not set, defaulting to PRIVATE_KEY"
+        )
+        network["private_key"] = os.getenv("PRIVATE_KEY")
 
-FULLNODE_CLIENT = FullNodeClient(
-    node_url=NETWORK["rpc_url"],
-)
+    # Comma-separated list of RPC endpoints, tried by health with failover
+    rpc_urls = os.environ.get(f"{network['name'].upper()}_RPC_URLS")
+    if rpc_urls:
+        network["rpc_urls"] = [
+            url.strip() for url in rpc_urls.split(",") if url.strip()
+        ]
+    network["rpc_url"] = network["rpc_urls"][0]
+    # Max requests per second sent to each endpoint
+    rate_limit = os.environ.get(f"{network['name'].upper()}_RPC_RATE_LIMIT")
+    network["rpc_rate_limit"] = float(rate_limit) if rate_limit else None
+    # Extra publisher identities, each with its own account, to shard
+    # publishing across nonce sequences: comma-separated NAME:ADDRESS:KEY
+    shards = os.environ.get(f"{network['name'].upper()}_PUBLISHER_SHARDS")
+    network["publisher_shards"] = []
+    for shard in (shards or "").split(","):
+        if not shard.strip():
+            continue
+        publisher, account_address, private_key = shard.strip().split(":")
+        network["publisher_shards"].append(
+            {
+                "publisher": publisher,
+                "account_address": account_address,
+                "private_key": private_key,
+            }
+        )
+    return network
+
+
+@cache
+def get_fullnode_client():
+    from pragma_deployer.utils.endpoints import MultiEndpointClient
+
+    return MultiEndpointClient(
+        node_urls=get_network()["rpc_urls"],
+        rate_limit=get_network()["rpc_rate_limit"],
+    )
 
 
 CURRENT_FILE = Path(__file__).resolve()
@@ -70,13 +122,21 @@ DEPLOYER_ROOT = CURRENT_FILE.parent.parent.parent
 ORACLE_ROOT = DEPLOYER_ROOT.parent / "pragma-oracle"
 
 BUILD_DIR = ORACLE_ROOT / "target" / "dev"
-BUILD_DIR.mkdir(exist_ok=True, parents=True)
+CLASS_HASH_CACHE_PATH = ORACLE_ROOT / "target" / "class_hash_cache.json"
 
 SOURCE_DIR = ORACLE_ROOT / "src"
-CONTRACTS = {p.stem: p for p in list(SOURCE_DIR.glob("**/*.cairo"))}
 
-DEPLOYMENTS_DIR = DEPLOYER_ROOT.parent / "deployments" / NETWORK["name"]
-DEPLOYMENTS_DIR.mkdir(exist_ok=True, parents=True)
+
+@cache
+def get_contracts() -> dict:
+    return {p.stem: p for p in list(SOURCE_DIR.glob("**/*.cairo"))}
+
+
+@cache
+def get_deployments_dir() -> Path:
+    deployments_dir = DEPLOYER_ROOT.parent / "deployments" / get_network()["name"]
+    deployments_dir.mkdir(exist_ok=True, parents=True)
+    return deployments_dir
 
 
 COMPILED_CONTRACTS = [
@@ -91,97 +151,121 @@ COMPILED_CONTRACTS = [
 ]
 
 
-currencies = [
-    Currency("USD", 8, 1, 0, 0),
-    Currency("EUR", 8, 1, 0, 0),
-    Currency(
-        "BTC",
-        8,
-        1,
-        0,
-        0,
-    ),
-    Currency(
-        "WBTC",
-        8,
-        0,
-        0x03FE2B97C1FD336E750087D68B9B867997FD64A2661FF3CA5A7C771641E8E7AC,
-        0x2260FAC5E5542A773AA44FBCFEDF7C193BC2C599,
-    ),
-    Currency(
-        "ETH",
-        18,
-        0,
-        0x049D36570D4E46F48E99674BD3FCC84644DDD6B96F7C741B1562B82F9E004DC7,
-        0x0000000000000000000000000000000000000000,
-    ),
-    Currency(
-        "USDC",
-        6,
-        0,
-        0x053C91253BC9682C04929CA02ED00B3E423F6710D2EE7E0D5EBB06F3ECF368A8,
-        0xA0B86991C6218B36C1D19D4A2E9EB0CE3606EB48,
-    ),
-    Currency(
-        "USDT",
-        6,
-        0,
-        0x068F5C6A61780768455DE69077E07E89787839BF8166DECFBF92B645209C0FB8,
-        0xDAC17F958D2EE523A2206206994597C13D831EC7,
-    ),
-    Currency(
-        "LORDS",
-        18,
-        0,
-        0x0124AEB495B947201F5FAC96FD1138E326AD86195B98DF6DEC9009158A533B49,
-        0x686F2404E77AB0D9070A46CDFB0B7FECDD2318B0,
-    ),
-    Currency(
-        "WSTETH",
-        18,
-        0,
-        0x042B8F0484674CA266AC5D08E4AC6A3FE65BD3129795DEF2DCA5C34ECC5F96D2,
-        0x7F39C581F595B53C5CB19BD0B3F8DA6C935E2CA0,
-    ),
-    Currency(
-        "RETH",
-        18,
-        0,
-        0x0319111A5037CBEC2B3E638CC34A3474E2D2608299F3E62866E9CC683208C610,
-        0xAE78736CD615F374D3085123A210448E74FC6393,
-    ),
-    Currency(
-        "LUSD",
-        18,
-        0,
-        0x070A76FD48CA0EF910631754D77DD822147FE98A569B826EC85E3C33FDE586AC,
-        0x5F98805A4E8BE255A32880FDEC7F6728C6568BA0,
-    ),
-    Currency(
-        "UNI",
-        18,
-        0,
-        0x049210FFC442172463F3177147C1AEAA36C51D152C1B0630F2364C300D4F48EE,
-        0x1F9840A85D5AF5BF1D1762F925BDADDC4201F984,
-    ),
-]
+@cache
+def get_currencies_and_pairs() -> tuple:
+    from pragma_sdk.common.types.currency import Currency
+    from pragma_sdk.common.types.pair import Pair
 
-# TODO: This should be a global Pragma configuration.
-pairs = [
-    Pair.from_tickers("ETH", "USD"),
-    # Pair.from_tickers("ETH", "DAI"),
-    Pair.from_tickers("BTC", "USD"),
-    Pair.from_tickers("BTC", "EUR"),
-    Pair.from_tickers("WBTC", "USD"),
-    Pair.from_tickers("WBTC", "BTC"),
-    Pair.from_tickers("WBTC", "ETH"),
-    Pair.from_tickers("USDC", "USD"),
-    Pair.from_tickers("USDT", "USD"),
-    # Pair.from_tickers("DAI", "USD"),
-    # Pair.from_tickers("LORDS", "USD"),
-    Pair.from_tickers("LUSD", "USD"),
-    Pair.from_tickers("LUSD", "ETH"),
-    Pair.from_tickers("WSTETH", "USD"),
-    Pair.from_tickers("WSTETH", "ETH"),
-    # Pair.from_tickers("UNI", "USD"),
-]
+    currencies = [
+        Currency("USD", 8, 1, 0, 0),
+        Currency("EUR", 8, 1, 0, 0),
+        Currency(
+            "BTC",
+            8,
+            1,
+            0,
+            0,
+        ),
+        Currency(
+            "WBTC",
+            8,
+            0,
+            0x03FE2B97C1FD336E750087D68B9B867997FD64A2661FF3CA5A7C771641E8E7AC,
+            0x2260FAC5E5542A773AA44FBCFEDF7C193BC2C599,
+        ),
+        Currency(
+            "ETH",
+            18,
+            0,
+            0x049D36570D4E46F48E99674BD3FCC84644DDD6B96F7C741B1562B82F9E004DC7,
+            0x0000000000000000000000000000000000000000,
+        ),
+        Currency(
+            "USDC",
+            6,
+            0,
+            0x053C91253BC9682C04929CA02ED00B3E423F6710D2EE7E0D5EBB06F3ECF368A8,
+            0xA0B86991C6218B36C1D19D4A2E9EB0CE3606EB48,
+        ),
+        Currency(
+            "USDT",
+            6,
+            0,
+            0x068F5C6A61780768455DE69077E07E89787839BF8166DECFBF92B645209C0FB8,
+            0xDAC17F958D2EE523A2206206994597C13D831EC7,
+        ),
+        Currency(
+            "LORDS",
+            18,
+            0,
+            0x0124AEB495B947201F5FAC96FD1138E326AD86195B98DF6DEC9009158A533B49,
+            0x686F2404E77AB0D9070A46CDFB0B7FECDD2318B0,
+        ),
+        Currency(
+            "WSTETH",
+            18,
+            0,
+            0x042B8F0484674CA266AC5D08E4AC6A3FE65BD3129795DEF2DCA5C34ECC5F96D2,
+            0x7F39C581F595B53C5CB19BD0B3F8DA6C935E2CA0,
+        ),
+        Currency(
+            "RETH",
+            18,
+            0,
+            0x0319111A5037CBEC2B3E638CC34A3474E2D2608299F3E62866E9CC683208C610,
+            0xAE78736CD615F374D3085123A210448E74FC6393,
+        ),
+        Currency(
+            "LUSD",
+            18,
+            0,
+            0x070A76FD48CA0EF910631754D77DD822147FE98A569B826EC85E3C33FDE586AC,
+            0x5F98805A4E8BE255A32880FDEC7F6728C6568BA0,
+        ),
+        Currency(
+            "UNI",
+            18,
+            0,
+            0x049210FFC442172463F3177147C1AEAA36C51D152C1B0630F2364C300D4F48EE,
+            0x1F9840A85D5AF5BF1D1762F925BDADDC4201F984,
+        ),
+    ]
+
+    # TODO: This should be a global Pragma configuration.
+    pairs = [
+        Pair.from_tickers("ETH", "USD"),
+        # Pair.from_tickers("ETH", "DAI"),
+        Pair.from_tickers("BTC", "USD"),
+        Pair.from_tickers("BTC", "EUR"),
+        Pair.from_tickers("WBTC", "USD"),
+        Pair.from_tickers("WBTC", "BTC"),
+        Pair.from_tickers("WBTC", "ETH"),
+        Pair.from_tickers("USDC", "USD"),
+        Pair.from_tickers("USDT", "USD"),
+        # Pair.from_tickers("DAI", "USD"),
+        # Pair.from_tickers("LORDS", "USD"),
+        Pair.from_tickers("LUSD", "USD"),
+        Pair.from_tickers("LUSD", "ETH"),
+        Pair.from_tickers("WSTETH", "USD"),
+        Pair.from_tickers("WSTETH", "ETH"),
+        # Pair.from_tickers("UNI", "USD"),
+    ]
+
+    return currencies, pairs
+
+
+_LAZY_ATTRIBUTES = {
+    "NETWORKS": get_networks,
+    "NETWORK": get_network,
+    "FULLNODE_CLIENT": get_fullnode_client,
+    "CONTRACTS": get_contracts,
+    "DEPLOYMENTS_DIR": get_deployments_dir,
+    "currencies": lambda: get_currencies_and_pairs()[0],
+    "pairs": lambda: get_currencies_and_pairs()[1],
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
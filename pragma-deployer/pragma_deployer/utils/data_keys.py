@@ -0,0 +1,31 @@
+from typing import Tuple
+
+from pragma_sdk.common.types.entry import Entry
+from pragma_sdk.common.types.types import DataTypes
+
+# Index of each variant in the Oracle's `PossibleEntries` enum
+ENTRY_VARIANTS = {DataTypes.SPOT: 0, DataTypes.FUTURE: 1, DataTypes.GENERIC: 2}
+
+# (data type, pair id or key[, expiration timestamp]), the Oracle's `DataType`
+DataKey = Tuple[int, ...]
+
+
+def get_data_key(entry: Entry) -> DataKey:
+    data_type = entry.get_asset_type()
+    if data_type == DataTypes.FUTURE:
+        return (ENTRY_VARIANTS[data_type], entry.pair_id, entry.expiry_timestamp)
+    if data_type == DataTypes.GENERIC:
+        return (ENTRY_VARIANTS[data_type], entry.key)
+    return (ENTRY_VARIANTS[data_type], entry.pair_id)
+
+
+def get_data_type(data_key: DataKey) -> dict:
+    """
+    The Oracle `DataType` of `data_key`, as expected by the contract serializer.
+    """
+    variant, *value = data_key
+    if variant == ENTRY_VARIANTS[DataTypes.FUTURE]:
+        return {"FutureEntry": tuple(value)}
+    if variant == ENTRY_VARIANTS[DataTypes.GENERIC]:
+        return {"GenericEntry": value[0]}
+    return {"SpotEntry": value[0]}
@@ -0,0 +1,164 @@
+import logging
+
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from pragma_sdk.common.types.entry import Entry
+from pragma_sdk.common.types.types import DataTypes
+from pragma_sdk.common.utils import str_to_felt
+
+from pragma_deployer.utils.data_keys import DataKey, get_data_key
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# The Oracle only aggregates entries less than BACKWARD_TIMESTAMP_BUFFER
+# seconds older than the most recent one of the pair, see oracle.cairo.
+STALENESS_WINDOW = 3600
+
+# (data key, source)
+RowKey = Tuple[DataKey, int]
+
+
+def get_value(entry: Entry) -> int:
+    if entry.get_asset_type() == DataTypes.GENERIC:
+        return entry.value
+    return entry.price
+
+
+class DeviationFilter:
+    """
+    Drops entries that would not move the Oracle.
+
+    The last published value and timestamp of every (data key, source) are
+    kept in arrays, one row each. An entry passes when its row is new, when
+    its value deviates from the last published one by more than the pair's
+    threshold (relative, e.g. 0.005 for 0.5%), or when the last published
+    entry is `heartbeat` seconds older than it, `heartbeat_margin` before the
+    Oracle's staleness window expires. Rows are looked up one by one, the
+    checks run on every entry of a tick at once.
+
+    Passing entries are recorded as published; call `forget` on those that
+    failed to be so they pass again on the next tick.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.005,
+        thresholds: Optional[Dict[Union[str, int], float]] = None,
+        staleness_window: int = STALENESS_WINDOW,
+        heartbeat_margin: int = 300,
+        capacity: int = 1024,
+    ):
+        self.threshold = threshold
+        # Per pair id (or generic key) thresholds, by name or felt
+        self.thresholds = {
+            str_to_felt(pair) if isinstance(pair, str) else pair: value
+            for pair, value in (thresholds or {}).items()
+        }
+        self.heartbeat = staleness_window - heartbeat_margin
+        self._rows: Dict[RowKey, int] = {}
+        self._values = np.zeros(capacity, dtype=np.float64)
+        self._timestamps = np.zeros(capacity, dtype=np.int64)
+        self._thresholds = np.zeros(capacity, dtype=np.float64)
+        self.stats = {
+            "seen": 0,
+            "new": 0,
+            "deviation": 0,
+            "heartbeat": 0,
+            "skipped": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _grow(self, size: int) -> None:
+        capacity = len(self._values)
+        while capacity < size:
+            capacity *= 2
+        if capacity == len(self._values):
+            return
+        for name in ("_values", "_timestamps", "_thresholds"):
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[: len(array)] = array
+            setattr(self, name, grown)
+
+    def _get_rows(self, entries: List[Entry]) -> np.ndarray:
+        rows = np.empty(len(entries), dtype=np.int64)
+        for i, entry in enumerate(entries):
+            data_key = get_data_key(entry)
+            key = (data_key, entry.base.source)
+            row = self._rows.get(key)
+            if row is None:
+                row = self._rows[key] = len(self._rows)
+                self._grow(row + 1)
+                self._thresholds[row] = self.thresholds.get(
+                    data_key[1], self.threshold
+                )
+            rows[i] = row
+        return rows
+
+    def set_threshold(self, pair: Union[str, int], threshold: float) -> None:
+        pair = str_to_felt(pair) if isinstance(pair, str) else pair
+        self.thresholds[pair] = threshold
+        for (data_key, _), row in self._rows.items():
+            if data_key[1] == pair:
+                self._thresholds[row] = threshold
+
+    def filter(self, entries: Iterable[Entry]) -> List[Entry]:
+        """
+        The entries of `entries` worth publishing, recorded as published.
+        """
+        entries = list(entries)
+        if not entries:
+            return []
+        rows = self._get_rows(entries)
+        values = np.fromiter(
+            (get_value(entry) for entry in entries), np.float64, len(entries)
+        )
+        timestamps = np.fromiter(
+            (entry.base.timestamp for entry in entries), np.int64, len(entries)
+        )
+
+        last_values = self._values[rows]
+        last_timestamps = self._timestamps[rows]
+        new = last_timestamps == 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            deviation = np.abs(values - last_values) / np.abs(last_values)
+        # A zero price moving to anything else is an infinite deviation
+        deviation = np.where(
+            last_values == 0, np.where(values == 0, 0.0, np.inf), deviation
+        )
+        deviated = ~new & (deviation > self._thresholds[rows])
+        stale = ~new & ~deviated & (timestamps - last_timestamps >= self.heartbeat)
+        passed = new | deviated | stale
+
+        # The last occurrence of a row wins when a tick holds several
+        self._values[rows[passed]] = values[passed]
+        self._timestamps[rows[passed]] = timestamps[passed]
+
+        self.stats["seen"] += len(entries)
+        self.stats["new"] += int(new.sum())
+        self.stats["deviation"] += int(deviated.sum())
+        self.stats["heartbeat"] += int(stale.sum())
+        self.stats["skipped"] += int(len(entries) - passed.sum())
+        return [entry for entry, keep in zip(entries, passed) if keep]
+
+    def forget(self, entries: Iterable[Entry]) -> None:
+        """
+        Mark the rows of `entries` as never published.
+        """
+        for entry in entries:
+            row = self._rows.get((get_data_key(entry), entry.base.source))
+            if row is not None:
+                self._timestamps[row] = 0
+
+    def summary(self) -> str:
+        return (
+            f"{self.stats['skipped']}/{self.stats['seen']} entries skipped, "
+            f"{self.stats['new']} new, {self.stats['deviation']} deviated, "
+            f"{self.stats['heartbeat']} heartbeats, {len(self)} rows"
+        )
@@ -0,0 +1,390 @@
+import asyncio
+import json
+import logging
+import time
+
+from collections import deque
+from typing import Deque, Dict, List, Optional, Union
+
+from aiohttp import ClientError as HttpError, ClientSession
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.full_node_client import FullNodeClient
+from starknet_py.net.http_client import HttpMethod, RpcHttpClient
+
+from pragma_deployer.utils.cassette import CASSETTE
+from pragma_deployer.utils.metrics import METRICS
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Methods that change state; everything else can safely be sent twice.
+WRITE_METHOD_PREFIX = "starknet_add"
+# Latency samples kept per (endpoint, method), and needed before trusting the p95.
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+
+
+def get_methods(payload: Union[dict, list, None]) -> List[str]:
+    items = payload if isinstance(payload, list) else [payload or {}]
+    return [item.get("method", "") for item in items]
+
+
+def get_label(payload: Union[dict, list, None]) -> str:
+    """
+    Method name of a request, `batch:<method>` (or `batch:mixed`) for batches.
+    """
+    methods = get_methods(payload)
+    if not isinstance(payload, list):
+        return methods[0]
+    return f"batch:{methods[0] if len(set(methods)) == 1 else 'mixed'}"
+
+
+def is_retriable(error: BaseException) -> bool:
+    """
+    Whether `error` means the endpoint did not serve the request, so it can be
+    sent elsewhere: connection errors, timeouts, rate limiting and 5xx.
+    """
+    if isinstance(error, (HttpError, asyncio.TimeoutError, json.JSONDecodeError)):
+        return True
+    if isinstance(error, ClientError):
+        code = str(error.code)
+        return code == "429" or code.startswith("5")
+    return False
+
+
+class RateLimiter:
+    """
+    Token bucket allowing `rate` requests per second with bursts of `burst`.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 1) -> None:
+        tokens = min(tokens, self.burst)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated_at) * self.rate
+                )
+                self._updated_at = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class Endpoint:
+    """
+    One RPC url with its health score, latency samples and rate limiter.
+
+    The score is a moving average of request successes. Consecutive failures
+    take the endpoint out of rotation for an exponentially growing cooldown.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        rate_limit: Optional[float] = None,
+        max_cooldown: float = 60.0,
+    ):
+        self.url = url
+        self.limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.max_cooldown = max_cooldown
+        self.score = 1.0
+        self.latency = 0.0
+        self.failures = 0
+        self.down_until = 0.0
+        self.stats = {"requests": 0, "failures": 0, "hedges": 0, "wins": 0}
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    @property
+    def is_down(self) -> bool:
+        return time.monotonic() < self.down_until
+
+    @property
+    def cost(self) -> float:
+        """
+        Expected latency penalized by unreliability, lower is better.
+        """
+        return self.latency / max(self.score, 0.05)
+
+    def p95(self, method: str) -> Optional[float]:
+        samples = self._latencies.get(method)
+        if samples is None or len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        return sorted(samples)[int(len(samples) * 0.95)]
+
+    def record_success(self, method: str, latency: float) -> None:
+        self._latencies.setdefault(method, deque(maxlen=LATENCY_WINDOW)).append(
+            latency
+        )
+        self.latency = (
+            latency if self.latency == 0 else 0.8 * self.latency + 0.2 * latency
+        )
+        self.score = 0.8 * self.score + 0.2
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.stats["failures"] += 1
+        self.score *= 0.8
+        self.failures += 1
+        self.down_until = time.monotonic() + min(
+            2 ** (self.failures - 1), self.max_cooldown
+        )
+
+
+class EndpointFailure(Exception):
+    def __init__(self, endpoint: Endpoint, error: BaseException):
+        super().__init__(f"{endpoint.url}: {error!r}")
+        self.endpoint = endpoint
+        self.error = error
+
+
+class InstrumentedHttpClient(RpcHttpClient):
+    """
+    JSON-RPC transport recording every request in `METRICS`: latency, request
+    and response bytes, and whether it failed. Batch requests only count as
+    failed when the whole batch is. Answers are also added to `CASSETTE` while
+    it is recording.
+    """
+
+    async def _make_request(
+        self,
+        session: ClientSession,
+        address: str,
+        http_method: HttpMethod,
+        params: Optional[dict],
+        payload: Union[dict, list, None],
+    ):
+        body = json.dumps(payload).encode()
+        label = get_label(payload)
+        response_bytes = 0
+        start = time.perf_counter()
+        try:
+            async with session.request(
+                method=http_method.value,
+                url=address,
+                params=params,
+                data=body,
+                headers={"Content-Type": "application/json"},
+            ) as response:
+                await self.handle_request_error(response)
+                raw = await response.read()
+                response_bytes = len(raw)
+                result = json.loads(raw) if raw.strip() else None
+        except Exception:
+            METRICS.record(
+                label, time.perf_counter() - start, len(body), response_bytes, True
+            )
+            raise
+        latency = time.perf_counter() - start
+        METRICS.record(
+            label,
+            latency,
+            len(body),
+            response_bytes,
+            isinstance(result, dict) and "error" in result,
+        )
+        if CASSETTE.recording and result is not None:
+            CASSETTE.record(payload, result, latency)
+        return result
+
+
+class InstrumentedClient(FullNodeClient):
+    """
+    `FullNodeClient` whose requests are recorded in `METRICS`.
+    """
+
+    def __init__(self, node_url: str, session: Optional[ClientSession] = None):
+        super().__init__(node_url=node_url, session=session)
+        self._client = InstrumentedHttpClient(url=node_url, session=session)
+
+
+class MultiEndpointHttpClient(InstrumentedHttpClient):
+    """
+    JSON-RPC transport spreading requests over several endpoints.
+
+    Endpoints are tried by health: healthy ones first, cheapest first.
+    Requests an endpoint fails to serve (connection errors, timeouts, 429
+    and 5xx) fail over to the next one. Reads are hedged: when the endpoint
+    has not answered within its p95 latency for that method (`hedge_after`
+    until enough samples are collected), the same request is sent to the next
+    endpoint and the first answer wins. Writes are never duplicated.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        session: Optional[ClientSession] = None,
+        rate_limit: Optional[float] = None,
+        hedge_after: float = 1.0,
+        max_hedges: int = 1,
+        timeout: float = 30.0,
+    ):
+        super().__init__(url=urls[0], session=session)
+        self.endpoints = [Endpoint(url, rate_limit=rate_limit) for url in urls]
+        self.hedge_after = hedge_after
+        self.max_hedges = max_hedges
+        self.timeout = timeout
+        self.stats = {"hedged": 0, "failovers": 0}
+
+    def ranked(self) -> List[Endpoint]:
+        return sorted(
+            self.endpoints,
+            key=lambda endpoint: (
+                endpoint.is_down,
+                endpoint.down_until if endpoint.is_down else endpoint.cost,
+            ),
+        )
+
+    async def request(
+        self,
+        address: str,
+        http_method: HttpMethod,
+        params: Optional[dict] = None,
+        payload: Optional[Union[dict, list]] = None,
+    ):
+        if address != self.url:
+            return await super().request(address, http_method, params, payload)
+
+        methods = get_methods(payload)
+        method = get_label(payload)
+
+        async def send(endpoint: Endpoint):
+            return await self._send(
+                endpoint, method, len(methods), http_method, params, payload
+            )
+
+        if any(name.startswith(WRITE_METHOD_PREFIX) for name in methods):
+            return await self._failover(self.ranked(), method, send)
+        return await self._hedged(self.ranked(), method, send)
+
+    async def _send(
+        self,
+        endpoint: Endpoint,
+        method: str,
+        cost: int,
+        http_method: HttpMethod,
+        params: Optional[dict],
+        payload,
+    ):
+        if endpoint.limiter is not None:
+            await endpoint.limiter.acquire(cost)
+        endpoint.stats["requests"] += 1
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(
+                super().request(endpoint.url, http_method, params, payload),
+                self.timeout,
+            )
+        except Exception as e:
+            if not is_retriable(e):
+                raise
+            endpoint.record_failure()
+            logger.debug(f"⚠️  {endpoint.url} failed {method}: {e!r}")
+            raise EndpointFailure(endpoint, e) from e
+        endpoint.record_success(method, time.monotonic() - start)
+        return result
+
+    async def _failover(self, endpoints: List[Endpoint], method: str, send):
+        failure = None
+        for endpoint in endpoints:
+            if failure is not None:
+                self.stats["failovers"] += 1
+                METRICS.record_retry(method)
+            try:
+                return await send(endpoint)
+            except EndpointFailure as e:
+                failure = e
+        raise failure.error
+
+    async def _hedged(self, endpoints: List[Endpoint], method: str, send):
+        remaining = list(endpoints)
+        tasks: Dict[asyncio.Task, Endpoint] = {}
+        hedges = 0
+        failure = None
+
+        def start(endpoint: Endpoint) -> None:
+            tasks[asyncio.create_task(send(endpoint))] = endpoint
+
+        # The hedge delay is the p95 of the endpoint started last
+        start(remaining.pop(0))
+        pending = set(tasks)
+        try:
+            while pending:
+                latest = list(tasks.values())[-1]
+                can_hedge = remaining and hedges < self.max_hedges
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=(
+                        (latest.p95(method) or self.hedge_after)
+                        if can_hedge
+                        else None
+                    ),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if hedges:
+                            tasks[task].stats["wins"] += 1
+                        return task.result()
+                    if not isinstance(error, EndpointFailure):
+                        raise error
+                    failure = error
+
+                if not done:
+                    hedges += 1
+                    self.stats["hedged"] += 1
+                    remaining[0].stats["hedges"] += 1
+                elif pending or not remaining:
+                    continue
+                else:
+                    self.stats["failovers"] += 1
+                METRICS.record_retry(method)
+                start(remaining.pop(0))
+                pending = {task for task in tasks if not task.done()}
+            raise failure.error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+class MultiEndpointClient(InstrumentedClient):
+    """
+    `FullNodeClient` backed by several RPC endpoints, see
+    `MultiEndpointHttpClient`.
+    """
+
+    def __init__(
+        self,
+        node_urls: List[str],
+        session: Optional[ClientSession] = None,
+        **kwargs,
+    ):
+        super().__init__(node_url=node_urls[0], session=session)
+        self._client = MultiEndpointHttpClient(node_urls, session=session, **kwargs)
+
+    @property
+    def endpoints(self) -> List[Endpoint]:
+        return self._client.endpoints
+
+    def log_stats(self) -> None:
+        logger.info(
+            f"ℹ️  RPC endpoints: {self._client.stats['hedged']} hedged reads, "
+            f"{self._client.stats['failovers']} failovers"
+        )
+        for endpoint in self.endpoints:
+            logger.info(
+                f"ℹ️  {endpoint.url}: {endpoint.stats['requests']} requests, "
+                f"{endpoint.stats['failures']} failures, "
+                f"{endpoint.stats['hedges']} hedges ({endpoint.stats['wins']} won), "
+                f"score {endpoint.score:.2f}"
+            )
@@ -0,0 +1,249 @@
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from pragma_sdk.common.types.entry import Entry, FutureEntry, SpotEntry
+from pragma_sdk.common.types.types import DataTypes
+from starknet_py.hash.selector import get_selector_from_name
+from starknet_py.net.client_models import Call
+
+from pragma_deployer.utils.data_keys import ENTRY_VARIANTS
+
+PUBLISH_DATA_ENTRIES_SELECTOR = get_selector_from_name("publish_data_entries")
+
+SPOT = ENTRY_VARIANTS[DataTypes.SPOT]
+FUTURE = ENTRY_VARIANTS[DataTypes.FUTURE]
+
+# Offset of each column in the calldata of a `PossibleEntries` item, after
+# its variant: base (timestamp, source, publisher), price, pair_id, volume,
+# and expiration_timestamp for futures.
+CALLDATA_OFFSETS = (
+    ("timestamps", 1),
+    ("sources", 2),
+    ("publishers", 3),
+    ("prices", 4),
+    ("pair_ids", 5),
+    ("volumes", 6),
+)
+
+# Felts and u128 do not fit in a machine word, their columns hold references
+# to Python ints: the few distinct pair ids, sources and publishers are shared
+# by every row instead of being copied per entry.
+COLUMNS = (
+    ("variants", np.uint8),
+    # Calldata offset of each item, counted from the start of the root batch
+    ("offsets", np.int64),
+    ("timestamps", np.int64),
+    ("expiries", np.int64),
+    ("pair_ids", object),
+    ("prices", object),
+    ("volumes", object),
+    ("sources", object),
+    ("publishers", object),
+)
+
+
+class EntryBatch:
+    """
+    Spot and future entries as parallel columns, one row per entry, from
+    which the calldata of `publish_data_entries` is written column by column
+    instead of entry by entry.
+
+    Rows are appended in place and `clear` keeps the columns, so a batch
+    reused across ticks only allocates when it outgrows its capacity. The
+    calldata offset of each item is recorded as it is appended, so encoding
+    does not lay the items out again. Slicing a batch returns a view sharing
+    its columns.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        # Calldata offsets of the first item minus one, and past the last item
+        self._base = 0
+        self._end = 1
+        for name, dtype in COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Entry]) -> "EntryBatch":
+        entries = list(entries)
+        batch = cls(capacity=max(len(entries), 1))
+        batch.extend(entries)
+        return batch
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: slice) -> "EntryBatch":
+        start, stop, step = index.indices(self.size)
+        if step != 1:
+            raise ValueError("EntryBatch slices must be contiguous")
+        stop = max(start, stop)
+        view = EntryBatch.__new__(EntryBatch)
+        view.size = stop - start
+        view._base = self._offset(start) - 1
+        view._end = self._offset(stop)
+        for name, _ in COLUMNS:
+            setattr(view, name, getattr(self, name)[start:stop])
+        return view
+
+    def _offset(self, row: int) -> int:
+        return int(self.offsets[row]) if row < self.size else self._end
+
+    @property
+    def capacity(self) -> int:
+        return len(self.variants)
+
+    def _grow(self, size: int) -> None:
+        capacity = self.capacity
+        while capacity < size:
+            capacity *= 2
+        if capacity == self.capacity:
+            return
+        for name, dtype in COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=dtype)
+            grown[: self.size] = column[: self.size]
+            setattr(self, name, grown)
+
+    def clear(self) -> None:
+        self.size = 0
+        self._base = 0
+        self._end = 1
+
+    def append(
+        self,
+        pair_id: int,
+        price: int,
+        timestamp: int,
+        source: int,
+        publisher: int,
+        volume: int = 0,
+        expiry: Optional[int] = None,
+    ) -> None:
+        """
+        Append an entry, a future one if `expiry` is given (0 for perpetuals).
+        Pair ids, sources and publishers are felts.
+        """
+        row = self.size
+        self._grow(row + 1)
+        self.variants[row] = SPOT if expiry is None else FUTURE
+        self.offsets[row] = self._end
+        self._end += 7 if expiry is None else 8
+        self.timestamps[row] = timestamp
+        self.expiries[row] = expiry or 0
+        self.pair_ids[row] = pair_id
+        self.prices[row] = price
+        self.volumes[row] = volume
+        self.sources[row] = source
+        self.publishers[row] = publisher
+        self.size += 1
+
+    def extend(self, entries: Iterable[Entry]) -> None:
+        for entry in entries:
+            data_type = entry.get_asset_type()
+            if data_type == DataTypes.GENERIC:
+                raise ValueError("EntryBatch only holds spot and future entries")
+            self.append(
+                entry.pair_id,
+                entry.price,
+                entry.base.timestamp,
+                entry.base.source,
+                entry.base.publisher,
+                entry.volume,
+                entry.expiry_timestamp if data_type == DataTypes.FUTURE else None,
+            )
+
+    def to_entries(self) -> List[Entry]:
+        entries: List[Entry] = []
+        for row in range(self.size):
+            base = (
+                self.pair_ids[row],
+                self.prices[row],
+                int(self.timestamps[row]),
+                self.sources[row],
+                self.publishers[row],
+            )
+            if self.variants[row] == FUTURE:
+                entries.append(
+                    FutureEntry(
+                        *base,
+                        expiry_timestamp=int(self.expiries[row]),
+                        volume=self.volumes[row],
+                    )
+                )
+            else:
+                entries.append(SpotEntry(*base, volume=self.volumes[row]))
+        return entries
+
+    def calldata_size(self) -> int:
+        """
+        Felts of the `publish_data_entries` calldata of this batch.
+        """
+        return self._end - self._base
+
+    def encode(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Write the calldata of `publish_data_entries` (the `Span<PossibleEntries>`
+        length, then every entry) into `out`, an object array of at least
+        `calldata_size()` felts allocated here if not given, and return the
+        written part of it. Each column is scattered into `out` at once; the
+        index arrays of the scatter are the only allocations per call.
+        """
+        size = self.calldata_size()
+        if out is None:
+            out = np.empty(size, dtype=object)
+        elif len(out) < size or out.dtype != object:
+            raise ValueError(f"Calldata buffer must be an object array of {size} felts")
+        out = out[:size]
+        n = self.size
+        out[0] = n
+        if n == 0:
+            return out
+
+        variants = self.variants[:n]
+        if size == 1 + 7 * n:
+            # Every item is 7 felts, write the columns of a (n, 7) view
+            items = out[1:].reshape(n, 7)
+            items[:, 0] = variants
+            for name, offset in CALLDATA_OFFSETS:
+                items[:, offset] = getattr(self, name)[:n]
+            return out
+
+        starts = self.offsets[:n]
+        if self._base:
+            starts = starts - self._base
+        out[starts] = variants
+        for name, offset in CALLDATA_OFFSETS:
+            out[starts + offset] = getattr(self, name)[:n]
+        futures = np.flatnonzero(variants == FUTURE)
+        out[starts[futures] + 7] = self.expiries[:n][futures]
+        return out
+
+    def to_calldata(self, out: Optional[np.ndarray] = None) -> List[int]:
+        """
+        `encode` as the list of ints a `Call` takes.
+        """
+        return self.encode(out).tolist()
+
+
+def build_publish_call(
+    oracle_address: int, batch: EntryBatch, out: Optional[np.ndarray] = None
+) -> Call:
+    return Call(
+        to_addr=oracle_address,
+        selector=PUBLISH_DATA_ENTRIES_SELECTOR,
+        calldata=batch.to_calldata(out),
+    )
+
+
+async def publish_batch(client, batch: EntryBatch, out: Optional[np.ndarray] = None):
+    """
+    Send `batch` in a single `publish_data_entries` transaction of the
+    PragmaOnChainClient `client`, bypassing the ABI serializer.
+    """
+    return await client.oracle.multicall(
+        [build_publish_call(client.oracle.address, batch, out)],
+        execution_config=client.execution_config,
+        callback=client.track_nonce,
+    )
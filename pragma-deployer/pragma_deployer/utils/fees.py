@@ -0,0 +1,184 @@
+import logging
+import time
+
+from typing import Dict, List, Optional, Tuple
+
+from starknet_py.net.account.account import Account
+from starknet_py.net.client_models import (
+    Call,
+    EstimatedFee,
+    ResourceBounds,
+    ResourceBoundsMapping,
+)
+from starknet_py.net.models.transaction import AccountTransaction
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+GasPrices = Tuple[int, int, int]
+
+
+def _moved(old: int, new: int, threshold: float) -> bool:
+    if old == 0:
+        return new != 0
+    return abs(new - old) / old > threshold
+
+
+class FeeEstimator:
+    """
+    Batched fee estimation with a resource bounds cache.
+
+    Pending transactions are estimated together in a single
+    `starknet_estimateFee` request. Consumed gas amounts are cached by the
+    shape of the multicall (target, selector and calldata length of each call)
+    and reused with the current gas prices until one of the L1, L2 or L1 data
+    gas prices moves by more than `price_threshold` since the estimate.
+    The shape ignores calldata values: calls to the same selector with as many
+    arguments share an estimate even when they write different storage, which
+    is looser than caching per selector and arguments.
+    Amounts are scaled by `amount_multiplier` and prices by `price_multiplier`.
+    """
+
+    def __init__(
+        self,
+        account: Account,
+        amount_multiplier: float = 1.5,
+        price_multiplier: float = 1.5,
+        price_threshold: float = 0.2,
+        prices_ttl: float = 10.0,
+    ):
+        self.account = account
+        self.amount_multiplier = amount_multiplier
+        self.price_multiplier = price_multiplier
+        self.price_threshold = price_threshold
+        self.prices_ttl = prices_ttl
+        self._estimates: Dict[tuple, EstimatedFee] = {}
+        self._prices: Optional[GasPrices] = None
+        self._prices_fetched_at = 0.0
+        self.stats = {"hits": 0, "misses": 0, "requests": 0}
+
+    async def gas_prices(self) -> GasPrices:
+        """
+        Current (L1, L2, L1 data) gas prices in FRI, refreshed every `prices_ttl`.
+        """
+        if (
+            self._prices is None
+            or time.monotonic() - self._prices_fetched_at > self.prices_ttl
+        ):
+            block = await self.account.client.get_block_with_tx_hashes(
+                block_number="pending"
+            )
+            self._prices = (
+                block.l1_gas_price.price_in_fri,
+                block.l2_gas_price.price_in_fri,
+                block.l1_data_gas_price.price_in_fri,
+            )
+            self._prices_fetched_at = time.monotonic()
+        return self._prices
+
+    @staticmethod
+    def get_key(calls: List[Call]) -> tuple:
+        return tuple(
+            (call.to_addr, call.selector, len(call.calldata)) for call in calls
+        )
+
+    def _is_fresh(
+        self, estimated_fee: Optional[EstimatedFee], prices: GasPrices
+    ) -> bool:
+        if estimated_fee is None:
+            return False
+        estimated_prices = (
+            estimated_fee.l1_gas_price,
+            estimated_fee.l2_gas_price,
+            estimated_fee.l1_data_gas_price,
+        )
+        return not any(
+            _moved(old, new, self.price_threshold)
+            for old, new in zip(estimated_prices, prices)
+        )
+
+    async def estimate_transactions(
+        self, transactions: List[AccountTransaction]
+    ) -> List[EstimatedFee]:
+        """
+        Estimate `transactions` in a single request; they are simulated in order.
+        """
+        self.stats["requests"] += 1
+        return await self.account.estimate_fee(transactions)
+
+    async def estimate(
+        self, calls_list: List[List[Call]], nonce: int
+    ) -> List[EstimatedFee]:
+        """
+        Estimated fee of the invoke of each multicall in `calls_list`, sent in
+        order from `nonce`. The cache is used only when every multicall hits.
+        Otherwise the multicalls up to the last miss are all simulated, hits
+        included, so each miss runs on the state left by the ones before it
+        (e.g. `add_pair` after the `add_currency` of its base).
+        """
+        prices = await self.gas_prices()
+        keys = [self.get_key(calls) for calls in calls_list]
+        misses = [
+            i
+            for i, key in enumerate(keys)
+            if key not in keys[:i]
+            and not self._is_fresh(self._estimates.get(key), prices)
+        ]
+        if not misses:
+            self.stats["hits"] += len(calls_list)
+            return [self._estimates[key] for key in keys]
+
+        # Earlier multicalls are not sent yet: the simulation starts at `nonce`
+        simulated = misses[-1] + 1
+        self.stats["hits"] += len(calls_list) - simulated
+        self.stats["misses"] += simulated
+        logger.debug(
+            f"ℹ️  Estimating {simulated}/{len(calls_list)} multicall(s) for "
+            f"{len(misses)} cache miss(es)"
+        )
+        transactions = [
+            await self.account.sign_invoke_v3(
+                calls,
+                nonce=nonce + i,
+                resource_bounds=ResourceBoundsMapping.init_with_zeros(),
+            )
+            for i, calls in enumerate(calls_list[:simulated])
+        ]
+        estimates = await self.estimate_transactions(transactions)
+        for key, estimated_fee in zip(keys, estimates):
+            self._estimates[key] = estimated_fee
+        return estimates + [self._estimates[key] for key in keys[simulated:]]
+
+    def to_resource_bounds(
+        self, estimated_fee: EstimatedFee, prices: Optional[GasPrices] = None
+    ) -> ResourceBoundsMapping:
+        l1_gas_price, l2_gas_price, l1_data_gas_price = prices or (
+            estimated_fee.l1_gas_price,
+            estimated_fee.l2_gas_price,
+            estimated_fee.l1_data_gas_price,
+        )
+
+        def bounds(amount: int, price: int) -> ResourceBounds:
+            return ResourceBounds(
+                max_amount=int(amount * self.amount_multiplier),
+                max_price_per_unit=int(price * self.price_multiplier),
+            )
+
+        return ResourceBoundsMapping(
+            l1_gas=bounds(estimated_fee.l1_gas_consumed, l1_gas_price),
+            l2_gas=bounds(estimated_fee.l2_gas_consumed, l2_gas_price),
+            l1_data_gas=bounds(
+                estimated_fee.l1_data_gas_consumed, l1_data_gas_price
+            ),
+        )
+
+    async def resource_bounds(
+        self, calls_list: List[List[Call]], nonce: int
+    ) -> List[ResourceBoundsMapping]:
+        """
+        Resource bounds of each multicall in `calls_list` at current gas prices.
+        """
+        estimates = await self.estimate(calls_list, nonce)
+        prices = await self.gas_prices()
+        return [self.to_resource_bounds(fee, prices) for fee in estimates]
@@ -0,0 +1,238 @@
+import atexit
+import json
+import logging
+import os
+
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+# Kept free of starknet_py imports so CLIs can register the exporter before
+# parsing anything heavy.
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Upper bounds in seconds of the latency histogram buckets (Prometheus `le`).
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS_OUT_ENV = "RPC_METRICS_OUT"
+
+
+def percentile(samples, p: float) -> float:
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(int(len(samples) * p), len(samples) - 1)]
+
+
+class Histogram:
+    """
+    Latency histogram with the given bucket upper bounds in seconds.
+    """
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.count = 0
+        self.sum = 0.0
+        # Non-cumulative counts per bucket, the last one being +Inf
+        self.buckets = [0] * (len(bounds) + 1)
+
+    def record(self, latency: float) -> None:
+        self.count += 1
+        self.sum += latency
+        self.buckets[bisect_left(self.bounds, latency)] += 1
+
+    def buckets_to_dict(self) -> dict:
+        return dict(zip([*map(str, self.bounds), "+Inf"], self.buckets))
+
+    def to_prometheus(self, name: str, labels: str) -> List[str]:
+        """
+        The `<name>_bucket`, `<name>_sum` and `<name>_count` samples with the
+        given labels.
+        """
+        lines = []
+        cumulative = 0
+        for bound, count in zip([*self.bounds, "+Inf"], self.buckets):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class ExportedMetrics:
+    """
+    Metrics written as JSON or in the Prometheus text format.
+    """
+
+    def to_json(self) -> dict:
+        raise NotImplementedError
+
+    def to_prometheus(self) -> str:
+        raise NotImplementedError
+
+    def summary(self) -> str:
+        raise NotImplementedError
+
+    def write(self, path: Union[str, Path]) -> None:
+        """
+        Write the metrics to `path`, as JSON if it ends with `.json` and in the
+        Prometheus text format otherwise.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".json":
+            path.write_text(json.dumps(self.to_json(), indent=2) + "\n")
+        else:
+            path.write_text(self.to_prometheus())
+
+
+class AtExitExport:
+    """
+    Writes `metrics` when the process exits, to the last path registered, and
+    logs their summary under `summary_title`.
+    """
+
+    def __init__(
+        self, metrics: ExportedMetrics, env: str, name: str, summary_title: str
+    ):
+        self.metrics = metrics
+        self.env = env
+        self.name = name
+        self.summary_title = summary_title
+        self.path: Optional[Path] = None
+
+    def register(self, path: Optional[Union[str, Path]] = None) -> None:
+        path = path or os.getenv(self.env)
+        if not path:
+            return
+        if self.path is None:
+            atexit.register(self.export)
+        self.path = Path(path)
+
+    def export(self) -> None:
+        self.metrics.write(self.path)
+        logger.info(f"ℹ️  {self.name} written to {self.path}")
+        summary = self.metrics.summary()
+        if summary:
+            logger.info(f"ℹ️  {self.summary_title}:\n{summary}")
+
+
+class MethodMetrics:
+    def __init__(self):
+        self.errors = 0
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.latency = Histogram()
+
+    @property
+    def count(self) -> int:
+        return self.latency.count
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "latency_sum": self.latency.sum,
+            "latency_buckets": self.latency.buckets_to_dict(),
+        }
+
+
+class RpcMetrics(ExportedMetrics):
+    """
+    Per JSON-RPC method call count, latency histogram, payload bytes, errors
+    and retries. Batch requests are recorded as `batch:<method>`.
+    """
+
+    def __init__(self):
+        self.methods: Dict[str, MethodMetrics] = {}
+
+    def get(self, method: str) -> MethodMetrics:
+        if method not in self.methods:
+            self.methods[method] = MethodMetrics()
+        return self.methods[method]
+
+    def record(
+        self,
+        method: str,
+        latency: float,
+        request_bytes: int,
+        response_bytes: int = 0,
+        error: bool = False,
+    ) -> None:
+        metrics = self.get(method)
+        metrics.errors += error
+        metrics.request_bytes += request_bytes
+        metrics.response_bytes += response_bytes
+        metrics.latency.record(latency)
+
+    def record_retry(self, method: str) -> None:
+        self.get(method).retries += 1
+
+    def reset(self) -> None:
+        self.methods.clear()
+
+    def to_json(self) -> dict:
+        return {
+            method: metrics.to_dict()
+            for method, metrics in sorted(self.methods.items())
+        }
+
+    def to_prometheus(self) -> str:
+        counters = [
+            ("requests_total", "JSON-RPC requests sent", "count"),
+            ("errors_total", "JSON-RPC requests that failed", "errors"),
+            ("retries_total", "JSON-RPC requests sent again", "retries"),
+            ("request_bytes_total", "JSON-RPC request payload bytes", "request_bytes"),
+            ("response_bytes_total", "JSON-RPC response bytes", "response_bytes"),
+        ]
+        lines = []
+        for name, description, attribute in counters:
+            lines.append(f"# HELP pragma_rpc_{name} {description}.")
+            lines.append(f"# TYPE pragma_rpc_{name} counter")
+            for method, metrics in sorted(self.methods.items()):
+                lines.append(
+                    f'pragma_rpc_{name}{{method="{method}"}} '
+                    f"{getattr(metrics, attribute)}"
+                )
+
+        lines.append("# HELP pragma_rpc_latency_seconds JSON-RPC request latency.")
+        lines.append("# TYPE pragma_rpc_latency_seconds histogram")
+        for method, metrics in sorted(self.methods.items()):
+            lines.extend(
+                metrics.latency.to_prometheus(
+                    "pragma_rpc_latency_seconds", f'method="{method}"'
+                )
+            )
+        return "\n".join(lines) + "\n"
+
+    def summary(self, top: int = 10) -> str:
+        """
+        The `top` methods by total time spent waiting on them.
+        """
+        ranked = sorted(
+            self.methods.items(), key=lambda item: item[1].latency.sum, reverse=True
+        )
+        return "\n".join(
+            f"{method}: {metrics.count} calls, {metrics.latency.sum:.2f}s, "
+            f"{metrics.errors} errors, {metrics.retries} retries, "
+            f"{metrics.request_bytes + metrics.response_bytes} bytes"
+            for method, metrics in ranked[:top]
+        )
+
+
+METRICS = RpcMetrics()
+
+_export = AtExitExport(METRICS, METRICS_OUT_ENV, "RPC metrics", "Slowest RPC methods")
+
+
+def export_metrics_at_exit(path: Optional[Union[str, Path]] = None) -> None:
+    """
+    Write `METRICS` to `path`, or to $RPC_METRICS_OUT, when the process exits.
+    """
+    _export.register(path)
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from starknet_py.net.account.account import Account
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.client_models import Calls, ResourceBoundsMapping
+
+from pragma_deployer.utils.receipts import ReceiptTracker
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def is_nonce_error(error: ClientError) -> bool:
+    return "nonce" in str(error.message).lower()
+
+
+class NonceManager:
+    """
+    Assigns nonces locally so an account can send transactions back-to-back.
+
+    The nonce is fetched once from the pending block and incremented on every
+    submission. Submitted transaction hashes are tracked until their receipt
+    lands, through `receipt_tracker` when given; at most `max_in_flight`
+    transactions are outstanding at any time. Receipts are kept by hash, so
+    any number of `wait` calls, before or after `wait_all`, get the same one.
+    A nonce error from the node triggers a resync and a single retry.
+    """
+
+    def __init__(
+        self,
+        account: Account,
+        max_in_flight: int = 16,
+        receipt_tracker: Optional[ReceiptTracker] = None,
+    ):
+        self.account = account
+        self.max_in_flight = max_in_flight
+        self.receipt_tracker = receipt_tracker
+        self._nonce: Optional[int] = None
+        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(max_in_flight)
+        # Every transaction submitted, settled ones included
+        self._receipts: Dict[int, asyncio.Task] = {}
+        # Transactions `wait_all` has not collected yet
+        self._pending: Dict[int, asyncio.Task] = {}
+
+    @property
+    def pending(self) -> List[int]:
+        return list(self._pending)
+
+    async def sync(self) -> int:
+        self._nonce = await self.account.get_nonce(block_number="pending")
+        logger.debug(f"ℹ️  Synced nonce of {hex(self.account.address)}: {self._nonce}")
+        return self._nonce
+
+    async def current(self) -> int:
+        """
+        Next nonce that will be assigned, syncing it first if needed.
+        """
+        async with self._lock:
+            if self._nonce is None:
+                await self.sync()
+            return self._nonce
+
+    async def submit(self, send: Callable[[int], Awaitable[int]]) -> int:
+        """
+        Call `send(nonce)` with the next local nonce and track the transaction
+        hash it returns without waiting for inclusion, see `wait` and
+        `wait_all`.
+        """
+        await self._slots.acquire()
+        try:
+            async with self._lock:
+                if self._nonce is None:
+                    await self.sync()
+                try:
+                    tx_hash = await send(self._nonce)
+                except ClientError as e:
+                    if not is_nonce_error(e):
+                        raise
+                    logger.warning(f"⚠️  Nonce {self._nonce} rejected, resyncing")
+                    await self.sync()
+                    tx_hash = await send(self._nonce)
+                self._nonce += 1
+        except BaseException:
+            self._slots.release()
+            raise
+
+        self._receipts[tx_hash] = asyncio.create_task(self._track(tx_hash))
+        self._pending[tx_hash] = self._receipts[tx_hash]
+        return tx_hash
+
+    async def execute(
+        self, calls: Calls, resource_bounds: Optional[ResourceBoundsMapping] = None
+    ) -> int:
+        """
+        Sign and send an invoke of `calls` with the next local nonce.
+        """
+
+        async def send(nonce: int) -> int:
+            response = await self.account.execute_v3(
+                calls=calls,
+                nonce=nonce,
+                resource_bounds=resource_bounds,
+                auto_estimate=resource_bounds is None,
+            )
+            return response.transaction_hash
+
+        return await self.submit(send)
+
+    async def declare(
+        self,
+        compiled_contract: str,
+        compiled_class_hash: int,
+        resource_bounds: Optional[ResourceBoundsMapping] = None,
+    ) -> int:
+        """
+        Sign and send a declare v3 of a Sierra contract with the next local nonce.
+        """
+
+        async def send(nonce: int) -> int:
+            declare_tx = await self.account.sign_declare_v3(
+                compiled_contract=compiled_contract,
+                compiled_class_hash=compiled_class_hash,
+                nonce=nonce,
+                resource_bounds=resource_bounds,
+                auto_estimate=resource_bounds is None,
+            )
+            response = await self.account.client.declare(transaction=declare_tx)
+            return response.transaction_hash
+
+        return await self.submit(send)
+
+    async def _track(self, tx_hash: int):
+        try:
+            if self.receipt_tracker is not None:
+                return await self.receipt_tracker.wait(tx_hash)
+            return await self.account.client.wait_for_tx(tx_hash)
+        finally:
+            self._slots.release()
+
+    async def wait(self, tx_hash: int):
+        """
+        Wait for the receipt of a transaction sent through `execute`.
+        """
+        if tx_hash not in self._receipts:
+            raise ValueError(
+                f"Transaction {hex(tx_hash)} was not submitted by the nonce manager "
+                f"of {hex(self.account.address)}"
+            )
+        try:
+            # Shielded so a cancelled waiter does not cancel the other ones
+            return await asyncio.shield(self._receipts[tx_hash])
+        finally:
+            self._pending.pop(tx_hash, None)
+
+    async def wait_all(self) -> list:
+        """
+        Wait concurrently for every outstanding transaction and return their
+        receipts in submission order. The first failure is raised once all
+        transactions have settled.
+        """
+        tx_hashes = self.pending
+        results = await asyncio.gather(
+            *(asyncio.shield(self._pending[tx_hash]) for tx_hash in tx_hashes),
+            return_exceptions=True,
+        )
+        for tx_hash in tx_hashes:
+            self._pending.pop(tx_hash, None)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
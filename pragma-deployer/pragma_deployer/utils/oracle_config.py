@@ -0,0 +1,168 @@
+import json
+import logging
+
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from pragma_sdk.common.utils import felt_to_str
+
+from pragma_deployer.utils.starknet import call_many, str_to_felt
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+ORACLE = "pragma_Oracle"
+
+
+def to_felt(value) -> int:
+    """
+    Felt of a ticker ("ETH/USD"), a hex string ("0x...") or an int.
+    """
+    if isinstance(value, int):
+        return value
+    if value.startswith("0x"):
+        return int(value, 16)
+    return str_to_felt(value)
+
+
+def load_oracle_config(path: Path) -> dict:
+    """
+    Parse a desired-state file into felt-encoded currencies, pairs, conversion
+    rate pairs and tokenized vaults, keyed by id and shaped like the Oracle
+    getters' return values so they can be compared as is.
+
+        {
+            "currencies": [{"id": "ETH", "decimals": 18,
+                            "is_abstract_currency": false,
+                            "starknet_address": "0x..", "ethereum_address": "0x.."}],
+            "pairs": ["ETH/USD"],
+            "conversion_rate_pairs": ["CONVERSION_XLBTC/USD"],
+            "tokenized_vaults": [{"token": "CONVERSION_XLBTC",
+                                  "underlying_token": "BTC", "address": "0x.."}]
+        }
+    """
+    config = json.loads(Path(path).read_text())
+
+    currencies = {}
+    for currency in config.get("currencies", []):
+        currency_id = to_felt(currency["id"])
+        currencies[currency_id] = {
+            "id": currency_id,
+            "decimals": currency["decimals"],
+            "is_abstract_currency": bool(currency.get("is_abstract_currency", False)),
+            "starknet_address": to_felt(currency.get("starknet_address", 0)),
+            "ethereum_address": to_felt(currency.get("ethereum_address", 0)),
+        }
+
+    pairs = {}
+    for pair in config.get("pairs", []):
+        base_currency, quote_currency = pair.split("/")
+        pair_id = to_felt(pair)
+        pairs[pair_id] = {
+            "id": pair_id,
+            "quote_currency_id": to_felt(quote_currency),
+            "base_currency_id": to_felt(base_currency),
+        }
+
+    conversion_rate_pairs = list(
+        dict.fromkeys(to_felt(pair) for pair in config.get("conversion_rate_pairs", []))
+    )
+
+    tokenized_vaults = {
+        to_felt(vault["token"]): {
+            "vault_address": to_felt(vault["address"]),
+            "underlying_asset": to_felt(vault.get("underlying_token", "STRK")),
+        }
+        for vault in config.get("tokenized_vaults", [])
+    }
+
+    return {
+        "currencies": currencies,
+        "pairs": pairs,
+        "conversion_rate_pairs": conversion_rate_pairs,
+        "tokenized_vaults": tokenized_vaults,
+    }
+
+
+async def fetch_oracle_state(desired: dict, port: Optional[int] = None) -> dict:
+    """
+    Read the on-chain state of every item in `desired`. All getters are issued
+    at once so they share JSON-RPC batch requests.
+    """
+    currency_ids = list(desired["currencies"])
+    pair_ids = list(desired["pairs"])
+    tokens = list(desired["tokenized_vaults"])
+    results = await call_many(
+        [(ORACLE, "get_currency", currency_id) for currency_id in currency_ids]
+        + [(ORACLE, "get_pair", pair_id) for pair_id in pair_ids]
+        + [(ORACLE, "get_tokenized_vaults", token) for token in tokens]
+        + [(ORACLE, "get_registered_conversion_rate_pairs")],
+        port=port,
+    )
+    results = iter(results)
+    return {
+        "currencies": {
+            currency_id: dict(next(results)[0]) for currency_id in currency_ids
+        },
+        "pairs": {pair_id: dict(next(results)[0]) for pair_id in pair_ids},
+        "tokenized_vaults": {token: dict(next(results)[0]) for token in tokens},
+        "conversion_rate_pairs": list(next(results)[0]),
+    }
+
+
+def serialize_currency(currency: dict) -> list:
+    return [
+        currency["id"],
+        currency["decimals"],
+        int(currency["is_abstract_currency"]),
+        currency["starknet_address"],
+        currency["ethereum_address"],
+    ]
+
+
+def serialize_pair(pair: dict) -> list:
+    return [pair["id"], pair["quote_currency_id"], pair["base_currency_id"]]
+
+
+def diff_oracle_config(desired: dict, current: dict) -> List[Tuple[str, list]]:
+    """
+    (function name, calldata) of the Oracle calls that bring `current` to
+    `desired`, in dependency order: currencies, pairs, conversion rate pairs,
+    then tokenized vaults. Items missing from `desired` are left untouched,
+    the Oracle has no entry point to remove them.
+    """
+    calls = []
+    for currency_id, currency in desired["currencies"].items():
+        existing = current["currencies"][currency_id]
+        if existing["id"] == 0:
+            calls.append(("add_currency", serialize_currency(currency)))
+        elif existing != currency:
+            calls.append(
+                ("update_currency", [currency_id, *serialize_currency(currency)])
+            )
+
+    for pair_id, pair in desired["pairs"].items():
+        existing = current["pairs"][pair_id]
+        if existing["id"] == 0:
+            calls.append(("add_pair", serialize_pair(pair)))
+        elif existing != pair:
+            calls.append(("update_pair", [pair_id, *serialize_pair(pair)]))
+
+    for pair_id in desired["conversion_rate_pairs"]:
+        if pair_id not in current["conversion_rate_pairs"]:
+            calls.append(("add_registered_conversion_rate_pair", [pair_id]))
+
+    for token, vault in desired["tokenized_vaults"].items():
+        if current["tokenized_vaults"][token] != vault:
+            calls.append(
+                (
+                    "register_tokenized_vault",
+                    [token, vault["underlying_asset"], vault["vault_address"]],
+                )
+            )
+    return calls
+
+
+def describe_call(function_name: str, calldata: list) -> str:
+    return f"{function_name} {felt_to_str(calldata[0])}"
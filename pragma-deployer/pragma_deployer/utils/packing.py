@@ -0,0 +1,359 @@
+import asyncio
+import json
+import logging
+
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from pragma_sdk.common.types.entry import Entry
+from pragma_sdk.common.types.types import DataTypes
+
+from pragma_deployer.utils.constants import (
+    DEPLOYER_ROOT,
+    MAX_BATCH_CALLDATA,
+    MAX_BATCH_L2_GAS,
+)
+from pragma_deployer.utils.data_keys import (
+    ENTRY_VARIANTS,
+    DataKey,
+    get_data_key,
+    get_data_type,
+)
+from pragma_deployer.utils.entry_batch import EntryBatch, publish_batch
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+DEFAULT_MODEL_PATH = DEPLOYER_ROOT / "packing_model.json"
+PACKING_MODEL_VERSION = 1
+
+# Felts of one `PossibleEntries` item: the variant index then the entry struct
+ENTRY_CALLDATA = {DataTypes.SPOT: 7, DataTypes.FUTURE: 8, DataTypes.GENERIC: 7}
+
+# __execute__ calldata around the entries of a single `publish_data_entries`
+# call: the calls length, (to, selector, calldata_len) and the span length.
+TX_CALLDATA = 5
+
+
+def encode_entry(entry: Entry) -> List[int]:
+    """
+    Calldata of `entry` as a `PossibleEntries` item.
+    """
+    data_type = entry.get_asset_type()
+    base = [entry.base.timestamp, entry.base.source, entry.base.publisher]
+    if data_type == DataTypes.GENERIC:
+        return [
+            ENTRY_VARIANTS[data_type],
+            *base,
+            entry.key,
+            entry.value % 2**128,
+            entry.value // 2**128,
+        ]
+    calldata = [
+        ENTRY_VARIANTS[data_type],
+        *base,
+        entry.price,
+        entry.pair_id,
+        entry.volume,
+    ]
+    if data_type == DataTypes.FUTURE:
+        calldata.append(entry.expiry_timestamp)
+    return calldata
+
+
+def encode_entries(entries: List[Entry]) -> List[int]:
+    """
+    Calldata of `publish_data_entries(entries)`.
+    """
+    return [len(entries), *(felt for entry in entries for felt in encode_entry(entry))]
+
+
+class EntryCost:
+    """
+    L2 gas spent by `publish_data` on one entry of a given type.
+
+    Overwriting the entry of a (source, publisher) costs `update`. The first
+    entry of a (source, publisher) costs `insert` plus `per_publisher` for
+    each publisher already stored for the pair, as the Oracle scans them.
+    """
+
+    def __init__(self, update: int, insert: int, per_publisher: int = 0):
+        self.update = update
+        self.insert = insert
+        self.per_publisher = per_publisher
+
+    def l2_gas(self, new: bool, publishers: int = 0) -> int:
+        if not new:
+            return self.update
+        return self.insert + self.per_publisher * publishers
+
+    def to_dict(self) -> dict:
+        return {
+            "update": self.update,
+            "insert": self.insert,
+            "per_publisher": self.per_publisher,
+        }
+
+
+class PackingModel:
+    """
+    Cost of `publish_data_entries` transactions, measured on devnet with
+    `calibrate-packing`: a fixed `tx_l2_gas` per transaction (account
+    validation and execution) plus the `EntryCost` of each entry.
+    Estimates are scaled by `margin` before being checked against a budget.
+    """
+
+    def __init__(
+        self,
+        costs: Dict[DataTypes, EntryCost],
+        tx_l2_gas: int,
+        margin: float = 1.2,
+        calibrated: bool = False,
+    ):
+        self.costs = costs
+        self.tx_l2_gas = tx_l2_gas
+        self.margin = margin
+        self.calibrated = calibrated
+
+    def entry_l2_gas(self, data_type: DataTypes, new: bool, publishers: int) -> int:
+        return int(self.costs[data_type].l2_gas(new, publishers) * self.margin)
+
+    def to_dict(self) -> dict:
+        return {
+            "version": PACKING_MODEL_VERSION,
+            "tx_l2_gas": self.tx_l2_gas,
+            "margin": self.margin,
+            "calibrated": self.calibrated,
+            "costs": {
+                data_type.value: cost.to_dict()
+                for data_type, cost in self.costs.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, model: dict) -> "PackingModel":
+        if model.get("version") != PACKING_MODEL_VERSION:
+            raise ValueError("Unsupported packing model version")
+        return cls(
+            costs={
+                DataTypes(data_type): EntryCost(**cost)
+                for data_type, cost in model["costs"].items()
+            },
+            tx_l2_gas=model["tx_l2_gas"],
+            margin=model.get("margin", 1.2),
+            calibrated=model.get("calibrated", False),
+        )
+
+    def save(self, path: Union[str, Path] = DEFAULT_MODEL_PATH) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+
+
+# Deliberately pessimistic placeholder, run `calibrate-packing` to replace it
+DEFAULT_MODEL = PackingModel(
+    costs={
+        DataTypes.SPOT: EntryCost(
+            update=4_000_000, insert=8_000_000, per_publisher=200_000
+        ),
+        DataTypes.FUTURE: EntryCost(
+            update=4_500_000, insert=9_000_000, per_publisher=200_000
+        ),
+        DataTypes.GENERIC: EntryCost(update=3_000_000, insert=3_000_000),
+    },
+    tx_l2_gas=5_000_000,
+    margin=1.5,
+)
+
+
+def load_packing_model(path: Union[str, Path] = DEFAULT_MODEL_PATH) -> PackingModel:
+    """
+    The packing model calibrated at `path`, or the conservative default one.
+    """
+    path = Path(path)
+    if not path.exists():
+        logger.warning(
+            f"⚠️  No packing model at {path}, using conservative defaults. "
+            "Run calibrate-packing against a devnet to measure it."
+        )
+        return DEFAULT_MODEL
+    return PackingModel.from_dict(json.loads(path.read_text()))
+
+
+class AggregationState:
+    """
+    Sources and publishers the Oracle stores for each data key, which tells
+    inserts from updates and how many publishers an insert scans.
+    """
+
+    def __init__(self):
+        self.sources: Dict[DataKey, Set[int]] = {}
+        self.publishers: Dict[DataKey, Set[int]] = {}
+
+    def __contains__(self, data_key: DataKey) -> bool:
+        return data_key in self.publishers
+
+    def is_stored(self, entry: Entry) -> bool:
+        """
+        Whether the Oracle already has an entry for this (source, publisher).
+        Publishers publish all of their sources, so seeing both is enough.
+        """
+        data_key = get_data_key(entry)
+        return entry.base.source in self.sources.get(
+            data_key, ()
+        ) and entry.base.publisher in self.publishers.get(data_key, ())
+
+    def get_publisher_count(self, data_key: DataKey) -> int:
+        return len(self.publishers.get(data_key, ()))
+
+    def add(self, entries: Iterable[Entry]) -> None:
+        """
+        Record `entries` as published.
+        """
+        for entry in entries:
+            data_key = get_data_key(entry)
+            self.sources.setdefault(data_key, set()).add(entry.base.source)
+            self.publishers.setdefault(data_key, set()).add(entry.base.publisher)
+
+    async def fetch(self, oracle, entries: Iterable[Entry]) -> None:
+        """
+        Read the sources and publishers of the data keys of `entries` not
+        known yet from the `oracle` contract. Concurrent calls share batches.
+        """
+        data_keys = list(
+            {get_data_key(entry) for entry in entries} - set(self.publishers)
+        )
+        if not data_keys:
+            return
+        results = await asyncio.gather(
+            *(
+                oracle.functions[function_name].call(get_data_type(data_key))
+                for data_key in data_keys
+                for function_name in ("get_all_sources", "get_all_publishers")
+            )
+        )
+        for i, data_key in enumerate(data_keys):
+            (sources,), (publishers,) = results[2 * i : 2 * i + 2]
+            self.sources[data_key] = set(sources)
+            self.publishers[data_key] = set(publishers)
+
+
+def get_latest_entries(entries: Iterable[Entry]) -> List[Entry]:
+    """
+    `entries` without the ones superseded by a newer entry of the same
+    (data key, source, publisher), so that the rest can be freely reordered.
+    """
+    latest: Dict[tuple, Entry] = {}
+    for entry in entries:
+        key = (get_data_key(entry), entry.base.source, entry.base.publisher)
+        if key not in latest or entry.base.timestamp >= latest[key].base.timestamp:
+            latest[key] = entry
+    return list(latest.values())
+
+
+def get_entry_costs(
+    entries: List[Entry], model: PackingModel, state: Optional[AggregationState]
+) -> List[Tuple[int, int]]:
+    """
+    (L2 gas, calldata felts) of each entry. Without `state` every entry is
+    costed as an insert. Inserts are costed as if all the new publishers of
+    their pair were stored first, wherever they end up being packed.
+    """
+    state = state or AggregationState()
+    new_publishers: Dict[DataKey, Set[int]] = defaultdict(set)
+    for entry in entries:
+        data_key = get_data_key(entry)
+        if entry.base.publisher not in state.publishers.get(data_key, ()):
+            new_publishers[data_key].add(entry.base.publisher)
+
+    costs = []
+    for entry in entries:
+        data_key = get_data_key(entry)
+        data_type = entry.get_asset_type()
+        publishers = state.get_publisher_count(data_key) + len(new_publishers[data_key])
+        costs.append(
+            (
+                model.entry_l2_gas(data_type, not state.is_stored(entry), publishers),
+                ENTRY_CALLDATA[data_type],
+            )
+        )
+    return costs
+
+
+def pack_entries(
+    entries: List[Entry],
+    model: Optional[PackingModel] = None,
+    state: Optional[AggregationState] = None,
+    max_l2_gas: int = MAX_BATCH_L2_GAS,
+    max_calldata: int = MAX_BATCH_CALLDATA,
+) -> List[List[Entry]]:
+    """
+    Split `entries` into as few `publish_data_entries` transactions as
+    possible, each within `max_l2_gas` and `max_calldata` felts of
+    __execute__ calldata according to `model`.
+
+    Superseded entries are dropped, then entries are packed first-fit in
+    decreasing order of their largest share of either budget, which is within
+    a transaction of the optimum when costs are as uniform as entries are.
+    Entries keep their relative order inside a transaction.
+    """
+    model = model or DEFAULT_MODEL
+    entries = get_latest_entries(entries)
+    if not entries:
+        return []
+    costs = get_entry_costs(entries, model, state)
+
+    gas_budget = max_l2_gas - model.tx_l2_gas
+    calldata_budget = max_calldata - TX_CALLDATA
+    if gas_budget <= 0 or calldata_budget <= 0:
+        raise ValueError("Budget does not fit a publish_data_entries transaction")
+
+    order = sorted(
+        range(len(entries)),
+        key=lambda i: max(costs[i][0] / gas_budget, costs[i][1] / calldata_budget),
+        reverse=True,
+    )
+    bins: List[List[int]] = []
+    # Gas and calldata left in each transaction
+    room: List[List[int]] = []
+    for i in order:
+        gas, calldata = costs[i]
+        for indices, left in zip(bins, room):
+            if gas <= left[0] and calldata <= left[1]:
+                indices.append(i)
+                left[0] -= gas
+                left[1] -= calldata
+                break
+        else:
+            if gas > gas_budget or calldata > calldata_budget:
+                logger.warning(
+                    f"⚠️  Entry needs {gas} L2 gas and {calldata} felts, "
+                    "above the transaction budget"
+                )
+            bins.append([i])
+            room.append([gas_budget - gas, calldata_budget - calldata])
+
+    lower_bound = max(
+        -(-sum(gas for gas, _ in costs) // gas_budget),
+        -(-sum(calldata for _, calldata in costs) // calldata_budget),
+    )
+    logger.debug(
+        f"ℹ️  Packed {len(entries)} entries in {len(bins)} transaction(s), "
+        f"at least {lower_bound} needed"
+    )
+    return [[entries[i] for i in sorted(indices)] for indices in bins]
+
+
+async def publish_entries(client, entries: List[Entry]):
+    """
+    Send `entries`, of any types, in a single `publish_data_entries`
+    transaction of the PragmaOnChainClient `client`. Spot and future entries
+    are encoded by `EntryBatch`, generic ones go through the ABI serializer.
+    """
+    if all(entry.get_asset_type() != DataTypes.GENERIC for entry in entries):
+        return await publish_batch(client, EntryBatch.from_entries(entries))
+    return await client.oracle.functions["publish_data_entries"].invoke(
+        new_entries=[{entry.get_asset_type(): entry.serialize()} for entry in entries],
+        execution_config=client.execution_config,
+        callback=client.track_nonce,
+    )
@@ -0,0 +1,402 @@
+import asyncio
+import logging
+import time
+
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from pragma_sdk.common.types.entry import Entry
+from pragma_sdk.onchain.client import PragmaOnChainClient
+from pragma_sdk.onchain.constants import CHAIN_IDS
+from pragma_sdk.onchain.types import ContractAddresses
+from pragma_sdk.onchain.types.execution_config import ExecutionConfig
+from starknet_py.net.full_node_client import FullNodeClient
+
+from pragma_deployer.utils.constants import NETWORK
+from pragma_deployer.utils.deviation import DeviationFilter
+from pragma_deployer.utils.endpoints import InstrumentedClient, MultiEndpointClient
+from pragma_deployer.utils.metrics import percentile
+from pragma_deployer.utils.packing import (
+    AggregationState,
+    PackingModel,
+    pack_entries,
+    publish_entries,
+)
+from pragma_deployer.utils.receipts import ReceiptTracker
+from pragma_deployer.utils.tracing import FlushTrace, PublishTracer
+from pragma_deployer.utils.validation import EntryValidator
+from pragma_deployer.utils.constants import MAX_BATCH_CALLDATA, MAX_BATCH_L2_GAS
+from pragma_deployer.utils.starknet import get_deployments
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Latency samples kept for the percentiles in `PublisherPipeline.summary`.
+LATENCY_WINDOW = 10_000
+# Default flush size when a packing model splits the flushes into transactions
+PACKED_BATCH_SIZE = 1_000
+
+_STOP = object()
+
+
+class PublisherClient(PragmaOnChainClient):
+    """
+    PragmaOnChainClient sending its requests through `full_node_client`
+    rather than a plain client for `network`.
+    """
+
+    def __init__(
+        self,
+        full_node_client: FullNodeClient,
+        chain_name: str,
+        account_private_key: str,
+        account_contract_address: str,
+        contract_addresses_config: Optional[ContractAddresses] = None,
+        execution_config: Optional[ExecutionConfig] = None,
+    ):
+        super().__init__(
+            network=full_node_client.url,
+            chain_name=chain_name,
+            contract_addresses_config=contract_addresses_config,
+            execution_config=execution_config,
+        )
+        self.full_node_client = full_node_client
+        self.client = full_node_client
+        self._setup_account_client(
+            CHAIN_IDS[self.network], account_private_key, account_contract_address
+        )
+        self._setup_contracts()
+
+    def _create_full_node_client(self, rpc_url: str) -> FullNodeClient:
+        return InstrumentedClient(node_url=rpc_url)
+
+
+def get_publisher_client(
+    port: Optional[int] = None,
+    execution_config: Optional[ExecutionConfig] = None,
+    account_address: Optional[str] = None,
+    private_key: Optional[str] = None,
+) -> PragmaOnChainClient:
+    """
+    PragmaOnChainClient for the configured network and account, or the given
+    one, targeting the Oracle of our deployments when there is one.
+    Its requests are spread over the network's RPC endpoints and recorded in
+    the RPC metrics.
+    """
+    chain_name = next(
+        (
+            name
+            for name, chain_id in CHAIN_IDS.items()
+            if name != "devnet" and chain_id == NETWORK["chain_id"]
+        ),
+        None,
+    )
+    if chain_name is None:
+        raise ValueError(f"pragma-sdk does not support {NETWORK['name']}")
+
+    deployments = get_deployments()
+    contract_addresses = None
+    if "pragma_Oracle" in deployments:
+
+        def address(contract_name: str) -> int:
+            return int(deployments.get(contract_name, {}).get("address", "0x0"), 16)
+
+        contract_addresses = ContractAddresses(
+            publisher_registry_address=address("pragma_PublisherRegistry"),
+            oracle_proxy_addresss=address("pragma_Oracle"),
+            summary_stats_address=address("pragma_SummaryStats"),
+        )
+
+    if port is None:
+        full_node_client = MultiEndpointClient(
+            node_urls=NETWORK["rpc_urls"], rate_limit=NETWORK["rpc_rate_limit"]
+        )
+    else:
+        full_node_client = InstrumentedClient(node_url=f"http://127.0.0.1:{port}/rpc")
+    return PublisherClient(
+        full_node_client,
+        chain_name=chain_name,
+        account_private_key=private_key or NETWORK["private_key"],
+        account_contract_address=account_address or NETWORK["account_address"],
+        contract_addresses_config=contract_addresses,
+        execution_config=execution_config,
+    )
+
+
+class PublisherPipeline:
+    """
+    Streams entries into `publish_data_entries` transactions.
+
+    Producers `put` entries into a bounded queue. A single batcher drains it
+    and flushes a batch through `publish_many` once it holds `max_batch_size`
+    entries, or `max_delay` seconds after its first entry. Transactions are
+    sent one at a time so the client's nonce tracking stays consistent, and
+    their receipts are awaited concurrently. At most `max_in_flight` flushes
+    wait for their receipts; beyond that the batcher stops draining and
+    producers block once the queue is full.
+
+    With a `packing_model`, each flush is packed into the fewest transactions
+    fitting `max_l2_gas` and `max_calldata`, whatever the entry types, see
+    `pack_entries`, instead of being paginated per type by the client.
+    With a `deviation_filter`, entries that would not move the Oracle are
+    dropped before being queued and failed ones pass it again next time.
+    With a `validator`, entries the Oracle would reject are dropped first.
+    With a `tracer`, the latency of every stage is recorded per pair, see
+    `PublishTracer`.
+
+    `close` (or leaving the `async with` block) stops accepting entries,
+    flushes what is queued and waits for every transaction in flight.
+    """
+
+    def __init__(
+        self,
+        client: PragmaOnChainClient,
+        max_batch_size: Optional[int] = None,
+        max_delay: float = 1.0,
+        max_queue_size: int = 10_000,
+        max_in_flight: int = 4,
+        packing_model: Optional[PackingModel] = None,
+        max_l2_gas: int = MAX_BATCH_L2_GAS,
+        max_calldata: int = MAX_BATCH_CALLDATA,
+        deviation_filter: Optional[DeviationFilter] = None,
+        validator: Optional[EntryValidator] = None,
+        tracer: Optional[PublishTracer] = None,
+    ):
+        self.client = client
+        self.max_batch_size = max_batch_size or (
+            PACKED_BATCH_SIZE if packing_model else client.execution_config.pagination
+        )
+        self.packing_model = packing_model
+        self.max_l2_gas = max_l2_gas
+        self.max_calldata = max_calldata
+        self.aggregation_state = AggregationState()
+        self.deviation_filter = deviation_filter
+        self.validator = validator
+        self.tracer = tracer
+        if tracer is not None:
+            tracer.attach(client)
+        self.max_delay = max_delay
+        self.receipt_tracker = ReceiptTracker(client.full_node_client)
+        self.stats = {
+            "entries_queued": 0,
+            "entries_skipped": 0,
+            "entries_rejected": 0,
+            "entries_sent": 0,
+            "entries_published": 0,
+            "entries_failed": 0,
+            "transactions_sent": 0,
+            "transactions_failed": 0,
+            "size_flushes": 0,
+            "deadline_flushes": 0,
+        }
+        # Seconds from `put` to submission, and from `put` to the receipt
+        self.submit_latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.publish_latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._tracking: set = set()
+        self._probes: set = set()
+        self._batcher: Optional[asyncio.Task] = None
+        self._closed = False
+        self._started_at = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tracking)
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    async def start(self) -> "PublisherPipeline":
+        if self._batcher is None:
+            self._started_at = time.monotonic()
+            self._batcher = asyncio.create_task(self._run())
+        return self
+
+    async def put(self, entry: Entry) -> None:
+        """
+        Queue `entry`, waiting for room when the pipeline is saturated.
+        """
+        await self.put_many([entry])
+
+    async def put_many(self, entries: List[Entry]) -> None:
+        """
+        Queue `entries`, a tick of prices is filtered at once.
+        """
+        if self._closed:
+            raise RuntimeError("PublisherPipeline is closed")
+        if self.validator is not None:
+            valid = await self.validator.check(entries)
+            self.stats["entries_rejected"] += len(entries) - len(valid)
+            entries = valid
+        if self.deviation_filter is not None:
+            passed = self.deviation_filter.filter(entries)
+            self.stats["entries_skipped"] += len(entries) - len(passed)
+            entries = passed
+        for entry in entries:
+            await self._queue.put((entry, time.monotonic()))
+            self.stats["entries_queued"] += 1
+
+    def _forget(self, batch: List[Tuple[Entry, float]]) -> None:
+        if self.deviation_filter is not None:
+            self.deviation_filter.forget(entry for entry, _ in batch)
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._batcher is not None:
+            await self._queue.put(_STOP)
+            await self._batcher
+        if self._tracking:
+            await asyncio.gather(*self._tracking, return_exceptions=True)
+        if self._probes:
+            await asyncio.gather(*self._probes, return_exceptions=True)
+        await self.receipt_tracker.close()
+        logger.info(f"ℹ️  Publisher pipeline closed: {self.summary()}")
+
+    async def __aenter__(self) -> "PublisherPipeline":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _next_batch(self) -> Tuple[List[Tuple[Entry, float]], bool]:
+        """
+        The next batch to flush and whether the pipeline is stopping.
+        """
+        item = await self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            if not batch:
+                continue
+            if len(batch) >= self.max_batch_size:
+                self.stats["size_flushes"] += 1
+            else:
+                self.stats["deadline_flushes"] += 1
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Tuple[Entry, float]]) -> None:
+        await self._slots.acquire()
+        trace = None
+        if self.tracer is not None:
+            trace = self.tracer.start(batch, self.client)
+        entries = [entry for entry, _ in batch]
+        try:
+            if self.packing_model is None:
+                invocations = await self.client.publish_many(entries)
+            else:
+                invocations = await self._publish_packed(entries)
+        except Exception as e:
+            self._slots.release()
+            if trace is not None:
+                self.tracer.failed(trace)
+            self.stats["entries_failed"] += len(batch)
+            self._forget(batch)
+            logger.error(f"⛔ Failed to publish {len(batch)} entries: {e}")
+            return
+
+        now = time.monotonic()
+        self.submit_latencies.extend(now - queued_at for _, queued_at in batch)
+        self.stats["entries_sent"] += len(batch)
+        self.stats["transactions_sent"] += len(invocations)
+        tx_hashes = [invocation.hash for invocation in invocations]
+        if trace is not None:
+            self.tracer.submitted(trace)
+        task = asyncio.create_task(self._track(tx_hashes, batch, trace))
+        self._tracking.add(task)
+        task.add_done_callback(self._tracking.discard)
+
+    async def _publish_packed(self, entries: List[Entry]) -> list:
+        await self.aggregation_state.fetch(self.client.oracle, entries)
+        invocations = []
+        for packed in pack_entries(
+            entries,
+            self.packing_model,
+            self.aggregation_state,
+            max_l2_gas=self.max_l2_gas,
+            max_calldata=self.max_calldata,
+        ):
+            invocations.append(await publish_entries(self.client, packed))
+        return invocations
+
+    async def _track(
+        self,
+        tx_hashes: List[int],
+        batch: List[Tuple[Entry, float]],
+        trace: Optional[FlushTrace] = None,
+    ) -> None:
+        try:
+            results = await asyncio.gather(
+                *(self.receipt_tracker.wait(tx_hash) for tx_hash in tx_hashes),
+                return_exceptions=True,
+            )
+        finally:
+            self._slots.release()
+
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures:
+            self.stats["transactions_failed"] += len(failures)
+            self.stats["entries_failed"] += len(batch)
+            self._forget(batch)
+            logger.error(
+                f"⛔ {len(failures)} publish transaction(s) failed: {failures[0]}"
+            )
+            return
+        now = time.monotonic()
+        self.publish_latencies.extend(now - queued_at for _, queued_at in batch)
+        self.stats["entries_published"] += len(batch)
+        if self.packing_model is not None:
+            # Costed as updates from now on, entries still in flight as inserts
+            self.aggregation_state.add(entry for entry, _ in batch)
+        if self.validator is not None:
+            self.validator.record(entry for entry, _ in batch)
+        if trace is not None:
+            self.tracer.accepted(trace)
+            # Probed outside of the in flight slots
+            probe = asyncio.create_task(self.tracer.finish(trace, self.client.oracle))
+            self._probes.add(probe)
+            probe.add_done_callback(self._probes.discard)
+
+    @property
+    def throughput(self) -> float:
+        """
+        Entries published per second since the pipeline started.
+        """
+        elapsed = time.monotonic() - self._started_at
+        return self.stats["entries_published"] / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.stats['entries_published']}/{self.stats['entries_queued']} "
+            f"entries published in {self.stats['transactions_sent']} tx "
+            f"({self.stats['entries_failed']} failed, "
+            f"{self.stats['entries_skipped']} skipped, "
+            f"{self.stats['entries_rejected']} rejected), "
+            f"{self.throughput:.1f} entries/s, "
+            f"submit p50 {percentile(self.submit_latencies, 0.5):.2f}s "
+            f"p95 {percentile(self.submit_latencies, 0.95):.2f}s, "
+            f"publish p50 {percentile(self.publish_latencies, 0.5):.2f}s "
+            f"p95 {percentile(self.publish_latencies, 0.95):.2f}s"
+        )
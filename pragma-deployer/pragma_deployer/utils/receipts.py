@@ -0,0 +1,266 @@
+import asyncio
+import logging
+import time
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from starknet_py.net.client_errors import ClientError
+from starknet_py.net.client_models import (
+    TransactionExecutionStatus,
+    TransactionReceipt,
+    TransactionStatus,
+)
+from starknet_py.net.client_utils import _to_rpc_felt
+from starknet_py.net.full_node_client import FullNodeClient
+from starknet_py.net.schemas.rpc.transactions import TransactionReceiptSchema
+from starknet_py.transaction_errors import (
+    TransactionNotReceivedError,
+    TransactionRejectedError,
+    TransactionRevertedError,
+)
+
+from pragma_deployer.utils.batch_rpc import BatchRejectedError, post_batch
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# JSON-RPC error code of an unknown transaction hash.
+TXN_HASH_NOT_FOUND = 29
+
+# Seconds before a transaction without a receipt is given up on, as long as
+# `wait_for_tx` waits by default (500 checks 2 seconds apart).
+RECEIPT_TIMEOUT = 1000.0
+
+
+def is_not_found(error: ClientError) -> bool:
+    return error.code == TXN_HASH_NOT_FOUND or "not found" in str(error.message)
+
+
+class ReceiptTracker:
+    """
+    Waits for many transactions at once.
+
+    Every pending hash is polled with one JSON-RPC batch request, which also
+    fetches the latest block number to estimate the block time. Polls are
+    scheduled around the expected next block and back off exponentially,
+    up to `max_interval`, while no block shows up. Reverted transactions fail
+    as soon as their receipt lands, with their revert reason. Transactions
+    still unknown after `status_check_after` polls have their status checked
+    so rejections are surfaced too. Those without a receipt `timeout` seconds
+    after being tracked, dropped or stuck in RECEIVED, fail with
+    TransactionNotReceivedError.
+    """
+
+    def __init__(
+        self,
+        client: FullNodeClient,
+        min_interval: float = 0.5,
+        max_interval: float = 10.0,
+        max_batch_size: int = 50,
+        status_check_after: int = 3,
+        max_failures: int = 5,
+        timeout: float = RECEIPT_TIMEOUT,
+    ):
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_batch_size = max_batch_size
+        self.status_check_after = status_check_after
+        self.max_failures = max_failures
+        self.timeout = timeout
+        self.batch_supported = True
+        self.block_time: Optional[float] = None
+        self.stats = {"polls": 0, "requests": 0}
+        self._futures: Dict[int, asyncio.Future] = {}
+        self._misses: Dict[int, int] = {}
+        self._deadlines: Dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._block_number: Optional[int] = None
+        self._block_seen_at = 0.0
+        self._backoff = min_interval
+        self._failures = 0
+
+    @property
+    def pending(self) -> List[int]:
+        return list(self._futures)
+
+    def track(self, tx_hash: int) -> asyncio.Future:
+        """
+        Future resolved with the receipt of `tx_hash`.
+        """
+        future = self._futures.get(tx_hash)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._futures[tx_hash] = future
+            self._misses[tx_hash] = 0
+            self._deadlines[tx_hash] = time.monotonic() + self.timeout
+            self._backoff = self.min_interval
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return future
+
+    async def wait(self, tx_hash: int) -> TransactionReceipt:
+        return await self.track(tx_hash)
+
+    async def wait_many(self, tx_hashes: List[int]) -> List[TransactionReceipt]:
+        return await asyncio.gather(*(self.track(tx_hash) for tx_hash in tx_hashes))
+
+    async def close(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._misses.clear()
+        self._deadlines.clear()
+
+    async def _run(self) -> None:
+        while self._futures:
+            try:
+                await self._poll()
+                self._failures = 0
+            except Exception as e:
+                self._failures += 1
+                if self._failures >= self.max_failures:
+                    logger.error(f"⛔ Receipt polling failed {self._failures} times")
+                    self._fail_all(e)
+                    return
+                logger.warning(f"⚠️  Receipt polling failed ({e}), retrying")
+            if self._futures:
+                await asyncio.sleep(self._next_delay())
+
+    def _fail_all(self, error: BaseException) -> None:
+        for future in self._futures.values():
+            if not future.done():
+                future.set_exception(error)
+        self._futures.clear()
+        self._misses.clear()
+        self._deadlines.clear()
+
+    def _next_delay(self) -> float:
+        """
+        Sleep until the next block is due, or back off if it is late.
+        """
+        if self.block_time is not None:
+            until_next_block = self._block_seen_at + self.block_time - time.monotonic()
+            if until_next_block > self.min_interval:
+                return min(until_next_block, self.max_interval)
+        delay = self._backoff
+        self._backoff = min(self._backoff * 2, self.max_interval)
+        return delay
+
+    def _observe_block(self, block_number: int) -> None:
+        now = time.monotonic()
+        if self._block_number is not None and block_number > self._block_number:
+            sample = (now - self._block_seen_at) / (block_number - self._block_number)
+            self.block_time = (
+                sample
+                if self.block_time is None
+                else 0.8 * self.block_time + 0.2 * sample
+            )
+        if block_number != self._block_number:
+            self._block_number = block_number
+            self._block_seen_at = now
+            self._backoff = self.min_interval
+
+    async def _poll(self) -> None:
+        for tx_hash, future in list(self._futures.items()):
+            if future.done():
+                self._forget(tx_hash)
+        tx_hashes = self.pending
+        self.stats["polls"] += 1
+        await asyncio.gather(
+            *(
+                self._poll_chunk(tx_hashes[i : i + self.max_batch_size])
+                for i in range(0, len(tx_hashes), self.max_batch_size)
+            )
+        )
+
+    async def _poll_chunk(self, tx_hashes: List[int]) -> None:
+        status_checks = [
+            tx_hash
+            for tx_hash in tx_hashes
+            if self._misses[tx_hash] >= self.status_check_after
+        ]
+        requests: List[Tuple[str, Any]] = [("starknet_blockNumber", [])]
+        requests += [
+            ("starknet_getTransactionReceipt", {"transaction_hash": _to_rpc_felt(h)})
+            for h in tx_hashes
+        ]
+        requests += [
+            ("starknet_getTransactionStatus", {"transaction_hash": _to_rpc_felt(h)})
+            for h in status_checks
+        ]
+        results = await self._send(requests)
+
+        block_number, results = results[0], results[1:]
+        if not isinstance(block_number, BaseException):
+            self._observe_block(block_number)
+        receipts = dict(zip(tx_hashes, results[: len(tx_hashes)]))
+        statuses = dict(zip(status_checks, results[len(tx_hashes) :]))
+
+        for tx_hash, result in receipts.items():
+            if isinstance(result, ClientError) and is_not_found(result):
+                self._misses[tx_hash] += 1
+                status = statuses.get(tx_hash)
+                rejected = TransactionStatus.REJECTED.value
+                if (
+                    isinstance(status, dict)
+                    and status.get("finality_status") == rejected
+                ):
+                    self._resolve(tx_hash, TransactionRejectedError())
+                elif time.monotonic() > self._deadlines[tx_hash]:
+                    logger.warning(
+                        f"⚠️  No receipt for {hex(tx_hash)} after {self.timeout}s"
+                    )
+                    self._resolve(tx_hash, TransactionNotReceivedError())
+                continue
+            if isinstance(result, BaseException):
+                self._resolve(tx_hash, result)
+                continue
+
+            receipt = TransactionReceiptSchema().load(result)
+            if receipt.execution_status == TransactionExecutionStatus.REVERTED:
+                self._resolve(
+                    tx_hash, TransactionRevertedError(message=receipt.revert_reason)
+                )
+            else:
+                self._resolve(tx_hash, receipt)
+
+    async def _send(self, requests: List[Tuple[str, Any]]) -> list:
+        self.stats["requests"] += 1
+        if self.batch_supported:
+            try:
+                return await post_batch(self.client, requests)
+            except BatchRejectedError as e:
+                logger.warning(
+                    f"⚠️  {self.client.url} rejected a batch request ({e}), "
+                    "polling receipts one by one"
+                )
+                self.batch_supported = False
+
+        async def single(method, params):
+            return await self.client._client.call(
+                method_name=method.removeprefix("starknet_"), params=params
+            )
+
+        return await asyncio.gather(
+            *(single(method, params) for method, params in requests),
+            return_exceptions=True,
+        )
+
+    def _resolve(self, tx_hash: int, result) -> None:
+        future = self._futures.get(tx_hash)
+        if future is not None and not future.done():
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+        self._forget(tx_hash)
+        self._backoff = self.min_interval
+
+    def _forget(self, tx_hash: int) -> None:
+        self._futures.pop(tx_hash, None)
+        self._misses.pop(tx_hash, None)
+        self._deadlines.pop(tx_hash, None)
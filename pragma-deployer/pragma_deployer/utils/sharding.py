@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import logging
+
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from pragma_sdk.common.types.entry import Entry
+from pragma_sdk.onchain.client import PragmaOnChainClient
+
+from pragma_deployer.utils.constants import NETWORK
+from pragma_deployer.utils.data_keys import DataKey, get_data_key
+from pragma_deployer.utils.publisher import PublisherPipeline, get_publisher_client
+from pragma_deployer.utils.starknet import str_to_felt
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def get_shard_weight(data_key: DataKey, publisher: str) -> int:
+    digest = hashlib.blake2b(f"{data_key}:{publisher}".encode(), digest_size=8)
+    return int.from_bytes(digest.digest(), "big")
+
+
+class PublisherShard:
+    """
+    One publisher identity, with its own account and so its own nonce
+    sequence and publisher pipeline.
+    """
+
+    def __init__(self, publisher: str, pipeline: PublisherPipeline):
+        self.publisher = publisher
+        self.publisher_felt = str_to_felt(publisher)
+        self.pipeline = pipeline
+        self.data_keys = 0
+
+
+class ShardedPublisher:
+    """
+    Spreads publishing across several publisher identities registered in the
+    PublisherRegistry, each publishing from its own account, so transactions
+    are not serialized on a single nonce.
+
+    Each data key (pair, expiry or generic key) is owned by one shard,
+    picked by rendezvous hashing on the shard names: assignments are stable
+    across restarts and adding or removing a shard only moves the data keys
+    it gains or loses. A pair must not move between identities while its
+    previous entries are fresh, or the Oracle would aggregate both.
+    Entries are re-signed as the publisher of their shard, which must be
+    registered for the entry's source, see register-publisher-shards.
+    """
+
+    def __init__(self, clients: Dict[str, PragmaOnChainClient], **pipeline_kwargs):
+        if not clients:
+            raise ValueError("ShardedPublisher needs at least one shard")
+        self.shards = [
+            PublisherShard(publisher, PublisherPipeline(client, **pipeline_kwargs))
+            for publisher, client in clients.items()
+        ]
+        self._assignments: Dict[DataKey, PublisherShard] = {}
+
+    def get_shard(self, data_key: DataKey) -> PublisherShard:
+        shard = self._assignments.get(data_key)
+        if shard is None:
+            shard = max(
+                self.shards,
+                key=lambda shard: get_shard_weight(data_key, shard.publisher),
+            )
+            shard.data_keys += 1
+            self._assignments[data_key] = shard
+        return shard
+
+    async def start(self) -> "ShardedPublisher":
+        for shard in self.shards:
+            await shard.pipeline.start()
+        return self
+
+    async def put(self, entry: Entry) -> None:
+        await self.put_many([entry])
+
+    async def put_many(self, entries: List[Entry]) -> None:
+        """
+        Route `entries` to the pipeline of their shard.
+        """
+        by_shard: Dict[PublisherShard, List[Entry]] = defaultdict(list)
+        for entry in entries:
+            shard = self.get_shard(get_data_key(entry))
+            entry.base.publisher = shard.publisher_felt
+            by_shard[shard].append(entry)
+        await asyncio.gather(
+            *(
+                shard.pipeline.put_many(shard_entries)
+                for shard, shard_entries in by_shard.items()
+            )
+        )
+
+    async def close(self) -> None:
+        await asyncio.gather(*(shard.pipeline.close() for shard in self.shards))
+        logger.info(f"ℹ️  Sharded publisher closed:\n{self.summary()}")
+
+    async def __aenter__(self) -> "ShardedPublisher":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def throughput(self) -> float:
+        return sum(shard.pipeline.throughput for shard in self.shards)
+
+    @property
+    def load_imbalance(self) -> float:
+        """
+        Entries queued by the busiest shard over the mean, 1.0 when balanced.
+        """
+        loads = [shard.pipeline.stats["entries_queued"] for shard in self.shards]
+        mean = sum(loads) / len(loads)
+        return max(loads) / mean if mean else 1.0
+
+    def summary(self) -> str:
+        total = sum(shard.pipeline.stats["entries_queued"] for shard in self.shards)
+        lines = [
+            f"{shard.publisher}: {shard.data_keys} data keys, "
+            f"{shard.pipeline.stats['entries_queued'] / (total or 1):.0%} of the "
+            f"entries, {shard.pipeline.summary()}"
+            for shard in self.shards
+        ]
+        lines.append(
+            f"{len(self.shards)} shards, {self.throughput:.1f} entries/s, "
+            f"load imbalance {self.load_imbalance:.2f}"
+        )
+        return "\n".join(lines)
+
+
+def get_shard_clients(port: Optional[int] = None) -> Dict[str, PragmaOnChainClient]:
+    """
+    A publisher client per identity of $<NETWORK>_PUBLISHER_SHARDS.
+    """
+    return {
+        shard["publisher"]: get_publisher_client(
+            port=port,
+            account_address=shard["account_address"],
+            private_key=shard["private_key"],
+        )
+        for shard in NETWORK["publisher_shards"]
+    }
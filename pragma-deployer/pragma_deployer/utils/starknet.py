@@ -1,30 +1,50 @@
 # source : https://github.com/kkrt-labs/kakarot/blob/main/scripts/utils/starknet.py
 # adapted to work with cairo1 contracts
+import asyncio
 import json
 import logging
+import time
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import ClientSession, TCPConnector, TraceConfig
 from caseconverter import snakecase
 
 from starknet_py.hash.selector import get_selector_from_name
 from starknet_py.contract import Contract
 from starknet_py.net.account.account import Account
-from starknet_py.net.client_models import Call
+from starknet_py.net.client_models import Call, ResourceBoundsMapping
 from starknet_py.net.signer.stark_curve_signer import KeyPair
+from starknet_py.net.udc_deployer.deployer import Deployer
 from starknet_py.net.full_node_client import FullNodeClient
-from starknet_py.common import create_casm_class, create_sierra_compiled_contract
-from starknet_py.hash.casm_class_hash import compute_casm_class_hash
-from starknet_py.hash.sierra_class_hash import compute_sierra_class_hash
-
+from starknet_py.common import create_sierra_compiled_contract
+
+from pragma_deployer.utils.batch_rpc import BatchCaller
+from pragma_deployer.utils.cassette import record_from_env
+from pragma_deployer.utils.class_hash import (
+    ClassHashCache,
+    compute_class_hashes,
+    get_artifacts_digest,
+)
+from pragma_deployer.utils.endpoints import InstrumentedClient, MultiEndpointClient
+from pragma_deployer.utils.fees import FeeEstimator
+from pragma_deployer.utils.nonce import NonceManager
+from pragma_deployer.utils.receipts import ReceiptTracker
+from pragma_deployer.utils.store import DeploymentStore
 from pragma_deployer.utils.constants import (
     BUILD_DIR,
+    CLASS_HASH_CACHE_PATH,
     DEPLOYER_ROOT,
     # CONTRACTS,
     DEPLOYMENTS_DIR,
     ETH_TOKEN_ADDRESS,
+    MAX_BATCH_CALLDATA,
+    MAX_BATCH_L2_GAS,
     # MAX_FEE,
     NETWORK,
-    FULLNODE_CLIENT,
     # SOURCE_DIR,
 )
 
@@ -33,6 +53,9 @@ logging.basicConfig()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Number of parsed ABIs and Contract instances kept in memory.
+ABI_CACHE_SIZE = 64
+
 
 def int_to_uint256(value):
     value = int(value)
@@ -49,8 +72,172 @@ def str_to_felt(text):
     return int.from_bytes(b_text, "big")
 
 
+class ClientPool:
+    """
+    Process-wide registry of RPC clients and accounts.
+
+    All clients share a single keep-alive aiohttp session so connections are
+    pooled across calls, and accounts are keyed by (network, port, address) so
+    key derivation only happens once per process.
+    The pool must be closed from the event loop that used it, see
+    `with_client_pool`.
+    """
+
+    def __init__(
+        self,
+        limit_per_host: int = 16,
+        keepalive_timeout: float = 30.0,
+        max_in_flight: int = 16,
+    ):
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.max_in_flight = max_in_flight
+        self._session: Optional[ClientSession] = None
+        self._clients: Dict[Tuple[str, Optional[int]], FullNodeClient] = {}
+        self._accounts: Dict[Tuple[str, Optional[int], int], Account] = {}
+        self._nonce_managers: Dict[Account, NonceManager] = {}
+        self._batch_callers: Dict[FullNodeClient, BatchCaller] = {}
+        self._fee_estimators: Dict[Account, FeeEstimator] = {}
+        self._receipt_trackers: Dict[FullNodeClient, ReceiptTracker] = {}
+        self.stats = {"created": 0, "reused": 0}
+
+    def _trace_config(self) -> TraceConfig:
+        async def on_create(session, ctx, params):
+            self.stats["created"] += 1
+
+        async def on_reuse(session, ctx, params):
+            self.stats["reused"] += 1
+
+        trace_config = TraceConfig()
+        trace_config.on_connection_create_end.append(on_create)
+        trace_config.on_connection_reuseconn.append(on_reuse)
+        return trace_config
+
+    @property
+    def session(self) -> ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = ClientSession(
+                connector=TCPConnector(
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                ),
+                trace_configs=[self._trace_config()],
+            )
+        return self._session
+
+    def get_client(self, port: Optional[int] = None) -> FullNodeClient:
+        key = (NETWORK["name"], port)
+        if key not in self._clients:
+            if port is None:
+                self._clients[key] = MultiEndpointClient(
+                    node_urls=NETWORK["rpc_urls"],
+                    session=self.session,
+                    rate_limit=NETWORK["rpc_rate_limit"],
+                )
+            else:
+                self._clients[key] = InstrumentedClient(
+                    node_url=f"http://127.0.0.1:{port}/rpc", session=self.session
+                )
+        return self._clients[key]
+
+    def get_account(
+        self, address: int, private_key: int, port: Optional[int] = None
+    ) -> Account:
+        key = (NETWORK["name"], port, address)
+        account = self._accounts.get(key)
+        if account is None or account.signer.private_key != private_key:
+            account = Account(
+                address=address,
+                client=self.get_client(port=port),
+                chain=NETWORK["chain_id"],
+                key_pair=KeyPair.from_private_key(private_key),
+            )
+            self._accounts[key] = account
+        return account
+
+    def get_batch_caller(self, client: FullNodeClient) -> BatchCaller:
+        if client not in self._batch_callers:
+            self._batch_callers[client] = BatchCaller(client)
+        return self._batch_callers[client]
+
+    def get_receipt_tracker(self, client: FullNodeClient) -> ReceiptTracker:
+        if client not in self._receipt_trackers:
+            self._receipt_trackers[client] = ReceiptTracker(client)
+        return self._receipt_trackers[client]
+
+    def get_nonce_manager(self, account: Account) -> NonceManager:
+        if account not in self._nonce_managers:
+            self._nonce_managers[account] = NonceManager(
+                account,
+                max_in_flight=self.max_in_flight,
+                receipt_tracker=self.get_receipt_tracker(account.client),
+            )
+        return self._nonce_managers[account]
+
+    def get_fee_estimator(self, account: Account) -> FeeEstimator:
+        if account not in self._fee_estimators:
+            self._fee_estimators[account] = FeeEstimator(account)
+        return self._fee_estimators[account]
+
+    async def wait_all(self) -> None:
+        """
+        Wait for every transaction still in flight on any pooled account.
+        """
+        for nonce_manager in self._nonce_managers.values():
+            await nonce_manager.wait_all()
+
+    async def close(self) -> None:
+        """
+        Close the shared session and forget every client and account bound to it.
+        """
+        for receipt_tracker in self._receipt_trackers.values():
+            await receipt_tracker.close()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info(
+                f"ℹ️  RPC connections: {self.stats['created']} created, "
+                f"{self.stats['reused']} reused"
+            )
+        for client in self._clients.values():
+            if isinstance(client, MultiEndpointClient):
+                client.log_stats()
+        self._session = None
+        self._clients.clear()
+        self._accounts.clear()
+        self._nonce_managers.clear()
+        self._batch_callers.clear()
+        self._fee_estimators.clear()
+        self._receipt_trackers.clear()
+        invalidate_contract_cache()
+
+    async def __aenter__(self) -> "ClientPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+CLIENT_POOL = ClientPool()
+
+
+async def with_client_pool(coro):
+    """
+    Run `coro`, wait for the transactions it left in flight and close the
+    shared client pool. RPC interactions are recorded to $RPC_RECORD if set.
+    """
+    record_from_env()
+    async with CLIENT_POOL:
+        result = await coro
+        await CLIENT_POOL.wait_all()
+        return result
+
+
 def get_devnet_fullnode_client(port):
-    return FullNodeClient(node_url=f"http://127.0.0.1:{port}/rpc")
+    return CLIENT_POOL.get_client(port=port)
+
+
+def get_fullnode_client(port=None) -> FullNodeClient:
+    return CLIENT_POOL.get_client(port=port)
 
 
 async def get_starknet_account(address=None, private_key=None, port=None) -> Account:
@@ -66,84 +253,61 @@ async def get_starknet_account(address=None, private_key=None, port=None) -> Acc
         raise ValueError(
             "private_key was not given in arg nor in env variable, see README.md#Deploy"
         )
-    key_pair = KeyPair.from_private_key(int(private_key, 16))
-    if port is None:
-        return Account(
-            address=address,
-            client=FULLNODE_CLIENT,
-            chain=NETWORK["chain_id"],
-            key_pair=key_pair,
-        )
-    else:
-        return Account(
-            address=address,
-            client=get_devnet_fullnode_client(port=port),
-            chain=NETWORK["chain_id"],
-            key_pair=key_pair,
-        )
+    return CLIENT_POOL.get_account(address, int(private_key, 16), port=port)
+
+
+async def get_nonce_manager(port=None) -> NonceManager:
+    return CLIENT_POOL.get_nonce_manager(await get_starknet_account(port=port))
 
 
 async def get_eth_contract(port=None) -> Contract:
     erc_20_path = DEPLOYER_ROOT / "pragma_deployer" / "utils" / "erc20.json"
-    return Contract(
+    return get_cached_contract(
+        erc_20_path,
         ETH_TOKEN_ADDRESS,
-        json.loads(erc_20_path.read_text())["abi"],
         await get_starknet_account(port=port),
         cairo_version=0,
     )
 
 
 async def get_contract(contract_name, port=None) -> Contract:
-    return Contract(
-        get_deployments()[contract_name]["address"],
-        json.loads(get_artifact(contract_name).read_text())["abi"],
+    return get_cached_contract(
+        get_artifact(contract_name),
+        get_deployed_address(contract_name),
         await get_starknet_account(port=port),
         cairo_version=0,
     )
 
 
-def dump_declarations(declarations):
-    json.dump(
-        {name: hex(class_hash) for name, class_hash in declarations.items()},
-        open(DEPLOYMENTS_DIR / "declarations.json", "w"),
-        indent=2,
-    )
+DEPLOYMENT_STORE = DeploymentStore(DEPLOYMENTS_DIR)
+
+
+def dump_declarations(declarations, merge=False):
+    DEPLOYMENT_STORE.dump_declarations(declarations, merge=merge)
+
+
+def update_declarations(declarations):
+    DEPLOYMENT_STORE.update_declarations(declarations)
 
 
 def get_declarations():
-    return {
-        name: int(class_hash, 16)
-        for name, class_hash in json.load(
-            open(DEPLOYMENTS_DIR / "declarations.json")
-        ).items()
-    }
-
-
-def dump_deployments(deployments):
-    json.dump(
-        {
-            name: {
-                **deployment,
-                "address": (
-                    hex(deployment["address"])
-                    if isinstance(deployment["address"], int)
-                    else deployment["address"]
-                ),
-                "tx": (
-                    hex(deployment["tx"])
-                    if isinstance(deployment["tx"], int)
-                    else deployment["tx"]
-                ),
-            }
-            for name, deployment in deployments.items()
-        },
-        open(DEPLOYMENTS_DIR / "deployments.json", "w"),
-        indent=2,
-    )
+    return DEPLOYMENT_STORE.get_declarations()
+
+
+def dump_deployments(deployments, merge=False):
+    DEPLOYMENT_STORE.dump_deployments(deployments, merge=merge)
+
+
+def update_deployments(deployments):
+    DEPLOYMENT_STORE.update_deployments(deployments)
 
 
 def get_deployments():
-    return json.load(open(DEPLOYMENTS_DIR / "deployments.json", "r"))
+    return DEPLOYMENT_STORE.get_deployments()
+
+
+def get_deployed_address(contract_name) -> int:
+    return DEPLOYMENT_STORE.get_address(contract_name)
 
 
 def get_artifact(contract_name):
@@ -166,7 +330,29 @@ def get_casm_artifact(contract_name):
     return BUILD_DIR / f"{contract_name}.casm.json"
 
 
+CLASS_HASH_CACHE = ClassHashCache(CLASS_HASH_CACHE_PATH)
+
+
+def get_artifacts_digest_of(contract_name) -> str:
+    return get_artifacts_digest(
+        get_sierra_artifact(contract_name), get_casm_artifact(contract_name)
+    )
+
+
+def get_declared_network(port=None) -> Optional[str]:
+    """
+    Network name under which declarations are cached, None for local devnets
+    since their state does not outlive the node.
+    """
+    if port is not None or NETWORK["name"] == "devnet":
+        return None
+    return NETWORK["name"]
+
+
 def get_abi(contract_name):
+    cached = CLASS_HASH_CACHE.get(get_artifacts_digest_of(contract_name))
+    if cached is not None:
+        return cached[2]
     sierra_artifact = get_sierra_artifact(contract_name)
     contract_compiled_sierra = Path(sierra_artifact).read_text()
     return create_sierra_compiled_contract(
@@ -174,109 +360,383 @@ def get_abi(contract_name):
     ).abi
 
 
-async def declare_v3(contract_name, port=None):
-    logger.info(f"ℹ️  Declaring {contract_name}")
+def get_artifact_version(artifact) -> Tuple[int, int]:
+    stat = Path(artifact).stat()
+    return stat.st_mtime_ns, stat.st_size
 
-    # contract_compiled_casm is a string containing the content of the starknet-sierra-compile (.casm file)
-    casm_artifact = get_casm_artifact(contract_name)
-    contract_compiled_casm = Path(casm_artifact).read_text()
-    casm_class = create_casm_class(contract_compiled_casm)
-    casm_class_hash = compute_casm_class_hash(casm_class)
 
-    # get sierra artifact
-    sierra_artifact = get_sierra_artifact(contract_name)
-    contract_compiled_sierra = Path(sierra_artifact).read_text()
-    sierra_class = create_sierra_compiled_contract(contract_compiled_sierra)
-    sierra_class_hash = compute_sierra_class_hash(sierra_class)
-    # Check has not been declared before
-    fullnode_client = (
-        FULLNODE_CLIENT if port is None else get_devnet_fullnode_client(port=port)
+@lru_cache(maxsize=ABI_CACHE_SIZE)
+def _load_abi(artifact, artifact_version) -> list:
+    artifact = Path(artifact)
+    if artifact.name.endswith(".sierra.json"):
+        contract_name = artifact.name.removesuffix(".sierra.json")
+        return json.loads(get_abi(contract_name))
+    return json.loads(artifact.read_text())["abi"]
+
+
+@lru_cache(maxsize=ABI_CACHE_SIZE)
+def _build_contract(
+    artifact, artifact_version, address: int, account: Account, cairo_version: int
+) -> Contract:
+    return Contract(
+        address,
+        _load_abi(artifact, artifact_version),
+        account,
+        cairo_version=cairo_version,
     )
-    try:
-        await fullnode_client.get_class_by_hash(class_hash=sierra_class_hash)
-        logger.info("✅ Class already declared, skipping")
-        return sierra_class_hash
-    except Exception:
-        pass
-
-    # Create Declare v3 transaction
-    account = await get_starknet_account(port=port)
-    sign_declare_v3 = await account.sign_declare_v3(
-        compiled_contract=contract_compiled_sierra,
-        compiled_class_hash=casm_class_hash,
-        auto_estimate=True,
+
+
+def get_cached_contract(
+    artifact, address, account: Account, cairo_version: int = 1
+) -> Contract:
+    """
+    Contract instance for `address` built from the ABI in `artifact`.
+
+    Parsed ABIs and Contract objects are memoized in LRU caches keyed by the
+    artifact path and its (mtime, size), the address and the account, so a
+    rebuilt artifact is picked up without explicit invalidation.
+    """
+    address = int(address, 16) if isinstance(address, str) else address
+    return _build_contract(
+        artifact, get_artifact_version(artifact), address, account, cairo_version
     )
 
-    # Send Declare v3 transaction
-    resp = await account.client.declare(transaction=sign_declare_v3)
 
-    logger.info(
-        f"✅ {contract_name} class hash {hex(resp.class_hash)} at tx {hex(resp.transaction_hash)}"
+def invalidate_contract_cache() -> None:
+    _load_abi.cache_clear()
+    _build_contract.cache_clear()
+
+
+async def declare_many(contract_names, port=None, max_workers=None) -> Dict[str, int]:
+    """
+    Declare `contract_names` and return their Sierra class hashes.
+
+    Class hashes come from the on-disk class hash cache when the artifacts are
+    unchanged and are otherwise computed in a process pool. Existence probes
+    run concurrently for classes not already known to be declared, and the
+    missing classes are declared back-to-back with pipelined nonces.
+    Per-contract timings are logged once every declaration is accepted.
+    """
+    loop = asyncio.get_running_loop()
+    client = get_fullnode_client(port=port)
+    network = get_declared_network(port=port)
+    timings = {name: {} for name in contract_names}
+    digests = {name: get_artifacts_digest_of(name) for name in contract_names}
+
+    async def compute(executor, contract_name):
+        start = time.perf_counter()
+        class_info = await loop.run_in_executor(
+            executor,
+            compute_class_hashes,
+            get_sierra_artifact(contract_name),
+            get_casm_artifact(contract_name),
+        )
+        CLASS_HASH_CACHE.put(digests[contract_name], *class_info)
+        timings[contract_name]["hash"] = time.perf_counter() - start
+
+    misses = [
+        name for name in contract_names if CLASS_HASH_CACHE.get(digests[name]) is None
+    ]
+    if misses:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            await asyncio.gather(*(compute(executor, name) for name in misses))
+
+    async def is_declared(contract_name, sierra_class_hash):
+        if network is not None and CLASS_HASH_CACHE.is_declared(
+            digests[contract_name], network
+        ):
+            return True
+        start = time.perf_counter()
+        try:
+            await client.get_class_by_hash(class_hash=sierra_class_hash)
+            declared = True
+        except Exception:
+            declared = False
+        timings[contract_name]["probe"] = time.perf_counter() - start
+        return declared
+
+    class_hashes = {}
+    casm_class_hashes = {}
+    for contract_name in contract_names:
+        sierra_class_hash, casm_class_hash, _ = CLASS_HASH_CACHE.get(
+            digests[contract_name]
+        )
+        class_hashes[contract_name] = sierra_class_hash
+        casm_class_hashes[contract_name] = casm_class_hash
+    declared = await asyncio.gather(
+        *(is_declared(name, class_hashes[name]) for name in contract_names)
+    )
+
+    nonce_manager = await get_nonce_manager(port=port)
+    fee_estimator = CLIENT_POOL.get_fee_estimator(nonce_manager.account)
+    to_declare = []
+    for contract_name, is_already_declared in zip(contract_names, declared):
+        if is_already_declared:
+            logger.info(f"✅ {contract_name} already declared, skipping")
+        else:
+            to_declare.append(contract_name)
+
+    sierra_texts = {name: get_sierra_artifact(name).read_text() for name in to_declare}
+    estimates = []
+    if to_declare:
+        # Every missing declaration is estimated in a single request
+        start = time.perf_counter()
+        nonce = await nonce_manager.current()
+        estimates = await fee_estimator.estimate_transactions(
+            [
+                await nonce_manager.account.sign_declare_v3(
+                    compiled_contract=sierra_texts[contract_name],
+                    compiled_class_hash=casm_class_hashes[contract_name],
+                    nonce=nonce + offset,
+                    resource_bounds=ResourceBoundsMapping.init_with_zeros(),
+                )
+                for offset, contract_name in enumerate(to_declare)
+            ]
+        )
+        elapsed = time.perf_counter() - start
+        for contract_name in to_declare:
+            timings[contract_name]["estimate"] = elapsed
+
+    tx_hashes = {}
+    for contract_name, estimated_fee in zip(to_declare, estimates):
+        logger.info(f"ℹ️  Declaring {contract_name}")
+        start = time.perf_counter()
+        tx_hashes[contract_name] = await nonce_manager.declare(
+            sierra_texts[contract_name],
+            casm_class_hashes[contract_name],
+            resource_bounds=fee_estimator.to_resource_bounds(estimated_fee),
+        )
+        timings[contract_name]["declare"] = time.perf_counter() - start
+        logger.info(
+            f"✅ {contract_name} class hash {hex(class_hashes[contract_name])} at tx {hex(tx_hashes[contract_name])}"
+        )
+
+    async def wait_for_inclusion(contract_name, tx_hash):
+        start = time.perf_counter()
+        await nonce_manager.wait(tx_hash)
+        timings[contract_name]["inclusion"] = time.perf_counter() - start
+
+    await asyncio.gather(
+        *(wait_for_inclusion(name, tx_hash) for name, tx_hash in tx_hashes.items())
     )
-    return resp.class_hash
+
+    if network is not None:
+        for contract_name in contract_names:
+            CLASS_HASH_CACHE.mark_declared(digests[contract_name], network)
+    CLASS_HASH_CACHE.save()
+
+    for contract_name, stages in timings.items():
+        summary = ", ".join(
+            f"{stage} {seconds:.2f}s" for stage, seconds in stages.items()
+        )
+        logger.info(f"⏱️  {contract_name}: {summary or 'cached'}")
+    return class_hashes
+
+
+async def declare_v3(contract_name, port=None):
+    return (await declare_many([contract_name], port=port))[contract_name]
 
 
 async def deploy_v2(contract_name, *args, port=None):
     logger.info(f"ℹ️  Deploying {contract_name}")
 
-    account = await get_starknet_account(port=port)
+    nonce_manager = await get_nonce_manager(port=port)
+    account = nonce_manager.account
+    fee_estimator = CLIENT_POOL.get_fee_estimator(account)
 
-    sierra_class_hash = get_declarations()[contract_name]
+    sierra_class_hash = DEPLOYMENT_STORE.declarations[contract_name]
     abi = get_abi(contract_name)
 
-    deploy_result = await Contract.deploy_contract_v1(
-        account=account,
+    call, address = Deployer(
+        account_address=account.address
+    ).create_contract_deployment(
         class_hash=sierra_class_hash,
         abi=json.loads(abi),
-        constructor_args=list(args),
         cairo_version=1,
+        calldata=list(args),
+    )
+    (resource_bounds,) = await fee_estimator.resource_bounds(
+        [[call]], await nonce_manager.current()
     )
+    tx_hash = await nonce_manager.execute(call, resource_bounds=resource_bounds)
 
-    logger.info(f"Transaction hash: {hex(deploy_result.hash)}")
+    logger.info(f"Transaction hash: {hex(tx_hash)}")
 
-    await deploy_result.wait_for_acceptance()
+    await nonce_manager.wait(tx_hash)
 
-    logger.info(
-        f"✅ {contract_name} deployed at: {hex(deploy_result.deployed_contract.address)}"
-    )
+    logger.info(f"✅ {contract_name} deployed at: {hex(address)}")
 
-    return {
-        "address": deploy_result.deployed_contract.address,
-        "tx": deploy_result.hash,
-    }
+    return {"address": address, "tx": tx_hash}
 
 
-async def invoke(contract_name, function_name, inputs, address=None, port=None):
-    account = await get_starknet_account(port=port)
-    deployments = get_deployments()
-    call = Call(
+def build_call(contract_name, function_name, inputs, address=None) -> Call:
+    return Call(
         to_addr=(
-            int(deployments[contract_name]["address"], 16)
+            get_deployed_address(contract_name)
             if address is None
             else address
         ),
         selector=get_selector_from_name(function_name),
-        calldata=inputs,
+        calldata=list(inputs),
     )
+
+
+async def invoke(
+    contract_name, function_name, inputs, address=None, port=None, wait=True
+):
+    nonce_manager = await get_nonce_manager(port=port)
+    fee_estimator = CLIENT_POOL.get_fee_estimator(nonce_manager.account)
+    call = build_call(contract_name, function_name, inputs, address=address)
     logger.info(f"ℹ️  Invoking {contract_name}.{function_name}")
-    response = await account.execute_v3(
-        calls=call,
-        auto_estimate=True,
+    (resource_bounds,) = await fee_estimator.resource_bounds(
+        [[call]], await nonce_manager.current()
     )
+    tx_hash = await nonce_manager.execute(call, resource_bounds=resource_bounds)
     logger.info(
         f"✅ {contract_name}.{function_name} invoked at tx: %s",
-        hex(response.transaction_hash),
+        hex(tx_hash),
     )
-    await account.client.wait_for_tx(response.transaction_hash)
-    return response.transaction_hash
+    if wait:
+        await nonce_manager.wait(tx_hash)
+    return tx_hash
+
+
+def get_multicall_calldata_size(calls: List[Call]) -> int:
+    """
+    Number of felts taken by `calls` once wrapped in the account's __execute__
+    calldata: the calls length, then (to, selector, calldata_len, *calldata)
+    for each call.
+    """
+    return 1 + sum(3 + len(call.calldata) for call in calls)
+
+
+def split_calls(
+    calls: List[Call],
+    batch_size: Optional[int] = None,
+    max_calldata: int = MAX_BATCH_CALLDATA,
+) -> List[List[Call]]:
+    """
+    Greedily pack `calls` in order into batches holding at most `batch_size`
+    calls and `max_calldata` felts of __execute__ calldata.
+    """
+    batches = []
+    batch = []
+    for call in calls:
+        candidate = batch + [call]
+        if batch and (
+            (batch_size is not None and len(candidate) > batch_size)
+            or get_multicall_calldata_size(candidate) > max_calldata
+        ):
+            batches.append(batch)
+            candidate = [call]
+        batch = candidate
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+async def _fit_l2_gas(
+    fee_estimator: FeeEstimator,
+    batches: List[List[Call]],
+    nonce: int,
+    max_l2_gas: int,
+) -> Tuple[List[List[Call]], list]:
+    """
+    Bisect the batches whose estimate is above `max_l2_gas`, keeping call order,
+    until every batch fits. Each round is a single estimate request.
+    """
+    while True:
+        estimates = await fee_estimator.estimate(batches, nonce)
+        fitted = []
+        for batch, estimated_fee in zip(batches, estimates):
+            if estimated_fee.l2_gas_consumed <= max_l2_gas:
+                fitted.append(batch)
+            elif len(batch) > 1:
+                half = len(batch) // 2
+                logger.info(
+                    f"ℹ️  Batch of {len(batch)} calls needs "
+                    f"{estimated_fee.l2_gas_consumed} L2 gas, splitting it"
+                )
+                fitted.extend([batch[:half], batch[half:]])
+            else:
+                logger.warning(
+                    f"⚠️  Single call needs {estimated_fee.l2_gas_consumed} "
+                    f"L2 gas, above the {max_l2_gas} budget"
+                )
+                fitted.append(batch)
+        if len(fitted) == len(batches):
+            return batches, estimates
+        batches = fitted
+
+
+async def invoke_many(
+    calls: List[Call],
+    batch_size: Optional[int] = None,
+    max_calldata: int = MAX_BATCH_CALLDATA,
+    max_l2_gas: int = MAX_BATCH_L2_GAS,
+    port=None,
+    wait=True,
+) -> List[int]:
+    """
+    Send `calls` as few multicall transactions as possible.
+
+    Batches are first packed against `batch_size` and the `max_calldata` felt
+    budget, then fee-estimated together in one request and bisected until they
+    fit `max_l2_gas`. Estimates are cached per multicall shape, see
+    `FeeEstimator`, and reused as the transaction resource bounds.
+    Batches are sent back-to-back with locally assigned nonces; when `wait` is
+    set their receipts are awaited concurrently once all of them are sent.
+    Returns the hash of every transaction sent, in order.
+    """
+    if not calls:
+        return []
+
+    nonce_manager = await get_nonce_manager(port=port)
+    fee_estimator = CLIENT_POOL.get_fee_estimator(nonce_manager.account)
+    batches, estimates = await _fit_l2_gas(
+        fee_estimator,
+        split_calls(calls, batch_size=batch_size, max_calldata=max_calldata),
+        await nonce_manager.current(),
+        max_l2_gas,
+    )
+    logger.info(f"ℹ️  Invoking {len(calls)} calls in {len(batches)} batch(es)")
+
+    prices = await fee_estimator.gas_prices()
+    tx_hashes = []
+    for batch, estimated_fee in zip(batches, estimates):
+        tx_hash = await nonce_manager.execute(
+            batch,
+            resource_bounds=fee_estimator.to_resource_bounds(estimated_fee, prices),
+        )
+        logger.info(
+            f"✅ Multicall of {len(batch)} calls invoked at tx: %s", hex(tx_hash)
+        )
+        tx_hashes.append(tx_hash)
+    if wait:
+        await asyncio.gather(*(nonce_manager.wait(tx_hash) for tx_hash in tx_hashes))
+    return tx_hashes
+
 
 async def call(contract_name, function_name, *inputs, address=None, port=None):
-    deployments = get_deployments()
+    """
+    Call a view function. Calls issued concurrently (e.g. under one
+    `asyncio.gather`) are sent together as JSON-RPC batch requests.
+    """
     account = await get_starknet_account(port=port)
-    contract = Contract(
-        deployments[contract_name]["address"] if address is None else address,
-        json.loads(get_abi(contract_name=contract_name)),
+    contract = get_cached_contract(
+        get_sierra_artifact(contract_name),
+        get_deployed_address(contract_name) if address is None else address,
         account,
         cairo_version=1,
     )
-    return await contract.functions[function_name].call(*inputs)
+    prepared_call = contract.functions[function_name].prepare_call(*inputs)
+    result = await CLIENT_POOL.get_batch_caller(account.client).call(prepared_call)
+    return prepared_call._payload_transformer.deserialize(result)
+
+
+async def call_many(requests, port=None) -> list:
+    """
+    Run every (contract_name, function_name, *inputs) view call in `requests`
+    in as few round trips as the node allows, results are returned in order.
+    """
+    return await asyncio.gather(*(call(*request, port=port) for request in requests))
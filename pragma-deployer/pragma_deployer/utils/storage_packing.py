@@ -0,0 +1,242 @@
+from typing import Tuple, Union
+
+import numpy as np
+
+# Constants of src/entry/structs.cairo
+FELT_PRIME = 2**251 + 17 * 2**192 + 1
+MAX_FELT = FELT_PRIME - 1
+TIMESTAMP_SHIFT_U32 = 2**32
+TIMESTAMP_SHIFT_MASK_U32 = 2**32 - 1
+VOLUME_SHIFT_U132 = 2**132
+VOLUME_SHIFT_MASK_U100 = 2**100 - 1
+PRICE_SHIFT_MASK_U120 = 2**120 - 1
+CHECKPOINT_TIMESTAMP_SHIFT_U32 = 2**32
+CHECKPOINT_VALUE_SHIFT_U160 = 2**160
+CHECKPOINT_AGGREGATION_MODE_SHIFT_U172 = 2**172
+
+# Checkpoint aggregation modes as packed, any other u8 unpacks to Error
+MEDIAN, MEAN, CONVERSION_RATE = 0, 1, 2
+
+U64_MASK = 2**64 - 1
+PRIME_LIMBS = tuple((FELT_PRIME >> shift) & U64_MASK for shift in (192, 128, 64, 0))
+MAX_FELT_LIMBS = np.array(
+    [(MAX_FELT >> shift) & U64_MASK for shift in (192, 128, 64, 0)], dtype=np.uint64
+)
+
+Felts = Union[bytes, bytearray, memoryview, np.ndarray, list]
+
+
+def to_limbs(felts: Felts) -> np.ndarray:
+    """
+    Felts as an (n, 4) uint64 array of 64 bit limbs, most significant first,
+    from 32 byte big-endian words (bytes or a uint8 array, as storage proofs
+    and raw reads return them) or from ints.
+    """
+    if isinstance(felts, np.ndarray) and felts.dtype == np.uint8:
+        felts = np.ascontiguousarray(felts).tobytes()
+    if isinstance(felts, (bytes, bytearray, memoryview)):
+        if len(felts) % 32:
+            raise ValueError("Felts must be 32 bytes each")
+        return np.frombuffer(felts, dtype=">u8").reshape(-1, 4).astype(np.uint64)
+    felts = np.asarray(felts, dtype=object).reshape(-1)
+    if felts.size and (felts.min() < 0 or felts.max() >= FELT_PRIME):
+        raise ValueError("Felts must be in [0, P)")
+    return np.stack(
+        [
+            ((felts >> shift) & U64_MASK).astype(np.uint64)
+            for shift in (192, 128, 64, 0)
+        ],
+        axis=1,
+    )
+
+
+def from_limbs(limbs: np.ndarray) -> np.ndarray:
+    """
+    The felts of `to_limbs` limbs, as an object array of ints.
+    """
+    felts = np.zeros(len(limbs), dtype=object)
+    for i in range(4):
+        felts = (felts << 64) | limbs[:, i].astype(object)
+    return felts
+
+
+def to_bytes(felts: Felts) -> bytes:
+    """
+    Felts as consecutive 32 byte big-endian words.
+    """
+    return to_limbs(felts).astype(">u8").tobytes()
+
+
+def _get_bits(limbs: np.ndarray, offset: int, width: int) -> np.ndarray:
+    # Bits [offset, offset + width) of each felt, width <= 64
+    index, shift = divmod(offset, 64)
+    bits = limbs[:, 3 - index] >> np.uint64(shift)
+    if shift and index < 3:
+        bits |= limbs[:, 2 - index] << np.uint64(64 - shift)
+    if width < 64:
+        bits &= np.uint64(2**width - 1)
+    return bits
+
+
+def _get_field(limbs: np.ndarray, offset: int, width: int) -> np.ndarray:
+    # Up to 128 bits, as uint64 when they all fit and Python ints otherwise
+    low = _get_bits(limbs, offset, min(width, 64))
+    if width <= 64:
+        return low
+    high = _get_bits(limbs, offset + 64, width - 64)
+    if not high.any():
+        return low
+    return low.astype(object) | (high.astype(object) << 64)
+
+
+def _to_words(values, bits: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Values checked to fit the Cairo type they come from, as their low and
+    # high 64 bit words
+    if not isinstance(values, np.ndarray):
+        # Lists of ints above 2**63 would otherwise become floats
+        values = np.asarray(values, dtype=object)
+    values = values.reshape(-1)
+    if values.dtype.kind in "iu":
+        if values.size and (values.min() < 0 or int(values.max()) >= 2**bits):
+            raise ValueError(f"Values must fit in a u{bits}")
+        return values.astype(np.uint64), np.zeros(len(values), dtype=np.uint64)
+    values = values.astype(object)
+    if values.size and (values.min() < 0 or values.max() >= 2**bits):
+        raise ValueError(f"Values must fit in a u{bits}")
+    return (values & U64_MASK).astype(np.uint64), (values >> 64).astype(np.uint64)
+
+
+def _add_at(limbs: np.ndarray, offset: int, words: np.ndarray) -> None:
+    # limbs += words << offset, carrying across limbs; bits past 256 are lost
+    index, shift = divmod(offset, 64)
+    parts = [(index, words << np.uint64(shift))]
+    if shift and index < 3:
+        parts.append((index + 1, words >> np.uint64(64 - shift)))
+    for index, carry in parts:
+        for column in range(3 - index, -1, -1):
+            total = limbs[:, column] + carry
+            carry = (total < carry).astype(np.uint64)
+            limbs[:, column] = total
+            if not carry.any():
+                break
+
+
+def _reduce(limbs: np.ndarray) -> None:
+    # limbs % FELT_PRIME for sums below 2 * FELT_PRIME
+    over = (limbs[:, 0] > PRIME_LIMBS[0]) | (
+        (limbs[:, 0] == PRIME_LIMBS[0]) & limbs[:, 1:].any(axis=1)
+    )
+    if not over.any():
+        return
+    rows = limbs[over]
+    borrow = np.zeros(len(rows), dtype=np.uint64)
+    for column in range(3, -1, -1):
+        prime = np.uint64(PRIME_LIMBS[column])
+        words = rows[:, column].copy()
+        rows[:, column] = words - prime - borrow
+        borrow = ((words < prime) | ((words == prime) & (borrow > 0))).astype(np.uint64)
+    limbs[over] = rows
+
+
+def _to_felts(limbs: np.ndarray, as_bytes: bool):
+    if as_bytes:
+        return limbs.astype(">u8").tobytes()
+    return from_limbs(limbs)
+
+
+def pack_entries(timestamps, volumes, prices, as_bytes: bool = False):
+    """
+    `EntryStorePacking::pack` of every (timestamp, volume, price), as an
+    object array of felts, or as 32 byte words with `as_bytes`. The sum is
+    taken modulo the field prime like the felt252 arithmetic of the
+    contract, so only an exact MAX_FELT trips its last assertion.
+    """
+    timestamps, _ = _to_words(timestamps, 64)
+    volumes_low, volumes_high = _to_words(volumes, 128)
+    prices_low, prices_high = _to_words(prices, 128)
+    if np.any(timestamps > TIMESTAMP_SHIFT_MASK_U32):
+        raise ValueError("EntryStorePack:tmp too big")
+    if np.any(volumes_high >> np.uint64(VOLUME_SHIFT_MASK_U100.bit_length() - 64)):
+        raise ValueError("EntryStorePack:volume too big")
+    if np.any(prices_high >> np.uint64(PRICE_SHIFT_MASK_U120.bit_length() - 64)):
+        raise ValueError("EntryStorePack:price too big")
+    limbs = np.zeros((len(timestamps), 4), dtype=np.uint64)
+    _add_at(limbs, 0, timestamps)
+    _add_at(limbs, 32, volumes_low)
+    _add_at(limbs, 96, volumes_high)
+    _add_at(limbs, 132, prices_low)
+    _add_at(limbs, 196, prices_high)
+    _reduce(limbs)
+    if np.any((limbs == MAX_FELT_LIMBS).all(axis=1)):
+        raise ValueError("EntryStorePacking:tot too big")
+    return _to_felts(limbs, as_bytes)
+
+
+def unpack_entries(felts: Felts) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    `EntryStorePacking::unpack` of every felt: the timestamps, volumes and
+    prices columns, uint64 when they fit.
+    """
+    limbs = to_limbs(felts)
+    return (
+        _get_bits(limbs, 0, 32),
+        _get_field(limbs, 32, 100),
+        # The price is what is above the volume, at most 120 bits below P
+        _get_field(limbs, 132, 120),
+    )
+
+
+def pack_checkpoints(
+    timestamps,
+    values,
+    aggregation_modes,
+    num_sources_aggregated,
+    as_bytes: bool = False,
+):
+    """
+    `CheckpointStorePacking::pack` of every checkpoint, as an object array of
+    felts, or as 32 byte words with `as_bytes`. The contract asserts nothing
+    here: a timestamp above 32 bits carries into the value, as it does
+    on-chain.
+    """
+    timestamps, _ = _to_words(timestamps, 64)
+    values_low, values_high = _to_words(values, 128)
+    aggregation_modes, _ = _to_words(aggregation_modes, 8)
+    num_sources_aggregated, _ = _to_words(num_sources_aggregated, 32)
+    # AggregationMode::Error has no u8
+    if np.any(aggregation_modes > CONVERSION_RATE):
+        raise ValueError("Option::unwrap failed.")
+    # At most 205 bits, far below the prime
+    limbs = np.zeros((len(timestamps), 4), dtype=np.uint64)
+    _add_at(limbs, 0, timestamps)
+    _add_at(limbs, 32, values_low)
+    _add_at(limbs, 96, values_high)
+    _add_at(limbs, 160, aggregation_modes)
+    _add_at(limbs, 172, num_sources_aggregated)
+    return _to_felts(limbs, as_bytes)
+
+
+def unpack_checkpoints(
+    felts: Felts,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    `CheckpointStorePacking::unpack` of every felt: the timestamps, values,
+    aggregation modes and numbers of sources columns. Modes above
+    CONVERSION_RATE stand for AggregationMode::Error.
+    """
+    limbs = to_limbs(felts)
+    aggregation_modes = _get_bits(limbs, 160, 12)
+    num_sources_aggregated = _get_field(limbs, 172, 80)
+    # Unwrapped into a u8 and a u32
+    if (
+        np.any(aggregation_modes > 0xFF)
+        or num_sources_aggregated.dtype == object
+        or np.any(num_sources_aggregated > 0xFFFFFFFF)
+    ):
+        raise ValueError("Option::unwrap failed.")
+    return (
+        _get_bits(limbs, 0, 32),
+        _get_field(limbs, 32, 128),
+        aggregation_modes.astype(np.uint8),
+        num_sources_aggregated.astype(np.uint32),
+    )
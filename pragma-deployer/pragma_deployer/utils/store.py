@@ -0,0 +1,154 @@
+import copy
+import fcntl
+import json
+import os
+import tempfile
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def atomic_write_json(path: Path, data, **kwargs) -> None:
+    """
+    Write `data` as JSON to a temp file next to `path`, then rename it over
+    `path` so readers never observe a partial file.
+    """
+    path = Path(path)
+    path.parent.mkdir(exist_ok=True, parents=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, **kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class DeploymentStore:
+    """
+    In-memory view of `deployments.json` and `declarations.json` for a network.
+
+    Both files are parsed once and lookups are served from memory. Writes take
+    an exclusive lock on the directory and land atomically. `update_*` re-read
+    the file under the lock and only replace the given entries, so concurrent
+    scripts don't drop each other's entries; `dump_*` replace the whole file.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._deployments: Optional[dict] = None
+        self._declarations: Optional[Dict[str, int]] = None
+
+    @property
+    def deployments_path(self) -> Path:
+        return self.directory / "deployments.json"
+
+    @property
+    def declarations_path(self) -> Path:
+        return self.directory / "declarations.json"
+
+    @contextmanager
+    def locked(self):
+        self.directory.mkdir(exist_ok=True, parents=True)
+        with open(self.directory / ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_deployments(self) -> dict:
+        try:
+            return json.loads(self.deployments_path.read_text())
+        except FileNotFoundError:
+            return {}
+
+    def _read_declarations(self) -> Dict[str, int]:
+        try:
+            return {
+                name: int(class_hash, 16)
+                for name, class_hash in json.loads(
+                    self.declarations_path.read_text()
+                ).items()
+            }
+        except FileNotFoundError:
+            return {}
+
+    def reload(self) -> None:
+        self._deployments = None
+        self._declarations = None
+
+    @property
+    def deployments(self) -> dict:
+        if self._deployments is None:
+            self._deployments = self._read_deployments()
+        return self._deployments
+
+    @property
+    def declarations(self) -> Dict[str, int]:
+        if self._declarations is None:
+            self._declarations = self._read_declarations()
+        return self._declarations
+
+    def get_deployments(self) -> dict:
+        return copy.deepcopy(self.deployments)
+
+    def get_declarations(self) -> Dict[str, int]:
+        return dict(self.declarations)
+
+    def get_address(self, contract_name: str) -> int:
+        return int(self.deployments[contract_name]["address"], 16)
+
+    def dump_deployments(self, deployments: dict, merge: bool = False) -> None:
+        deployments = {
+            name: {
+                **deployment,
+                "address": (
+                    hex(deployment["address"])
+                    if isinstance(deployment["address"], int)
+                    else deployment["address"]
+                ),
+                "tx": (
+                    hex(deployment["tx"])
+                    if isinstance(deployment["tx"], int)
+                    else deployment["tx"]
+                ),
+            }
+            for name, deployment in deployments.items()
+        }
+        with self.locked():
+            if merge:
+                deployments = {**self._read_deployments(), **deployments}
+            atomic_write_json(self.deployments_path, deployments, indent=2)
+            self._deployments = deployments
+
+    def update_deployments(self, deployments: dict) -> None:
+        """
+        Write `deployments` over the same names in the file, keeping the
+        other entries as they are on disk.
+        """
+        self.dump_deployments(deployments, merge=True)
+
+    def dump_declarations(
+        self, declarations: Dict[str, int], merge: bool = False
+    ) -> None:
+        with self.locked():
+            if merge:
+                declarations = {**self._read_declarations(), **declarations}
+            atomic_write_json(
+                self.declarations_path,
+                {name: hex(class_hash) for name, class_hash in declarations.items()},
+                indent=2,
+            )
+            self._declarations = dict(declarations)
+
+    def update_declarations(self, declarations: Dict[str, int]) -> None:
+        """
+        Write `declarations` over the same names in the file, keeping the
+        other entries as they are on disk.
+        """
+        self.dump_declarations(declarations, merge=True)
@@ -0,0 +1,282 @@
+import asyncio
+import logging
+import time
+
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple, Union
+
+from pragma_sdk.common.types.entry import Entry
+from pragma_sdk.common.types.types import DataTypes
+from pragma_sdk.common.utils import felt_to_str
+
+from pragma_deployer.utils.metrics import (
+    AtExitExport,
+    ExportedMetrics,
+    Histogram,
+    percentile,
+)
+from pragma_deployer.utils.data_keys import DataKey, get_data_key, get_data_type
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Upper bounds in seconds of the stage latency histogram buckets.
+STAGE_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Intervals between the stamps of an entry: observed (the entry timestamp),
+# queued, signed, submitted, accepted on L2 and readable via get_data_median.
+STAGES = (
+    ("observe", "observed to queued"),
+    ("batch", "queued to signed: batching, fee estimation and signing"),
+    ("submit", "signed to submitted: the RPC round trip"),
+    ("include", "submitted to accepted on L2: block inclusion"),
+    ("read", "accepted to readable through get_data_median"),
+    ("total", "observed to readable, or to accepted when not probed"),
+)
+
+TRACES_OUT_ENV = "PUBLISH_TRACES_OUT"
+
+# Samples kept per stage for the percentiles of `summary`.
+SAMPLE_WINDOW = 10_000
+
+
+def get_pair_label(entry: Entry) -> str:
+    data_key = get_data_key(entry)
+    label = felt_to_str(data_key[1])
+    if entry.get_asset_type() == DataTypes.FUTURE:
+        label += f"@{data_key[2]}"
+    return label
+
+
+class FlushTrace:
+    """
+    Wall clock stamps of the entries of one pipeline flush. A flush sent as
+    several transactions is stamped when its last one is signed, submitted
+    and accepted.
+    """
+
+    def __init__(self, batch: List[Tuple[Entry, float]], account_address: int):
+        wall, monotonic = time.time(), time.monotonic()
+        self.account_address = account_address
+        self.entries = [entry for entry, _ in batch]
+        self.queued_at = [wall - (monotonic - queued_at) for _, queued_at in batch]
+        # (signed at, submitted at) of each transaction sent
+        self.sent: List[Tuple[float, float]] = []
+        self.signed_at: Optional[float] = None
+        self.submitted_at: Optional[float] = None
+        self.accepted_at: Optional[float] = None
+        self.readable_at: Dict[DataKey, float] = {}
+
+
+class PublishTracer(ExportedMetrics):
+    """
+    Per pair latency of every publishing stage, from the observation of a
+    price to its visibility in the Oracle's median.
+
+    `attach` hooks the signing and submission of a PragmaOnChainClient
+    account to stamp its transactions; PublisherPipeline stamps queuing and
+    acceptance. Once a flush is accepted, the median of each of its spot and
+    future pairs is polled every `readable_interval` seconds until its last
+    update reaches the published timestamp, for up to `readable_timeout`.
+    Entry timestamps have a one second resolution, so is the observe stage.
+    """
+
+    def __init__(self, readable_interval: float = 0.5, readable_timeout: float = 30.0):
+        self.readable_interval = readable_interval
+        self.readable_timeout = readable_timeout
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.samples: Dict[str, Deque[float]] = {
+            stage: deque(maxlen=SAMPLE_WINDOW) for stage, _ in STAGES
+        }
+        self.stats = {"flushes": 0, "entries": 0, "unreadable": 0}
+        # Account address -> flush being sent by that account
+        self._flushing: Dict[int, FlushTrace] = {}
+
+    def attach(self, client) -> None:
+        """
+        Stamp the transactions signed and sent by the account of `client`.
+        """
+        account = client.account
+        node_client = account.client
+        sign_invoke_v3 = account.sign_invoke_v3
+        send_transaction = node_client.send_transaction
+        # Fee estimates are signed too, the last signature before a send wins
+        last_signed_at = [0.0]
+
+        async def stamped_sign_invoke_v3(*args, **kwargs):
+            transaction = await sign_invoke_v3(*args, **kwargs)
+            last_signed_at[0] = time.time()
+            return transaction
+
+        async def stamped_send_transaction(transaction):
+            response = await send_transaction(transaction)
+            trace = self._flushing.get(account.address)
+            if trace is not None:
+                trace.sent.append((last_signed_at[0], time.time()))
+            return response
+
+        account.sign_invoke_v3 = stamped_sign_invoke_v3
+        node_client.send_transaction = stamped_send_transaction
+
+    def start(self, batch: List[Tuple[Entry, float]], client) -> FlushTrace:
+        """
+        Trace `batch`, whose transactions `client` sends next.
+        """
+        trace = FlushTrace(batch, client.account.address)
+        self._flushing[trace.account_address] = trace
+        return trace
+
+    def _close(self, trace: FlushTrace) -> None:
+        if self._flushing.get(trace.account_address) is trace:
+            del self._flushing[trace.account_address]
+
+    def submitted(self, trace: FlushTrace) -> None:
+        self._close(trace)
+        now = time.time()
+        trace.signed_at = max((signed_at for signed_at, _ in trace.sent), default=now)
+        trace.submitted_at = max(
+            (submitted_at for _, submitted_at in trace.sent), default=now
+        )
+
+    def failed(self, trace: FlushTrace) -> None:
+        """
+        Drop `trace`, whose flush was not submitted.
+        """
+        self._close(trace)
+
+    def accepted(self, trace: FlushTrace) -> None:
+        trace.accepted_at = time.time()
+
+    async def _probe(
+        self, oracle, data_key: DataKey, timestamp: int
+    ) -> Optional[float]:
+        """
+        When the median of `data_key` reflected `timestamp`, None if it never
+        did within `readable_timeout`.
+        """
+        deadline = time.monotonic() + self.readable_timeout
+        while True:
+            try:
+                (response,) = await oracle.functions["get_data_median"].call(
+                    get_data_type(data_key)
+                )
+            except Exception as e:
+                logger.debug(f"ℹ️  Median of {data_key} not readable: {e}")
+                return None
+            if response["last_updated_timestamp"] >= timestamp:
+                return time.time()
+            if time.monotonic() > deadline:
+                return None
+            await asyncio.sleep(self.readable_interval)
+
+    async def finish(self, trace: FlushTrace, oracle=None) -> None:
+        """
+        Probe when the entries of `trace` become readable through `oracle`,
+        if given, and record their stage latencies.
+        """
+        if oracle is not None:
+            latest: Dict[DataKey, int] = {}
+            for entry in trace.entries:
+                if entry.get_asset_type() == DataTypes.GENERIC:
+                    continue
+                data_key = get_data_key(entry)
+                latest[data_key] = max(latest.get(data_key, 0), entry.base.timestamp)
+            readable = await asyncio.gather(
+                *(
+                    self._probe(oracle, data_key, timestamp)
+                    for data_key, timestamp in latest.items()
+                )
+            )
+            for data_key, readable_at in zip(latest, readable):
+                if readable_at is None:
+                    self.stats["unreadable"] += 1
+                else:
+                    trace.readable_at[data_key] = readable_at
+        self.record(trace)
+
+    def _record(self, pair: str, stage: str, latency: float) -> None:
+        latency = max(latency, 0.0)
+        key = (pair, stage)
+        if key not in self.histograms:
+            self.histograms[key] = Histogram(STAGE_BUCKETS)
+        self.histograms[key].record(latency)
+        self.samples[stage].append(latency)
+
+    def record(self, trace: FlushTrace) -> None:
+        self.stats["flushes"] += 1
+        self.stats["entries"] += len(trace.entries)
+        for entry, queued_at in zip(trace.entries, trace.queued_at):
+            pair = get_pair_label(entry)
+            observed_at = entry.base.timestamp
+            self._record(pair, "observe", queued_at - observed_at)
+            self._record(pair, "batch", trace.signed_at - queued_at)
+            self._record(pair, "submit", trace.submitted_at - trace.signed_at)
+            self._record(pair, "include", trace.accepted_at - trace.submitted_at)
+            readable_at = trace.readable_at.get(get_data_key(entry))
+            if readable_at is not None:
+                self._record(pair, "read", readable_at - trace.accepted_at)
+            self._record(
+                pair, "total", (readable_at or trace.accepted_at) - observed_at
+            )
+
+    def reset(self) -> None:
+        self.histograms.clear()
+        for samples in self.samples.values():
+            samples.clear()
+
+    def to_json(self) -> dict:
+        pairs: Dict[str, dict] = {}
+        for (pair, stage), histogram in sorted(self.histograms.items()):
+            pairs.setdefault(pair, {})[stage] = {
+                "count": histogram.count,
+                "sum": histogram.sum,
+                "buckets": histogram.buckets_to_dict(),
+            }
+        return pairs
+
+    def to_prometheus(self) -> str:
+        lines = [
+            "# HELP pragma_publish_latency_seconds Latency of each publishing stage.",
+            "# TYPE pragma_publish_latency_seconds histogram",
+        ]
+        for (pair, stage), histogram in sorted(self.histograms.items()):
+            lines.extend(
+                histogram.to_prometheus(
+                    "pragma_publish_latency_seconds", f'pair="{pair}",stage="{stage}"'
+                )
+            )
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """
+        p50 and p95 of every stage over all pairs, and the slowest stage.
+        """
+        lines = [
+            f"{stage}: p50 {percentile(self.samples[stage], 0.5):.2f}s "
+            f"p95 {percentile(self.samples[stage], 0.95):.2f}s ({description})"
+            for stage, description in STAGES
+            if self.samples[stage]
+        ]
+        stages = [stage for stage, _ in STAGES[:-1] if self.samples[stage]]
+        if stages:
+            bottleneck = max(
+                stages, key=lambda stage: percentile(self.samples[stage], 0.5)
+            )
+            lines.append(f"bottleneck: {bottleneck}")
+        return "\n".join(lines)
+
+
+TRACES = PublishTracer()
+
+_export = AtExitExport(
+    TRACES, TRACES_OUT_ENV, "Publish traces", "Publish latency per stage"
+)
+
+
+def export_traces_at_exit(path: Optional[Union[str, Path]] = None) -> None:
+    """
+    Write `TRACES` to `path`, or to $PUBLISH_TRACES_OUT, when the process exits.
+    """
+    _export.register(path)
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import time
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pragma_sdk.common.types.entry import Entry
+from pragma_sdk.onchain.client import PragmaOnChainClient
+from starknet_py.net.client_errors import ClientError
+
+from pragma_deployer.utils.deviation import STALENESS_WINDOW
+from pragma_deployer.utils.data_keys import DataKey, get_data_key, get_data_type
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# The Oracle rejects entries more than FORWARD_TIMESTAMP_BUFFER seconds ahead
+# of the block timestamp, see oracle.cairo.
+FORWARD_TIMESTAMP_BUFFER = 420
+
+# get_data_entry reverts with this when nothing was ever stored for the key
+NO_DATA_ENTRY = "No data entry found"
+
+# (data key, source, publisher)
+StoredKey = Tuple[DataKey, int, int]
+
+REJECTIONS = (
+    "unregistered_publisher",
+    "wrong_account",
+    "source_not_allowed",
+    "zero_timestamp",
+    "future_timestamp",
+    "older_than_stored",
+    "too_old",
+)
+
+
+def get_stored_key(entry: Entry) -> StoredKey:
+    return (get_data_key(entry), entry.base.source, entry.base.publisher)
+
+
+def is_no_data_entry(error: ClientError) -> bool:
+    # The revert reason is given as a string or as its hex encoding
+    message = str(error.message)
+    return NO_DATA_ENTRY in message or NO_DATA_ENTRY.encode().hex() in message
+
+
+class EntryValidator:
+    """
+    Pre-flight checks of the assertions `publish_data` makes, so entries the
+    Oracle would reject never cost a reverted transaction.
+
+    Keeps a snapshot of the PublisherRegistry (address and sources of each
+    publisher) and of the timestamp of the entry stored for each
+    (data key, source, publisher). The snapshot is read for the publishers and
+    keys `refresh` has not seen yet, and entirely again every
+    `refresh_interval` seconds; published entries are recorded in between.
+    `validate` itself is dictionary lookups only.
+
+    Entries are dropped when their publisher is unknown or not signed for by
+    this client's account, when it may not publish their source, when their
+    timestamp is zero, older than the stored one, or more than `max_age`
+    seconds old (accepted by the Oracle but left out of the aggregation).
+    Timestamps more than `max_forward` seconds ahead, e.g. from a skewed
+    clock, are clamped to now when `fix_future_timestamps` is set, and
+    dropped otherwise. Every rejection is counted in `stats`.
+    """
+
+    def __init__(
+        self,
+        client: PragmaOnChainClient,
+        refresh_interval: float = 300.0,
+        max_age: int = STALENESS_WINDOW,
+        # Block timestamps lag behind the wall clock
+        max_forward: int = FORWARD_TIMESTAMP_BUFFER - 60,
+        fix_future_timestamps: bool = True,
+    ):
+        self.client = client
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.max_forward = max_forward
+        self.fix_future_timestamps = fix_future_timestamps
+        self._addresses: Dict[int, int] = {}
+        self._sources: Dict[int, Set[int]] = {}
+        self._timestamps: Dict[StoredKey, int] = {}
+        self._refreshed_at = 0.0
+        self.stats = {"accepted": 0, "fixed": 0, "refreshes": 0}
+        self.stats.update({rejection: 0 for rejection in REJECTIONS})
+
+    @property
+    def rejected(self) -> int:
+        return sum(self.stats[rejection] for rejection in REJECTIONS)
+
+    async def _fetch_publishers(self, publishers: List[int]) -> None:
+        registry = self.client.publisher_registry
+        results = await asyncio.gather(
+            *(
+                registry.functions[function_name].call(publisher)
+                for publisher in publishers
+                for function_name in ("get_publisher_address", "get_publisher_sources")
+            )
+        )
+        for i, publisher in enumerate(publishers):
+            (address,), (sources,) = results[2 * i : 2 * i + 2]
+            self._addresses[publisher] = address
+            self._sources[publisher] = set(sources)
+
+    async def _fetch_timestamps(self, keys: List[StoredKey]) -> None:
+        results = await asyncio.gather(
+            *(
+                self.client.oracle.functions["get_data_entry"].call(
+                    get_data_type(data_key), source, publisher
+                )
+                for data_key, source, publisher in keys
+            ),
+            return_exceptions=True,
+        )
+        for key, result in zip(keys, results):
+            if isinstance(result, ClientError) and is_no_data_entry(result):
+                # Never published: any timestamp is newer
+                self._timestamps[key] = 0
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                (entry,) = result
+                self._timestamps[key] = entry.value["base"]["timestamp"]
+
+    async def refresh(self, entries: Iterable[Entry] = ()) -> None:
+        """
+        Read the registry and stored timestamps missing for `entries`, or
+        the whole snapshot once it is older than `refresh_interval`.
+        """
+        entries = list(entries)
+        if time.monotonic() - self._refreshed_at > self.refresh_interval:
+            publishers = set(self._addresses)
+            keys = set(self._timestamps)
+            self._refreshed_at = time.monotonic()
+            self.stats["refreshes"] += 1
+        else:
+            publishers, keys = set(), set()
+        publishers |= {
+            entry.base.publisher
+            for entry in entries
+            if entry.base.publisher not in self._addresses
+        }
+        keys |= {
+            key for key in map(get_stored_key, entries) if key not in self._timestamps
+        }
+        await asyncio.gather(
+            self._fetch_publishers(list(publishers)),
+            self._fetch_timestamps(list(keys)),
+        )
+
+    def _reject(self, entry: Entry, now: int, latest: Dict[StoredKey, int]) -> str:
+        """
+        Why the Oracle would reject `entry`, or an empty string.
+        """
+        publisher = entry.base.publisher
+        address = self._addresses.get(publisher, 0)
+        if address == 0:
+            return "unregistered_publisher"
+        if address != self.client.account.address:
+            return "wrong_account"
+        if entry.base.source not in self._sources.get(publisher, ()):
+            return "source_not_allowed"
+
+        timestamp = entry.base.timestamp
+        if timestamp == 0:
+            return "zero_timestamp"
+        if timestamp > now + self.max_forward:
+            if not self.fix_future_timestamps:
+                return "future_timestamp"
+            entry.base.timestamp = timestamp = now
+            self.stats["fixed"] += 1
+        if timestamp < latest.get(get_stored_key(entry), 0):
+            return "older_than_stored"
+        if timestamp < now - self.max_age:
+            return "too_old"
+        return ""
+
+    def validate(self, entries: Iterable[Entry], now: Optional[int] = None) -> List[Entry]:
+        """
+        The entries of `entries` the Oracle would accept, checked against the
+        snapshot and the entries before them.
+        """
+        now = int(time.time()) if now is None else now
+        # Timestamps as they will be once the accepted entries are published
+        latest: Dict[StoredKey, int] = {}
+        valid = []
+        for entry in entries:
+            key = get_stored_key(entry)
+            if key not in latest:
+                latest[key] = self._timestamps.get(key, 0)
+            rejection = self._reject(entry, now, latest)
+            if rejection:
+                self.stats[rejection] += 1
+                logger.debug(f"ℹ️  Dropping entry {entry}: {rejection}")
+                continue
+            latest[key] = entry.base.timestamp
+            valid.append(entry)
+        self.stats["accepted"] += len(valid)
+        return valid
+
+    async def check(self, entries: Iterable[Entry]) -> List[Entry]:
+        """
+        Refresh the snapshot as needed, then `validate` `entries`.
+        """
+        entries = list(entries)
+        await self.refresh(entries)
+        return self.validate(entries)
+
+    def record(self, entries: Iterable[Entry]) -> None:
+        """
+        Record `entries` as stored by the Oracle.
+        """
+        for entry in entries:
+            key = get_stored_key(entry)
+            self._timestamps[key] = max(
+                self._timestamps.get(key, 0), entry.base.timestamp
+            )
+
+    def summary(self) -> str:
+        rejections = ", ".join(
+            f"{self.stats[rejection]} {rejection}"
+            for rejection in REJECTIONS
+            if self.stats[rejection]
+        )
+        return (
+            f"{self.stats['accepted']} entries accepted, {self.rejected} rejected"
+            f"{f' ({rejections})' if rejections else ''}, "
+            f"{self.stats['fixed']} timestamps fixed"
+        )
@@ -0,0 +1,241 @@
+import unittest
+
+import numpy as np
+
+from pragma_sdk.common.types.entry import FutureEntry, SpotEntry
+from pragma_sdk.common.types.types import AggregationMode
+
+from pragma_deployer.utils.aggregation import (
+    BACKWARD_TIMESTAMP_BUFFER,
+    U64_MAX,
+    U128_MAX,
+    EntryGrid,
+    PricesResponse,
+    aggregate_entries,
+    aggregate_timestamps_max,
+    entries_mean,
+    entries_median,
+    get_checkpoint_writes,
+    get_data_for_sources,
+)
+
+# src/tests/test_oracle.cairo
+BLOCK_TIMESTAMP = 103374042
+
+
+def median(values, mask=None):
+    values = np.array([values], dtype=object)
+    mask = values != -1 if mask is None else np.array([mask])
+    return entries_median(values, mask).tolist()[0]
+
+
+class TestEntryVectors(unittest.TestCase):
+    """
+    test_aggregate_entries_median, test_aggregate_entries_mean,
+    test_aggregate_timestamp_max and test_empty_array of src/entry/entry.cairo.
+    """
+
+    def setUp(self):
+        self.prices = np.broadcast_to(np.array([10, 20, 30, 40, 50]), (5, 5))
+        self.timestamps = np.broadcast_to(
+            np.array([1000000, 1000001, 1000002, 1000002, 1003002]), (5, 5)
+        )
+        # Row n selects the first n + 1 entries
+        self.mask = np.tri(5, dtype=bool)
+
+    def test_median(self):
+        result = aggregate_entries(self.prices, self.mask, AggregationMode.MEDIAN)
+        self.assertEqual(result.tolist(), [10, 15, 20, 25, 30])
+
+    def test_mean(self):
+        result = aggregate_entries(self.prices, self.mask, AggregationMode.AVERAGE)
+        self.assertEqual(result.tolist(), [10, 15, 20, 25, 30])
+
+    def test_timestamp_max(self):
+        result = aggregate_timestamps_max(self.timestamps, self.mask)
+        self.assertEqual(result.tolist(), [1000000, 1000001, 1000002, 1000002, 1003002])
+
+    def test_empty(self):
+        empty = np.zeros((1, 0), dtype=np.uint64)
+        for aggregation_mode in (AggregationMode.MEDIAN, AggregationMode.AVERAGE):
+            self.assertEqual(
+                aggregate_entries(empty, empty != 0, aggregation_mode).tolist(), [0]
+            )
+        self.assertEqual(aggregate_timestamps_max(empty, empty != 0).tolist(), [0])
+
+    def test_nothing_selected(self):
+        self.assertEqual(median([5, 6, 7], [False, False, False]), 0)
+
+
+class TestMedianTies(unittest.TestCase):
+    def test_even_count_floors_the_middle_pair(self):
+        self.assertEqual(median([1, 2]), 1)
+        self.assertEqual(median([4, 1, 3, 2]), 2)
+
+    def test_equal_middle_values(self):
+        self.assertEqual(median([3, 5, 3, 5]), 4)
+        self.assertEqual(median([7, 7, 7, 7]), 7)
+        self.assertEqual(median([2, 7, 7, 9]), 7)
+
+    def test_unselected_values_are_ignored(self):
+        self.assertEqual(median([1, 100, 3, 100], [True, False, True, False]), 2)
+
+    def test_u64_middle_pair_does_not_wrap(self):
+        self.assertEqual(median([U64_MAX, U64_MAX]), U64_MAX)
+        self.assertEqual(median([U64_MAX - 1, U64_MAX]), U64_MAX - 1)
+
+
+class TestU128Overflow(unittest.TestCase):
+    def test_median_sum_fits(self):
+        self.assertEqual(median([U128_MAX // 2, U128_MAX // 2 + 1]), U128_MAX // 2)
+
+    def test_median_sum_overflows(self):
+        with self.assertRaises(OverflowError):
+            median([U128_MAX // 2 + 1, U128_MAX // 2 + 1])
+
+    def test_mean_sum_overflows(self):
+        values = np.array([[U128_MAX, 1]], dtype=object)
+        with self.assertRaises(OverflowError):
+            entries_mean(values, values != 0)
+
+    def test_values_above_u128(self):
+        with self.assertRaises(ValueError):
+            median([U128_MAX + 1])
+
+
+class TestStalenessWindow(unittest.TestCase):
+    def aggregate(self, prices, timestamps, block_timestamp=BLOCK_TIMESTAMP):
+        # One data type with one publisher per source
+        response = get_data_for_sources(
+            np.array(prices, dtype=np.uint64)[None, :, None],
+            np.array(timestamps, dtype=np.uint64)[None, :, None],
+            block_timestamp,
+        )
+        return response[0]
+
+    def test_entries_at_the_buffer_are_dropped(self):
+        latest = BLOCK_TIMESTAMP
+        response = self.aggregate(
+            [10, 20, 1000],
+            [
+                latest,
+                latest - BACKWARD_TIMESTAMP_BUFFER + 1,
+                latest - BACKWARD_TIMESTAMP_BUFFER,
+            ],
+        )
+        self.assertEqual(response["price"], 15)
+        self.assertEqual(response["num_sources_aggregated"], 2)
+        self.assertEqual(response["last_updated_timestamp"], latest)
+
+    def test_window_ends_at_the_block_timestamp(self):
+        # The latest entry is ahead of the block, the window starts from the block
+        response = self.aggregate(
+            [10, 20],
+            [BLOCK_TIMESTAMP + 100, BLOCK_TIMESTAMP - BACKWARD_TIMESTAMP_BUFFER + 50],
+        )
+        self.assertEqual(response["num_sources_aggregated"], 2)
+        self.assertEqual(response["last_updated_timestamp"], BLOCK_TIMESTAMP + 100)
+
+    def test_uninitialized_entries_are_dropped(self):
+        response = self.aggregate([10, 20], [BLOCK_TIMESTAMP, 0])
+        self.assertEqual(response["price"], 10)
+        self.assertEqual(response["num_sources_aggregated"], 1)
+
+    def test_no_entry(self):
+        response = self.aggregate([0, 0], [0, 0])
+        self.assertEqual(
+            response,
+            {"price": 0, "last_updated_timestamp": 0, "num_sources_aggregated": 0},
+        )
+
+    def test_window_before_the_buffer_underflows(self):
+        with self.assertRaises(OverflowError):
+            self.aggregate([10], [BACKWARD_TIMESTAMP_BUFFER - 1])
+
+    def test_zero_price_source_counts(self):
+        response = self.aggregate([0, 10, 20], [BLOCK_TIMESTAMP] * 3)
+        self.assertEqual(response["price"], 10)
+        self.assertEqual(response["num_sources_aggregated"], 3)
+
+
+class TestCheckpointWrites(unittest.TestCase):
+    def response(self, num_sources_aggregated, last_updated_timestamp=BLOCK_TIMESTAMP):
+        return PricesResponse(
+            price=np.array([1]),
+            last_updated_timestamp=np.array([last_updated_timestamp]),
+            num_sources_aggregated=np.array([num_sources_aggregated]),
+        )
+
+    def writes(self, response, sources_threshold, latest_checkpoint_timestamp):
+        return get_checkpoint_writes(
+            response, sources_threshold, [latest_checkpoint_timestamp], BLOCK_TIMESTAMP
+        ).tolist()
+
+    def test_sources_threshold(self):
+        self.assertEqual(self.writes(self.response(3), 2, 0), [True])
+        self.assertEqual(self.writes(self.response(2), 2, 0), [False])
+
+    def test_next_checkpoint_timestamp(self):
+        self.assertEqual(self.writes(self.response(3), 0, BLOCK_TIMESTAMP - 2), [True])
+        self.assertEqual(self.writes(self.response(3), 0, BLOCK_TIMESTAMP - 1), [False])
+
+    def test_no_checkpoint_available(self):
+        with self.assertRaises(ValueError):
+            self.writes(self.response(3, last_updated_timestamp=0), 0, 0)
+
+
+class TestOracleVectors(unittest.TestCase):
+    """
+    The entries published by `setup` and the prices test_get_data and
+    get_data_median expect, src/tests/test_oracle.cairo.
+    """
+
+    def test_get_data_median(self):
+        spot = [
+            (2, 2, 1),
+            (2, 3, 2),
+            (3, 8, 1),
+            (4, 8, 1),
+            (4, 3, 2),
+            (5, 5, 1),
+            (6, 2, 1),
+        ]
+        future = [(2, 2, 1), (2, 2, 2), (3, 3, 1), (4, 4, 1), (5, 5, 1), (5, 5, 2)]
+        entries = [
+            SpotEntry(pair_id, price * 1000000, BLOCK_TIMESTAMP, source, 1)
+            for pair_id, price, source in spot
+        ] + [
+            FutureEntry(pair_id, price * 1000000, BLOCK_TIMESTAMP, source, 1, 11111110)
+            for pair_id, price, source in future
+        ]
+        expected = {
+            (0, 2): (2500000, 2),
+            (0, 3): (8000000, 1),
+            (0, 4): (5500000, 2),
+            (0, 5): (5000000, 1),
+            (1, 2, 11111110): (2000000, 2),
+            (1, 3, 11111110): (3000000, 1),
+            (1, 4, 11111110): (4000000, 1),
+            (1, 5, 11111110): (5000000, 2),
+        }
+        responses = EntryGrid(entries).aggregate(BLOCK_TIMESTAMP)
+        for data_key, (price, num_sources) in expected.items():
+            self.assertEqual(
+                responses[data_key],
+                {
+                    "price": price,
+                    "last_updated_timestamp": BLOCK_TIMESTAMP,
+                    "num_sources_aggregated": num_sources,
+                },
+            )
+
+    def test_later_entry_replaces_the_stored_one(self):
+        stored = [SpotEntry(2, 100, BLOCK_TIMESTAMP - 10, 1, 1)]
+        pending = [SpotEntry(2, 300, BLOCK_TIMESTAMP, 1, 1)]
+        response = EntryGrid(stored + pending).aggregate(BLOCK_TIMESTAMP)[(0, 2)]
+        self.assertEqual(response["price"], 300)
+        self.assertEqual(response["num_sources_aggregated"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
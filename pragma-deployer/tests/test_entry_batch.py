@@ -0,0 +1,135 @@
+import asyncio
+import unittest
+
+import numpy as np
+
+from pragma_sdk.common.types.entry import FutureEntry, GenericEntry, SpotEntry
+
+from pragma_deployer.utils.entry_batch import (
+    PUBLISH_DATA_ENTRIES_SELECTOR,
+    EntryBatch,
+    publish_batch,
+)
+from pragma_deployer.utils.packing import encode_entries, publish_entries
+
+ORACLE_ADDRESS = 0x1234
+
+
+def get_entries():
+    return [
+        SpotEntry(1, 10**20, 1_700_000_000, 2, 3, volume=5),
+        FutureEntry(4, 2**120 - 1, 1_700_000_001, 2, 3, 1_735_689_600, volume=6),
+        SpotEntry(5, 7, 1_700_000_002, 6, 3),
+        FutureEntry(1, 8, 1_700_000_003, 2, 3, 0),
+        SpotEntry(4, 9, 1_700_000_004, 6, 3, volume=2**100),
+    ]
+
+
+class FakeFunction:
+    def __init__(self, oracle):
+        self.oracle = oracle
+
+    async def invoke(self, new_entries, execution_config, callback):
+        self.oracle.invokes.append(new_entries)
+        return "abi"
+
+
+class FakeOracle:
+    address = ORACLE_ADDRESS
+
+    def __init__(self):
+        self.multicalls = []
+        self.invokes = []
+        self.functions = {"publish_data_entries": FakeFunction(self)}
+
+    async def multicall(self, calls, execution_config, callback):
+        self.multicalls.append(calls)
+        return "multicall"
+
+
+class FakeClient:
+    execution_config = None
+
+    def __init__(self):
+        self.oracle = FakeOracle()
+
+    async def track_nonce(self, nonce, tx_hash):
+        pass
+
+
+class TestEncode(unittest.TestCase):
+    def test_matches_the_entry_encoding(self):
+        entries = get_entries()
+        batch = EntryBatch.from_entries(entries)
+        self.assertEqual(batch.calldata_size(), len(encode_entries(entries)))
+        self.assertEqual(batch.to_calldata(), encode_entries(entries))
+
+    def test_spot_entries_only(self):
+        entries = [entry for entry in get_entries() if isinstance(entry, SpotEntry)]
+        batch = EntryBatch.from_entries(entries)
+        self.assertEqual(batch.to_calldata(), encode_entries(entries))
+
+    def test_empty(self):
+        self.assertEqual(EntryBatch().to_calldata(), [0])
+
+    def test_slices(self):
+        entries = get_entries()
+        batch = EntryBatch.from_entries(entries)
+        for start, stop in ((0, 2), (1, 4), (3, 5), (2, 2), (5, 5)):
+            self.assertEqual(
+                batch[start:stop].to_calldata(), encode_entries(entries[start:stop])
+            )
+        self.assertEqual(batch[1:5][1:3].to_calldata(), encode_entries(entries[2:4]))
+
+    def test_buffer_reuse(self):
+        entries = get_entries()
+        batch = EntryBatch(capacity=2)
+        batch.extend(entries)
+        out = np.empty(100, dtype=object)
+        self.assertEqual(batch.to_calldata(out), encode_entries(entries))
+
+        batch.clear()
+        batch.extend(entries[2:])
+        self.assertEqual(batch.to_calldata(out), encode_entries(entries[2:]))
+        with self.assertRaises(ValueError):
+            batch.encode(np.empty(3, dtype=object))
+
+    def test_round_trip(self):
+        entries = get_entries()
+        batch = EntryBatch.from_entries(entries)
+        self.assertEqual(encode_entries(batch.to_entries()), encode_entries(entries))
+
+    def test_generic_entries(self):
+        with self.assertRaises(ValueError):
+            EntryBatch.from_entries([GenericEntry(1, 2, 1_700_000_000, 3, 4)])
+
+
+class TestPublish(unittest.TestCase):
+    def test_publish_batch(self):
+        entries = get_entries()
+        client = FakeClient()
+        result = asyncio.run(publish_batch(client, EntryBatch.from_entries(entries)))
+        self.assertEqual(result, "multicall")
+        ((call,),) = client.oracle.multicalls
+        self.assertEqual(call.to_addr, ORACLE_ADDRESS)
+        self.assertEqual(call.selector, PUBLISH_DATA_ENTRIES_SELECTOR)
+        self.assertEqual(call.calldata, encode_entries(entries))
+
+    def test_publish_entries_encodes_spot_and_future_entries(self):
+        entries = get_entries()
+        client = FakeClient()
+        self.assertEqual(asyncio.run(publish_entries(client, entries)), "multicall")
+        ((call,),) = client.oracle.multicalls
+        self.assertEqual(call.calldata, encode_entries(entries))
+        self.assertEqual(client.oracle.invokes, [])
+
+    def test_publish_entries_serializes_generic_entries(self):
+        entries = [*get_entries(), GenericEntry(1, 2, 1_700_000_000, 3, 4)]
+        client = FakeClient()
+        self.assertEqual(asyncio.run(publish_entries(client, entries)), "abi")
+        self.assertEqual(client.oracle.multicalls, [])
+        self.assertEqual(len(client.oracle.invokes[0]), len(entries))
+
+
+if __name__ == "__main__":
+    unittest.main()
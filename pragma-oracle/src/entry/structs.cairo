@@ -411,3 +411,74 @@ struct TokenizedVaultInfo {
     vault_address: ContractAddress,
     underlying_asset: felt252,
 }
+
+
+//-----------------------------------------------
+// Tests
+// pragma_deployer.utils.storage_packing is checked against the same values
+
+#[test]
+#[available_gas(100000000)]
+fn test_entry_store_packing() {
+    let entry = EntryStorage { timestamp: 1700000000, volume: 123456789, price: 4200000000000 };
+    let packed = EntryStorePacking::pack(entry);
+    assert(packed == 0x3d1e382100000000000000000000075bcd156553f100, 'wrong packed entry');
+    let unpacked = EntryStorePacking::unpack(packed);
+    assert(unpacked.timestamp == 1700000000, 'wrong timestamp');
+    assert(unpacked.volume == 123456789, 'wrong volume');
+    assert(unpacked.price == 4200000000000, 'wrong price');
+
+    let entry = EntryStorage {
+        timestamp: 0xffffffff,
+        volume: 0xfffffffffffffffffffffffff,
+        price: 0x800000000000000000000000000000
+    };
+    let packed = EntryStorePacking::pack(entry);
+    assert(
+        packed == 0x800000000000000000000000000000fffffffffffffffffffffffffffffffff,
+        'wrong packed max entry'
+    );
+    let unpacked = EntryStorePacking::unpack(packed);
+    assert(unpacked.timestamp == 0xffffffff, 'wrong max timestamp');
+    assert(unpacked.volume == 0xfffffffffffffffffffffffff, 'wrong max volume');
+    assert(unpacked.price == 0x800000000000000000000000000000, 'wrong max price');
+}
+
+#[test]
+#[should_panic]
+#[available_gas(100000000)]
+fn test_entry_store_packing_timestamp_too_big() {
+    let entry = EntryStorage { timestamp: 0x100000000, volume: 0, price: 0 };
+    EntryStorePacking::pack(entry);
+}
+
+#[test]
+#[available_gas(100000000)]
+fn test_checkpoint_store_packing() {
+    let checkpoint = Checkpoint {
+        timestamp: 1700000000,
+        value: 4200000000000,
+        aggregation_mode: AggregationMode::Mean(()),
+        num_sources_aggregated: 5
+    };
+    let packed = CheckpointStorePacking::pack(checkpoint);
+    assert(packed == 0x50010000000000000000000003d1e38210006553f100, 'wrong packed checkpoint');
+    let unpacked = CheckpointStorePacking::unpack(packed);
+    assert(unpacked.timestamp == 1700000000, 'wrong timestamp');
+    assert(unpacked.value == 4200000000000, 'wrong value');
+    assert(unpacked.aggregation_mode == AggregationMode::Mean(()), 'wrong aggregation mode');
+    assert(unpacked.num_sources_aggregated == 5, 'wrong number of sources');
+
+    // Timestamps above 32 bits carry into the value
+    let checkpoint = Checkpoint {
+        timestamp: 0x100000005,
+        value: 1,
+        aggregation_mode: AggregationMode::Median(()),
+        num_sources_aggregated: 0
+    };
+    let packed = CheckpointStorePacking::pack(checkpoint);
+    assert(packed == 0x200000005, 'wrong packed checkpoint');
+    let unpacked = CheckpointStorePacking::unpack(packed);
+    assert(unpacked.timestamp == 5, 'wrong carried timestamp');
+    assert(unpacked.value == 2, 'wrong carried value');
+}